@@ -2,7 +2,6 @@ import operator
 import random
 from functools import reduce
 import numpy as np
-import itertools
 import math
 
 import acpc_python_client as acpc
@@ -12,17 +11,32 @@ from tools.game_tree.builder import GameTreeBuilder
 from tools.game_tree.node_provider import NodeProvider
 from tools.game_tree.nodes import HoleCardsNode, TerminalNode, StrategyActionNode, BoardCardsNode
 from tools.hand_evaluation import get_utility
-from tools.game_utils import get_num_hole_card_combinations
-from tools.utils import is_unique, intersection
+from tools.deal_table import get_deal_table
+from tools.utils import flatten
+from tools.walk_trees import walk_trees
+from tools.io_util import read_strategy_from_file, walk_action_nodes
+from tools.suit_isomorphism import SuitIsomorphism
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    pass
+
+def _get_tqdm():
+    """Return tqdm progress bar class or None if tqdm is not installed.
+
+    tqdm is imported only when progress is shown so that importing this module stays fast.
+    """
+    try:
+        from tqdm import tqdm
+        return tqdm
+    except ImportError:
+        return None
 
 
 NUM_PLAYERS = 2
 
+DEFAULT_INITIAL_STRATEGY_WEIGHT = 10
+
+DEFAULT_REGRET_PRUNING_DELAY = 20
+DEFAULT_REGRET_PRUNING_REVISIT_ITERATIONS = 10
+
 
 class CfrActionNode(StrategyActionNode):
     def __init__(self, parent, player):
@@ -30,6 +44,8 @@ class CfrActionNode(StrategyActionNode):
         self.current_strategy = np.zeros(NUM_ACTIONS)
         self.regret_sum = np.zeros(NUM_ACTIONS)
         self.strategy_sum = np.zeros(NUM_ACTIONS)
+        self.iteration_regret = np.zeros(NUM_ACTIONS)
+        self.non_positive_regret_iterations = np.zeros(NUM_ACTIONS, dtype=int)
 
 
 class CfrNodeProvider(NodeProvider):
@@ -40,17 +56,51 @@ class CfrNodeProvider(NodeProvider):
 class Cfr:
     """Creates new ACPC Poker game strategy using CFR+ algorithm which runs for specified number of iterations.
 
+    Linear, discounted and predictive variants can be selected by passing schedule from cfr.schedules to train.
+
     !!! Currently only limit betting games with up to 5 cards total and 2 players are supported !!!
     """
 
-    def __init__(self, game, show_progress=True):
+    def __init__(
+            self,
+            game,
+            show_progress=True,
+            game_tree=None,
+            initial_strategy=None,
+            initial_strategy_weight=DEFAULT_INITIAL_STRATEGY_WEIGHT,
+            suit_isomorphism=False,
+            card_abstraction=None):
         """Build new CFR instance.
 
         Args:
             game (Game): ACPC game definition object.
+            game_tree (HoleCardsNode): Game tree of the same game built by another CFR instance.
+                                       The tree is reset and trained instead of building a new one.
+            initial_strategy: Strategy the training is started from, see warm_start.
+            initial_strategy_weight (float): Weight of the initial strategy, see warm_start.
+            suit_isomorphism (bool): Train only canonical info sets under permutations of suits.
+                                     Deals are enumerated once for each class of isomorphic deals,
+                                     weighted by its size. Trained tree contains only canonical info sets,
+                                     use tools.suit_isomorphism.expand_strategy to obtain strategy of the whole game.
+            card_abstraction (CardAbstraction): Train strategy over buckets of the abstraction instead of cards.
+                                                Use tools.card_abstraction.expand_abstract_strategy to obtain
+                                                strategy over cards. The abstraction only makes the tree smaller,
+                                                iterations still enumerate all deals of cards unless
+                                                the training samples deals, see train.
         """
+        if suit_isomorphism and card_abstraction:
+            raise AttributeError('Suit isomorphism cannot be combined with card abstraction')
         self.game = game
         self.show_progress = show_progress
+        self.schedule = None
+        self.zero_reach_pruning = False
+        self.regret_pruning = False
+        self.sample_deals = False
+        self._regret_pruning_active = False
+        self._eager_regret_matching = False
+        self.num_action_visits = 0
+        self.num_zero_reach_pruned_visits = 0
+        self.num_regret_pruned_visits = 0
 
         if game.get_num_players() != 2:
             raise AttributeError(
@@ -62,20 +112,144 @@ class Cfr:
         total_cards_count = game.get_num_hole_cards() \
             + game.get_total_num_board_cards(game.get_num_rounds() - 1)
         if total_cards_count > 5:
+            # Hand evaluator scores only hands of up to 5 cards, also with card abstraction
             raise AttributeError('Only games with up to 5 cards are supported')
 
-        game_tree_builder = GameTreeBuilder(game, CfrNodeProvider())
+        self.suit_isomorphism = SuitIsomorphism(game) if suit_isomorphism else None
+        self.card_abstraction = card_abstraction
+        self.deal_table = get_deal_table(game)
+        self._hole_cards_deals = None
 
-        if not self.show_progress:
-            self.game_tree = game_tree_builder.build_tree()
-        else:
-            try:
+        if game_tree is None:
+            game_tree_builder = GameTreeBuilder(game, CfrNodeProvider(), self.suit_isomorphism, card_abstraction)
+
+            tqdm = _get_tqdm() if self.show_progress else None
+            if tqdm is None:
+                self.game_tree = game_tree_builder.build_tree()
+            else:
                 with tqdm(total=1) as progress:
                     progress.set_description('Building game tree')
                     self.game_tree = game_tree_builder.build_tree()
                     progress.update(1)
-            except NameError:
-                self.game_tree = game_tree_builder.build_tree()
+        else:
+            self.game_tree = game_tree
+
+        self._action_nodes = []
+        def on_node(node):
+            if isinstance(node, CfrActionNode):
+                self._action_nodes.append(node)
+        walk_trees(on_node, self.game_tree)
+        self._player_action_nodes = [
+            [node for node in self._action_nodes if node.player == player] for player in range(NUM_PLAYERS)]
+
+        if game_tree is not None:
+            self.reset()
+        if initial_strategy is not None:
+            self.warm_start(initial_strategy, initial_strategy_weight)
+
+    def reset(self):
+        """Zero regrets and strategy sums of the game tree so that it can be trained again from scratch."""
+        for node in self._action_nodes:
+            node.regret_sum.fill(0)
+            node.strategy_sum.fill(0)
+            node.iteration_regret.fill(0)
+            node.non_positive_regret_iterations.fill(0)
+            node.current_strategy = np.zeros(NUM_ACTIONS)
+            node.strategy = np.zeros(NUM_ACTIONS)
+
+    def get_checkpoint(self):
+        """Return regret sums, strategy sums and current strategies of all action nodes.
+
+        Returns:
+            tuple(np.array, np.array, np.array): Arrays of shape (action nodes, actions).
+        """
+        return (
+            np.array([node.regret_sum for node in self._action_nodes]),
+            np.array([node.strategy_sum for node in self._action_nodes]),
+            np.array([node.current_strategy for node in self._action_nodes]))
+
+    def save_checkpoint(self, checkpoint_file_path):
+        """Save state of the training into .npz file so that the training can be continued later."""
+        regret_sums, strategy_sums, current_strategies = self.get_checkpoint()
+        np.savez(
+            checkpoint_file_path,
+            regret_sums=regret_sums,
+            strategy_sums=strategy_sums,
+            current_strategies=current_strategies)
+
+    def load_checkpoint(self, checkpoint, weight=1):
+        """Replace state of the training by the one from the checkpoint.
+
+        Args:
+            checkpoint: Path to .npz file written by save_checkpoint or tuple returned by get_checkpoint.
+            weight (float): Loaded regret sums and strategy sums are multiplied by the weight.
+        """
+        if isinstance(checkpoint, str):
+            with np.load(checkpoint) as checkpoint_data:
+                regret_sums = checkpoint_data['regret_sums']
+                strategy_sums = checkpoint_data['strategy_sums']
+                current_strategies = checkpoint_data['current_strategies']
+        else:
+            regret_sums, strategy_sums, current_strategies = checkpoint
+        expected_shape = (len(self._action_nodes), NUM_ACTIONS)
+        if any(array.shape != expected_shape for array in [regret_sums, strategy_sums, current_strategies]):
+            raise AttributeError('Checkpoint does not match the game tree')
+        for i, node in enumerate(self._action_nodes):
+            np.multiply(regret_sums[i], weight, out=node.regret_sum)
+            np.multiply(strategy_sums[i], weight, out=node.strategy_sum)
+            node.current_strategy = np.array(current_strategies[i])
+
+    def warm_start(self, initial_strategy, weight=DEFAULT_INITIAL_STRATEGY_WEIGHT):
+        """Start the training from existing strategy instead of from zero regrets.
+
+        Regret sums of each node are set to the initial strategy multiplied by the weight,
+        so regret matching plays the initial strategy until the regrets collected by the training
+        outweigh it. Strategy sums are seeded the same way scaled by reach probability of the acting
+        player, as if the initial strategy was played for the weight of iterations.
+
+        Args:
+            initial_strategy: Strategy tree, strategy dictionary, path to strategy file,
+                              path to .npz checkpoint written by save_checkpoint or checkpoint
+                              returned by get_checkpoint.
+            weight (float): Weight of the initial strategy. Sums loaded from checkpoint are multiplied by it.
+        """
+        if isinstance(initial_strategy, tuple) or (isinstance(initial_strategy, str) and initial_strategy.endswith('.npz')):
+            self.load_checkpoint(initial_strategy, weight)
+            return
+        if isinstance(initial_strategy, str):
+            initial_strategy = read_strategy_from_file(None, initial_strategy)
+
+        node_strategies = {}
+        if isinstance(initial_strategy, HoleCardsNode):
+            def on_node(node, strategy_node):
+                if isinstance(node, CfrActionNode):
+                    node_strategies[node] = strategy_node.strategy
+            walk_trees(on_node, self.game_tree, initial_strategy)
+        else:
+            def on_action_node(info_set, node):
+                node_strategies[node] = initial_strategy[info_set]
+            walk_action_nodes(self.game_tree, on_action_node)
+
+        def seed_node(node, reach_probabilities):
+            if isinstance(node, CfrActionNode):
+                node_strategy = np.array(node_strategies[node], dtype=float)
+                normalizing_sum = np.sum(node_strategy)
+                if normalizing_sum > 0:
+                    node_strategy /= normalizing_sum
+                else:
+                    node_strategy[list(node.children)] = 1 / len(node.children)
+                np.multiply(node_strategy, weight, out=node.regret_sum)
+                # Strategy sums are weighted by reach probability of the acting player during training
+                np.multiply(node_strategy, weight * reach_probabilities[node.player], out=node.strategy_sum)
+                node.current_strategy = node_strategy
+                for a, child in node.children.items():
+                    child_reach_probabilities = list(reach_probabilities)
+                    child_reach_probabilities[node.player] *= node_strategy[a]
+                    seed_node(child, child_reach_probabilities)
+            else:
+                for child in node.children.values():
+                    seed_node(child, reach_probabilities)
+        seed_node(self.game_tree, [1] * NUM_PLAYERS)
 
     @staticmethod
     def _calculate_node_average_strategy(node, minimal_action_probability):
@@ -114,7 +288,13 @@ class Cfr:
         weight_delay=700,
         checkpoint_iterations=None,
         checkpoint_callback=lambda *args: None,
-        minimal_action_probability=None):
+        minimal_action_probability=None,
+        schedule=None,
+        zero_reach_pruning=False,
+        regret_pruning=False,
+        regret_pruning_delay=DEFAULT_REGRET_PRUNING_DELAY,
+        regret_pruning_revisit_iterations=DEFAULT_REGRET_PRUNING_REVISIT_ITERATIONS,
+        sample_deals=False):
         """Run CFR for given number of iterations.
 
         The trained tree can be found by retrieving the game_tree
@@ -127,18 +307,48 @@ class Cfr:
 
         Args:
             iterations (int): Number of iterations.
-            show_progress (bool): Show training progress bar.
+            weight_delay (int): Number of iterations after which CFR+ starts averaging strategies.
+                                Not used when schedule is provided.
+            schedule: Regret and averaging schedule from cfr.schedules. CFR+ is used if None.
+            zero_reach_pruning (bool): Skip actions of the opponent of the updated player which the opponent
+                                       never plays. Such subtrees do not change the update.
+            regret_pruning (bool): Skip actions of the updated player which are not played by the current
+                                   strategy and whose regret was not positive for regret_pruning_delay iterations.
+            regret_pruning_delay (int): Number of iterations without positive regret after which action is pruned.
+            regret_pruning_revisit_iterations (int): Each this many iterations all actions are visited
+                                                     so that regrets of pruned actions can recover.
+            sample_deals (bool): Chance sampling, each iteration samples one deal of cards instead of
+                                 enumerating all of them. Cost of an iteration then depends on the size of
+                                 the tree, e.g. on the number of buckets of card abstraction, and not on
+                                 the number of deals. More iterations are needed as the updates are noisy.
+                                 Sampled deals are drawn from the random module.
+
+        Numbers of visited and pruned actions are counted in num_action_visits,
+        num_zero_reach_pruned_visits and num_regret_pruned_visits.
         """
-        if not self.show_progress:
+        tqdm = _get_tqdm() if self.show_progress else None
+        if tqdm is None:
             iterations_iterable = range(iterations)
         else:
-            try:
-                iterations_iterable = tqdm(range(iterations))
-                iterations_iterable.set_description('%s training' % self._get_algorithm_name())
-            except NameError:
-                iterations_iterable = range(iterations)
-
-        if iterations <= weight_delay:
+            iterations_iterable = tqdm(range(iterations))
+            iterations_iterable.set_description('%s training' % self._get_algorithm_name())
+
+        if sample_deals and self.suit_isomorphism:
+            raise AttributeError('Deal sampling cannot be combined with suit isomorphism')
+
+        self.schedule = schedule
+        self.zero_reach_pruning = zero_reach_pruning
+        self.sample_deals = sample_deals
+        self.regret_pruning = regret_pruning
+        self.regret_pruning_delay = regret_pruning_delay
+        # Regret matching cannot be done lazily when visiting the nodes if some nodes may be skipped
+        self._eager_regret_matching = schedule is not None or zero_reach_pruning or regret_pruning
+        if self._eager_regret_matching:
+            for node in self._action_nodes:
+                self._update_current_strategy(node)
+        if schedule is not None:
+            weight_delay = 0
+        elif iterations <= weight_delay:
             raise AttributeError('Number of iterations must be larger than weight delay')
 
         if checkpoint_iterations is None or checkpoint_iterations <= 0 or checkpoint_iterations > iterations:
@@ -147,9 +357,15 @@ class Cfr:
         iterations_left_to_checkpoint = weight_delay + checkpoint_iterations
         checkpoint_index = 0
         for i in iterations_iterable:
-            self.weight = max(i - weight_delay, 0)
+            if schedule is None:
+                self.weight = max(i - weight_delay, 0)
+            else:
+                self.weight = schedule.get_strategy_weight(i + 1)
+            self._regret_pruning_active = regret_pruning and (i + 1) % regret_pruning_revisit_iterations != 0
             for player in range(2):
                 self._start_iteration(player)
+                if self._eager_regret_matching:
+                    self._update_regrets(player, i + 1)
             iterations_left_to_checkpoint -= 1
 
             if iterations_left_to_checkpoint == 0 or i == iterations - 1:
@@ -160,6 +376,32 @@ class Cfr:
 
         return self.game_tree
 
+    def _update_current_strategy(self, node):
+        if self.schedule is not None and self.schedule.predictive:
+            positive_regrets = np.maximum(node.regret_sum + node.iteration_regret, 0)
+        else:
+            positive_regrets = np.maximum(node.regret_sum, 0)
+        normalizing_sum = np.sum(positive_regrets)
+        if normalizing_sum > 0:
+            node.current_strategy = positive_regrets / normalizing_sum
+        else:
+            current_strategy = np.zeros(NUM_ACTIONS)
+            for a in node.children:
+                current_strategy[a] = 1 / len(node.children)
+            node.current_strategy = current_strategy
+
+    def _update_regrets(self, player, iteration):
+        for node in self._player_action_nodes[player]:
+            if self.schedule is not None:
+                self.schedule.update_regrets(node.regret_sum, node.iteration_regret, iteration)
+            # Regrets of this iteration are the prediction of predictive schedules
+            self._update_current_strategy(node)
+            if self.regret_pruning:
+                node.non_positive_regret_iterations += 1
+                node.non_positive_regret_iterations[node.regret_sum > 0] = 0
+            if self.schedule is not None:
+                node.iteration_regret.fill(0)
+
     def _start_iteration(self, player):
         self._cfr(
             player,
@@ -211,13 +453,169 @@ class Cfr:
             players_folded,
             nodes[0].pot_commitment)[player] * opponent_reach_prob
 
+    def _get_board_card_groups(self, board_cards):
+        board_card_groups = []
+        num_grouped_cards = 0
+        for round_index in range(1, self.game.get_num_rounds()):
+            if num_grouped_cards >= len(board_cards):
+                break
+            num_round_board_cards = self.game.get_num_board_cards(round_index)
+            if num_round_board_cards > 0:
+                board_card_groups += [tuple(board_cards[num_grouped_cards:num_grouped_cards + num_round_board_cards])]
+                num_grouped_cards += num_round_board_cards
+        return tuple(board_card_groups)
+
+    def _get_player_node_keys(self, hole_cards, board_card_groups, new_cards):
+        """Return keys of children of players' nodes after new cards are dealt.
+
+        Each player sees only his hole cards and board cards so his node is keyed
+        by canonical form of his view of the deal.
+        """
+        return [
+            self.suit_isomorphism.canonicalize((player_hole_cards,) + board_card_groups + (new_cards,))[-1]
+            for player_hole_cards in hole_cards]
+
+    def _get_hole_cards_deals(self):
+        if self._hole_cards_deals is None:
+            num_hole_cards = self.game.get_num_hole_cards()
+            deals = [((), 1)]
+            for _ in range(NUM_PLAYERS):
+                deals = [
+                    (dealt_hole_cards + (hole_cards,), weight * hole_cards_weight)
+                    for dealt_hole_cards, weight in deals
+                    for hole_cards, hole_cards_weight
+                    in self.suit_isomorphism.get_canonical_continuations(dealt_hole_cards, num_hole_cards)]
+            total_weight = sum(weight for _, weight in deals)
+            self._hole_cards_deals = [(hole_cards, weight / total_weight) for hole_cards, weight in deals]
+        return self._hole_cards_deals
+
+    def _cfr_hole_cards_isomorphic(self, player, nodes, board_cards, players_folded, opponent_reach_prob):
+        value_sum = 0
+        for hole_cards_combination, probability in self._get_hole_cards_deals():
+            next_nodes = [
+                node.children[self.suit_isomorphism.canonicalize((hole_cards_combination[i],))[0]]
+                for i, node in enumerate(nodes)]
+            player_utility = self._cfr(
+                player,
+                next_nodes,
+                hole_cards_combination,
+                board_cards,
+                players_folded,
+                opponent_reach_prob)
+            value_sum += player_utility * probability
+        return value_sum
+
+    def _cfr_board_cards_isomorphic(self, player, nodes, hole_cards, board_cards, players_folded, opponent_reach_prob):
+        # Deal of hole cards and all previous board cards is canonical
+        board_card_groups = self._get_board_card_groups(board_cards)
+        continuations = self.suit_isomorphism.get_canonical_continuations(
+            tuple(hole_cards) + board_card_groups, nodes[0].card_count)
+        total_weight = sum(weight for _, weight in continuations)
+
+        value_sum = 0
+        for next_board_cards, weight in continuations:
+            node_keys = self._get_player_node_keys(hole_cards, board_card_groups, next_board_cards)
+            next_nodes = [node.children[node_keys[i]] for i, node in enumerate(nodes)]
+            player_utility = self._cfr(
+                player,
+                next_nodes,
+                hole_cards,
+                board_cards + list(next_board_cards),
+                players_folded,
+                opponent_reach_prob)
+            value_sum += player_utility * weight / total_weight
+        return value_sum
+
+    def _cfr_hole_cards_abstract(self, player, nodes, board_cards, players_folded, opponent_reach_prob):
+        hole_card_combination_probability = self.deal_table.hole_cards_deal_probability
+
+        value_sum = 0
+        for hole_cards_deal in self.deal_table.hole_cards_deals:
+            hole_cards_combination = self.deal_table.get_hole_cards(hole_cards_deal)
+            next_nodes = [
+                node.children[self.card_abstraction.get_bucket_key(hole_cards_combination[i], board_cards)]
+                for i, node in enumerate(nodes)]
+            player_utility = self._cfr(
+                player,
+                next_nodes,
+                hole_cards_combination,
+                board_cards,
+                players_folded,
+                opponent_reach_prob)
+            value_sum += player_utility * hole_card_combination_probability
+        return value_sum
+
+    def _cfr_board_cards_abstract(self, player, nodes, hole_cards, board_cards, players_folded, opponent_reach_prob):
+        board_cards_indexes, round_board_cards, board_cards_combination_probability = \
+            self.deal_table.get_board_cards_deals(flatten(*hole_cards), board_cards)
+
+        value_sum = 0
+        for board_cards_index in board_cards_indexes:
+            next_board_cards = board_cards + list(round_board_cards[board_cards_index])
+            next_nodes = [
+                node.children[self.card_abstraction.get_bucket_key(hole_cards[i], next_board_cards)]
+                for i, node in enumerate(nodes)]
+            player_utility = self._cfr(
+                player,
+                next_nodes,
+                hole_cards,
+                next_board_cards,
+                players_folded,
+                opponent_reach_prob)
+            value_sum += player_utility * board_cards_combination_probability
+        return value_sum
+
+    def _cfr_hole_cards_sampled(self, player, nodes, board_cards, players_folded, opponent_reach_prob):
+        hole_cards_deals = self.deal_table.hole_cards_deals
+        hole_cards_deal = hole_cards_deals[random.randrange(len(hole_cards_deals))]
+        hole_cards_combination = self.deal_table.get_hole_cards(hole_cards_deal)
+        if self.card_abstraction:
+            node_keys = [
+                self.card_abstraction.get_bucket_key(player_hole_cards, board_cards)
+                for player_hole_cards in hole_cards_combination]
+        else:
+            node_keys = hole_cards_combination
+        next_nodes = [node.children[node_keys[i]] for i, node in enumerate(nodes)]
+        return self._cfr(
+            player,
+            next_nodes,
+            hole_cards_combination,
+            board_cards,
+            players_folded,
+            opponent_reach_prob)
+
+    def _cfr_board_cards_sampled(self, player, nodes, hole_cards, board_cards, players_folded, opponent_reach_prob):
+        board_cards_indexes, round_board_cards, _ = \
+            self.deal_table.get_board_cards_deals(flatten(*hole_cards), board_cards)
+        new_board_cards = round_board_cards[random.choice(board_cards_indexes)]
+        next_board_cards = board_cards + list(new_board_cards)
+        if self.card_abstraction:
+            node_keys = [
+                self.card_abstraction.get_bucket_key(player_hole_cards, next_board_cards)
+                for player_hole_cards in hole_cards]
+        else:
+            node_keys = [new_board_cards] * len(nodes)
+        next_nodes = [node.children[node_keys[i]] for i, node in enumerate(nodes)]
+        return self._cfr(
+            player,
+            next_nodes,
+            hole_cards,
+            next_board_cards,
+            players_folded,
+            opponent_reach_prob)
+
     def _cfr_hole_cards(self, player, nodes, hole_cards, board_cards, players_folded, opponent_reach_prob):
-        hole_card_combination_probability = 1 / get_num_hole_card_combinations(self.game)
-        hole_cards = [node.children for node in nodes]
-        hole_card_combinations = filter(lambda comb: is_unique(*comb), itertools.product(*hole_cards))
+        if self.sample_deals:
+            return self._cfr_hole_cards_sampled(player, nodes, board_cards, players_folded, opponent_reach_prob)
+        if self.suit_isomorphism:
+            return self._cfr_hole_cards_isomorphic(player, nodes, board_cards, players_folded, opponent_reach_prob)
+        if self.card_abstraction:
+            return self._cfr_hole_cards_abstract(player, nodes, board_cards, players_folded, opponent_reach_prob)
+        hole_card_combination_probability = self.deal_table.hole_cards_deal_probability
 
         value_sum = 0
-        for hole_cards_combination in hole_card_combinations:
+        for hole_cards_deal in self.deal_table.hole_cards_deals:
+            hole_cards_combination = self.deal_table.get_hole_cards(hole_cards_deal)
             next_nodes = [node.children[hole_cards_combination[i]] for i, node in enumerate(nodes)]
             player_utility = self._cfr(
                 player,
@@ -230,19 +628,27 @@ class Cfr:
         return value_sum
 
     def _cfr_board_cards(self, player, nodes, hole_cards, board_cards, players_folded, opponent_reach_prob):
-        possible_board_cards = intersection(*map(lambda node: node.children, nodes))
-        board_cards_combination_probability = 1 / len(possible_board_cards)
+        if self.sample_deals:
+            return self._cfr_board_cards_sampled(
+                player, nodes, hole_cards, board_cards, players_folded, opponent_reach_prob)
+        if self.suit_isomorphism:
+            return self._cfr_board_cards_isomorphic(
+                player, nodes, hole_cards, board_cards, players_folded, opponent_reach_prob)
+        if self.card_abstraction:
+            return self._cfr_board_cards_abstract(
+                player, nodes, hole_cards, board_cards, players_folded, opponent_reach_prob)
+        board_cards_indexes, round_board_cards, board_cards_combination_probability = \
+            self.deal_table.get_board_cards_deals(flatten(*hole_cards), board_cards)
 
         value_sum = 0
-        for next_board_cards in possible_board_cards:
-            selected_board_cards = sorted(next_board_cards)
-            selected_board_cards_key = tuple(selected_board_cards)
-            next_nodes = [node.children[selected_board_cards_key] for i, node in enumerate(nodes)]
+        for board_cards_index in board_cards_indexes:
+            next_board_cards = round_board_cards[board_cards_index]
+            next_nodes = [node.children[next_board_cards] for node in nodes]
             player_utility = self._cfr(
                 player,
                 next_nodes,
                 hole_cards,
-                board_cards + list(selected_board_cards),
+                board_cards + list(next_board_cards),
                 players_folded,
                 opponent_reach_prob)
             value_sum += player_utility * board_cards_combination_probability
@@ -276,7 +682,14 @@ class Cfr:
             current_strategy = self._get_current_strategy(nodes)
 
             util = np.zeros(NUM_ACTIONS)
-            for a in node.children:
+            visited_actions = node.children
+            if self._regret_pruning_active:
+                visited_actions = [
+                    a for a in node.children
+                    if current_strategy[a] > 0 or node.non_positive_regret_iterations[a] < self.regret_pruning_delay]
+                self.num_regret_pruned_visits += len(node.children) - len(visited_actions)
+            self.num_action_visits += len(visited_actions)
+            for a in visited_actions:
                 if a == 0:
                     next_players_folded = list(players_folded)
                     next_players_folded[node_player] = True
@@ -294,16 +707,26 @@ class Cfr:
                 util[a] = action_util
                 node_util += current_strategy[a] * action_util
 
-            for a in node.children:
-                node.regret_sum[a] = max(node.regret_sum[a] + util[a] - node_util, 0)
+            if self.schedule is None:
+                for a in visited_actions:
+                    node.regret_sum[a] = max(node.regret_sum[a] + util[a] - node_util, 0)
+            else:
+                for a in visited_actions:
+                    node.iteration_regret[a] += util[a] - node_util
 
         else:
-            Cfr._regret_matching(nodes)
+            if not self._eager_regret_matching:
+                Cfr._regret_matching(nodes)
             current_strategy = self._get_current_strategy(nodes)
             node.strategy_sum += opponent_reach_prob * current_strategy * self.weight
 
             opponent_strategy = self._get_opponent_strategy(player, nodes)
-            for a in node.children:
+            visited_actions = node.children
+            if self.zero_reach_pruning:
+                visited_actions = [a for a in node.children if opponent_strategy[a] > 0]
+                self.num_zero_reach_pruned_visits += len(node.children) - len(visited_actions)
+            self.num_action_visits += len(visited_actions)
+            for a in visited_actions:
                 if a == 0:
                     next_players_folded = list(players_folded)
                     next_players_folded[node_player] = True
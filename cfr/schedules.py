@@ -0,0 +1,62 @@
+import numpy as np
+
+
+class DiscountedCfrSchedule:
+    """Discounted CFR (DCFR) by Brown and Sandholm.
+
+    After each iteration t positive accumulated regrets are multiplied by t^alpha / (t^alpha + 1),
+    negative ones by t^beta / (t^beta + 1) and contribution of iteration t to the average
+    strategy is weighted by t^gamma.
+    """
+
+    predictive = False
+
+    def __init__(self, alpha=1.5, beta=0, gamma=2):
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+
+    def update_regrets(self, regret_sum, iteration_regret, iteration):
+        """Add regrets of the iteration to the regret sum in place.
+
+        Args:
+            regret_sum (np.array): Accumulated regrets of the node.
+            iteration_regret (np.array): Regrets of the node collected in this iteration.
+            iteration (int): Number of the iteration starting from 1.
+        """
+        regret_sum += iteration_regret
+        positive_discount = iteration ** self.alpha / (iteration ** self.alpha + 1)
+        negative_discount = iteration ** self.beta / (iteration ** self.beta + 1)
+        regret_sum *= np.where(regret_sum > 0, positive_discount, negative_discount)
+
+    def get_strategy_weight(self, iteration):
+        """Return weight of the current strategy of the iteration in the average strategy."""
+        return iteration ** self.gamma
+
+
+class LinearCfrSchedule(DiscountedCfrSchedule):
+    """Linear CFR, regrets and average strategy contributions of iteration t are weighted by t."""
+
+    def __init__(self):
+        super().__init__(alpha=1, beta=1, gamma=1)
+
+
+class PredictiveCfrPlusSchedule:
+    """Predictive CFR+ by Farina, Kroer and Sandholm.
+
+    Accumulated regrets are floored at zero as in CFR+ and current strategy is obtained
+    by regret matching on the accumulated regrets plus regrets of the last iteration,
+    which are the prediction of regrets of the next iteration.
+    """
+
+    predictive = True
+
+    def __init__(self, gamma=2):
+        self.gamma = gamma
+
+    def update_regrets(self, regret_sum, iteration_regret, iteration):
+        regret_sum += iteration_regret
+        np.maximum(regret_sum, 0, out=regret_sum)
+
+    def get_strategy_weight(self, iteration):
+        return iteration ** self.gamma
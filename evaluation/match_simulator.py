@@ -0,0 +1,298 @@
+import itertools
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.constants import NUM_ACTIONS
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.nodes import BoardCardsNode, ActionNode, TerminalNode
+from tools.hand_evaluation import get_winners
+from tools.io_util import get_strategy
+from tools.action_sampler import get_cumulative_table, sample_actions
+
+
+NUM_PLAYERS = 2
+
+
+def _action_to_str(action):
+    if action == 0:
+        return 'f'
+    elif action == 1:
+        return 'c'
+    else:
+        return 'r'
+
+
+class MatchSimulator:
+    """Plays matches between two strategies in process without ACPC dealer.
+
+    Hands are dealt and played in batches. Cards, actions and utilities
+    of all hands in a batch are stored in NumPy arrays and the betting
+    is advanced for all unfinished hands of the batch at once.
+
+    Strategies are provided either as strategy trees or as strategy
+    dictionaries mapping information set keys to action probabilities
+    as returned by tools.io_util.read_strategy_from_file.
+
+    !!! Only limit betting games with 2 players are supported !!!
+    """
+
+    def __init__(self, game):
+        """Precompute betting structure, deals and showdown results of the game.
+
+        Args:
+            game (Game): ACPC game definition object.
+        """
+        if game.get_num_players() != NUM_PLAYERS:
+            raise AttributeError('Only games with 2 players are supported')
+        if game.get_betting_type() != acpc.BettingType.LIMIT:
+            raise AttributeError('Only limit betting games are supported')
+
+        self.game = game
+        self.deck = acpc.game_utils.generate_deck(game)
+        self.deck_size = len(self.deck)
+        self.num_hole_cards = game.get_num_hole_cards()
+        self.board_group_sizes = [
+            game.get_num_board_cards(r) for r in range(game.get_num_rounds())
+            if game.get_num_board_cards(r) > 0]
+        self.num_board_cards = sum(self.board_group_sizes)
+
+        self._build_betting_tree()
+        self._build_deals()
+        self._build_showdowns()
+
+    def _build_betting_tree(self):
+        # Betting has the same structure for all cards dealt so it is read
+        # from the branch of the first dealt cards of the game tree.
+        self.node_players = []
+        self.node_children = []
+        self.node_key_templates = []
+        self.node_pot_commitments = []
+        self.node_folded_players = []
+
+        def add_node(node, key_template, players_folded):
+            node_index = len(self.node_players)
+            self.node_players += [node.player if isinstance(node, ActionNode) else -1]
+            self.node_children += [[-1] * NUM_ACTIONS]
+            self.node_key_templates += [key_template]
+            if isinstance(node, TerminalNode):
+                self.node_pot_commitments += [np.array(node.pot_commitment, dtype=float)]
+                self.node_folded_players += [players_folded.index(True) if True in players_folded else -1]
+            else:
+                self.node_pot_commitments += [np.zeros(NUM_PLAYERS)]
+                self.node_folded_players += [-1]
+            return node_index
+
+        def walk(node, key_template, players_folded, board_group_index):
+            while isinstance(node, BoardCardsNode):
+                key_template = key_template + [board_group_index]
+                board_group_index += 1
+                node = next(iter(node.children.values()))
+            node_index = add_node(node, key_template, players_folded)
+            if isinstance(node, ActionNode):
+                for a, child in node.children.items():
+                    next_players_folded = list(players_folded)
+                    if a == 0:
+                        next_players_folded[node.player] = True
+                    self.node_children[node_index][a] = walk(
+                        child,
+                        key_template + [_action_to_str(a)],
+                        next_players_folded,
+                        board_group_index)
+            return node_index
+
+        root = GameTreeBuilder(self.game).build_tree()
+        walk(next(iter(root.children.values())), [], [False] * NUM_PLAYERS, 0)
+
+        self.num_nodes = len(self.node_players)
+        self.node_players = np.array(self.node_players, dtype=np.intp)
+        self.node_children = np.array(self.node_children, dtype=np.intp)
+        self.node_pot_commitments = np.array(self.node_pot_commitments)
+        self.node_folded_players = np.array(self.node_folded_players, dtype=np.intp)
+        self.action_nodes = np.where(self.node_players >= 0)[0]
+        self.max_depth = max(
+            sum(1 for item in template if isinstance(item, str))
+            for template in self.node_key_templates) + 1
+
+    def _get_cards_code(self, positions):
+        return sum(position * (self.deck_size ** i) for i, position in enumerate(positions))
+
+    def _build_deals(self):
+        self.hole_cards = list(itertools.combinations(range(self.deck_size), self.num_hole_cards))
+        self.hole_cards_index = np.full(self.deck_size ** self.num_hole_cards, -1, dtype=np.intp)
+        for i, hole_cards in enumerate(self.hole_cards):
+            self.hole_cards_index[self._get_cards_code(hole_cards)] = i
+
+        def board_sequences(available, group_sizes):
+            if not group_sizes:
+                yield ()
+                return
+            for group in itertools.combinations(sorted(available), group_sizes[0]):
+                for rest in board_sequences(available - set(group), group_sizes[1:]):
+                    yield (group,) + rest
+
+        self.boards = list(board_sequences(set(range(self.deck_size)), self.board_group_sizes))
+        self.boards_index = np.full(self.deck_size ** self.num_board_cards, -1, dtype=np.intp)
+        for i, board in enumerate(self.boards):
+            self.boards_index[self._get_cards_code([p for group in board for p in group])] = i
+
+    def _build_showdowns(self):
+        num_hole_cards = len(self.hole_cards)
+        self.showdown_results = np.zeros([num_hole_cards, num_hole_cards, len(self.boards)], dtype=np.int8)
+        for i, first_hole_cards in enumerate(self.hole_cards):
+            for j, second_hole_cards in enumerate(self.hole_cards):
+                if set(first_hole_cards) & set(second_hole_cards):
+                    continue
+                for k, board in enumerate(self.boards):
+                    board_positions = [p for group in board for p in group]
+                    if set(board_positions) & (set(first_hole_cards) | set(second_hole_cards)):
+                        continue
+                    board_cards = [self.deck[p] for p in board_positions]
+                    winners = get_winners([
+                        [self.deck[p] for p in first_hole_cards] + board_cards,
+                        [self.deck[p] for p in second_hole_cards] + board_cards])
+                    if len(winners) == 1:
+                        self.showdown_results[i, j, k] = 1 if winners[0] == 0 else -1
+
+    def _get_info_set_key(self, hole_cards, board, key_template):
+        key = '%s:' % ':'.join([str(self.deck[p]) for p in hole_cards])
+        for item in key_template:
+            if isinstance(item, str):
+                key += item
+            else:
+                if not key.endswith(':'):
+                    key += ':'
+                key += '%s:' % ':'.join([str(self.deck[p]) for p in board[item]])
+        return key
+
+    def get_strategy_table(self, strategy):
+        """Convert strategy to array of action probabilities indexed by dealt cards and betting node.
+
+        Args:
+            strategy: Strategy tree or dictionary mapping information set keys to action probabilities.
+
+        Returns:
+            np.array: Array of shape (hole cards, boards, betting nodes, actions).
+        """
+        if isinstance(strategy, dict):
+            strategy_dict = strategy
+        else:
+            strategy_dict = {}
+
+            def on_info_set(info_set_strategy):
+                strategy_dict[info_set_strategy[0]] = info_set_strategy[1]
+            get_strategy(strategy, on_info_set)
+
+        table = np.zeros([len(self.hole_cards), len(self.boards), self.num_nodes, NUM_ACTIONS])
+        for i, hole_cards in enumerate(self.hole_cards):
+            for j, board in enumerate(self.boards):
+                if set(hole_cards) & set([p for group in board for p in group]):
+                    continue
+                for node_index in self.action_nodes:
+                    key = self._get_info_set_key(hole_cards, board, self.node_key_templates[node_index])
+                    table[i, j, node_index] = strategy_dict[key]
+        return table
+
+    def _deal(self, rng, num_hands):
+        positions = np.argsort(rng.random([num_hands, self.deck_size]), axis=1)
+        hole_cards_indices = np.empty([num_hands, NUM_PLAYERS], dtype=np.intp)
+        for p in range(NUM_PLAYERS):
+            player_positions = np.sort(
+                positions[:, p * self.num_hole_cards:(p + 1) * self.num_hole_cards], axis=1)
+            hole_cards_indices[:, p] = self.hole_cards_index[self._get_cards_code(player_positions.T)]
+        board_positions = []
+        start = NUM_PLAYERS * self.num_hole_cards
+        for group_size in self.board_group_sizes:
+            board_positions += list(np.sort(positions[:, start:start + group_size], axis=1).T)
+            start += group_size
+        board_indices = self.boards_index[self._get_cards_code(board_positions)] \
+            if board_positions else np.zeros(num_hands, dtype=np.intp)
+        return hole_cards_indices, board_indices
+
+    def _play(self, rng, cumulative_tables, seat_strategies, hole_cards_indices, board_indices):
+        num_hands = len(board_indices)
+        hands = np.arange(num_hands)
+        nodes = np.zeros(num_hands, dtype=np.intp)
+        for _ in range(self.max_depth):
+            acting_players = self.node_players[nodes]
+            acting = np.where(acting_players >= 0)[0]
+            if len(acting) == 0:
+                break
+            acting_nodes = nodes[acting]
+            players = acting_players[acting]
+            actions = sample_actions(rng, cumulative_tables[
+                seat_strategies[acting, players],
+                hole_cards_indices[acting, players],
+                board_indices[acting],
+                acting_nodes])
+            nodes[acting] = self.node_children[acting_nodes, actions]
+
+        pot_commitments = self.node_pot_commitments[nodes]
+        folded_players = self.node_folded_players[nodes]
+        showdown_results = self.showdown_results[
+            hole_cards_indices[:, 0], hole_cards_indices[:, 1], board_indices]
+        seat_0_utilities = np.where(
+            showdown_results > 0,
+            pot_commitments[:, 1],
+            np.where(
+                showdown_results < 0,
+                -pot_commitments[:, 0],
+                (pot_commitments[:, 1] - pot_commitments[:, 0]) / 2))
+        seat_0_utilities = np.where(folded_players == 0, -pot_commitments[:, 0], seat_0_utilities)
+        seat_0_utilities = np.where(folded_players == 1, pot_commitments[:, 1], seat_0_utilities)
+
+        utilities = np.empty([num_hands, NUM_PLAYERS, 1])
+        utilities[hands, seat_strategies[:, 0], 0] = seat_0_utilities
+        utilities[hands, seat_strategies[:, 1], 0] = -seat_0_utilities
+        return utilities
+
+    def simulate(self, strategies, num_hands, seed=None, duplicate=True, batch_size=100000):
+        """Play match between two strategies.
+
+        Players switch seats after every hand as they do with ACPC dealer.
+        With duplicate dealing the same cards are played once more with
+        players' seats swapped, which reduces variance of the result.
+
+        Args:
+            strategies (list): Two strategy trees, strategy dictionaries or
+                               tables returned by get_strategy_table.
+            num_hands (int): Number of hands dealt.
+            seed (int): Seed of random generator. Results are identical for equal seed and batch size.
+            duplicate (bool): Play each deal second time with swapped seats.
+            batch_size (int): Number of hands played at once.
+
+        Returns:
+            np.array: Utilities of the strategies in shape (hands, players, 1) same as
+                      tools.match_evaluation.get_logs_data. With duplicate dealing hands
+                      played with swapped seats follow after all hands of the first match.
+        """
+        if len(strategies) != NUM_PLAYERS:
+            raise AttributeError('Exactly 2 strategies must be provided')
+        # Cumulative distributions are computed once instead of for each decision
+        cumulative_tables = get_cumulative_table(np.array([
+            strategy if isinstance(strategy, np.ndarray) else self.get_strategy_table(strategy)
+            for strategy in strategies]))
+
+        num_batches = int(np.ceil(num_hands / batch_size))
+        batch_seeds = np.random.SeedSequence(seed).spawn(num_batches)
+
+        num_matches = 2 if duplicate else 1
+        utilities = np.empty([num_matches * num_hands, NUM_PLAYERS, 1])
+        for batch_index in range(num_batches):
+            start = batch_index * batch_size
+            end = min(start + batch_size, num_hands)
+            deal_seed, *actions_seeds = batch_seeds[batch_index].spawn(1 + num_matches)
+
+            hole_cards_indices, board_indices = self._deal(np.random.default_rng(deal_seed), end - start)
+            first_seat_strategies = np.arange(start, end) % 2
+            seat_strategies = np.stack([first_seat_strategies, 1 - first_seat_strategies], axis=1)
+            for match_index in range(num_matches):
+                match_seat_strategies = seat_strategies if match_index == 0 else seat_strategies[:, ::-1]
+                match_offset = match_index * num_hands
+                utilities[match_offset + start:match_offset + end] = self._play(
+                    np.random.default_rng(actions_seeds[match_index]),
+                    cumulative_tables,
+                    np.ascontiguousarray(match_seat_strategies),
+                    hole_cards_indices,
+                    board_indices)
+        return utilities
@@ -2,13 +2,15 @@ import itertools
 import numpy as np
 
 from tools.game_tree.nodes import HoleCardsNode, TerminalNode, StrategyActionNode, BoardCardsNode
-from tools.utils import flatten, is_unique, intersection
+from tools.utils import flatten
 from tools.hand_evaluation import get_utility
+from tools.deal_table import get_deal_table
 
 
 class PlayerUtility:
     def __init__(self, game):
         self.game = game
+        self.deal_table = get_deal_table(game)
 
     def evaluate(self, *args):
         num_players = self.game.get_num_players()
@@ -35,21 +37,22 @@ class PlayerUtility:
         if isinstance(node, TerminalNode):
             return get_utility(hole_cards, board_cards, players_folded, node.pot_commitment)
         elif isinstance(node, HoleCardsNode):
-            values = np.zeros([0, self.game.get_num_players()])
-
-            hole_cards = [node.children for node in nodes]
-            for hole_cards_combination in itertools.product(*hole_cards):
-                if is_unique(*hole_cards_combination):
-                    new_nodes = [
-                        node.children[hole_cards_combination[i]]
-                        for i, node in enumerate(nodes)]
-                    player_values = self.get_player_utilities(new_nodes, hole_cards_combination, board_cards, players_folded, callback)
-                    values = np.append(values, [player_values], 0)
+            hole_cards_deals = self.deal_table.hole_cards_deals
+            values = np.zeros([len(hole_cards_deals), self.game.get_num_players()])
+            for i, hole_cards_deal in enumerate(hole_cards_deals):
+                hole_cards_combination = self.deal_table.get_hole_cards(hole_cards_deal)
+                new_nodes = [
+                    node.children[hole_cards_combination[p]]
+                    for p, node in enumerate(nodes)]
+                values[i, :] = self.get_player_utilities(
+                    new_nodes, hole_cards_combination, board_cards, players_folded, callback)
             return np.mean(values, 0)
         elif isinstance(node, BoardCardsNode):
-            possible_board_cards = intersection(*map(lambda node: node.children, nodes))
-            values = np.zeros([len(possible_board_cards), self.game.get_num_players()])
-            for i, next_board_cards in enumerate(possible_board_cards):
+            board_cards_indexes, round_board_cards, _ = \
+                self.deal_table.get_board_cards_deals(flatten(*hole_cards), board_cards)
+            values = np.zeros([len(board_cards_indexes), self.game.get_num_players()])
+            for i, board_cards_index in enumerate(board_cards_indexes):
+                next_board_cards = round_board_cards[board_cards_index]
                 new_nodes = [node.children[next_board_cards] for node in nodes]
                 new_board_cards = flatten(board_cards, next_board_cards)
                 values[i, :] = self.get_player_utilities(
@@ -0,0 +1,208 @@
+import os
+import hashlib
+import tempfile
+import numpy as np
+
+from evaluation.match_simulator import MatchSimulator, NUM_PLAYERS
+
+
+class UtilityMatrix:
+    """Computes exact expected utilities between all pairs of many strategies at once.
+
+    Strategies are stacked into one array of action probabilities indexed by strategy,
+    dealt cards and betting node using the tables of evaluation.match_simulator.MatchSimulator.
+    Reach probabilities of all strategies in both seats are then computed in one pass
+    over the betting tree and utilities of all pairs are contracted from them at once,
+    instead of walking the joint game tree once for every pair as PlayerUtility does.
+
+    !!! Only limit betting games with 2 players are supported !!!
+    """
+
+    def __init__(self, game, simulator=None):
+        """Precompute deals and payoffs of the game.
+
+        Args:
+            game (Game): ACPC game definition object.
+            simulator (MatchSimulator): Already created simulator of the game whose tables are reused.
+        """
+        self.game = game
+        self.simulator = simulator if simulator is not None else MatchSimulator(game)
+
+        simulator = self.simulator
+        self.terminal_nodes = np.where(simulator.node_players < 0)[0]
+
+        num_hole_cards = len(simulator.hole_cards)
+        num_boards = len(simulator.boards)
+        valid_deals = np.zeros([num_hole_cards, num_hole_cards, num_boards], dtype=bool)
+        for i, first_hole_cards in enumerate(simulator.hole_cards):
+            for j, second_hole_cards in enumerate(simulator.hole_cards):
+                if set(first_hole_cards) & set(second_hole_cards):
+                    continue
+                for k, board in enumerate(simulator.boards):
+                    board_positions = set([p for group in board for p in group])
+                    valid_deals[i, j, k] = not (board_positions & (set(first_hole_cards) | set(second_hole_cards)))
+        # All valid deals are equally likely
+        deal_probabilities = valid_deals / np.sum(valid_deals)
+
+        # Utility of the player in the first seat for each deal and terminal node
+        pot_commitments = simulator.node_pot_commitments[self.terminal_nodes]
+        folded_players = simulator.node_folded_players[self.terminal_nodes]
+        showdown_results = simulator.showdown_results[:, :, :, np.newaxis]
+        showdown_utilities = np.where(
+            showdown_results > 0,
+            pot_commitments[:, 1],
+            np.where(
+                showdown_results < 0,
+                -pot_commitments[:, 0],
+                (pot_commitments[:, 1] - pot_commitments[:, 0]) / 2))
+        utilities = np.where(folded_players == 0, -pot_commitments[:, 0], showdown_utilities)
+        utilities = np.where(folded_players == 1, pot_commitments[:, 1], utilities)
+        self.deal_utilities = utilities * deal_probabilities[:, :, :, np.newaxis]
+
+        game_hash = hashlib.sha256()
+        for array in [simulator.node_children, simulator.node_players, self.deal_utilities]:
+            game_hash.update(np.ascontiguousarray(array).tobytes())
+        self.game_fingerprint = game_hash.hexdigest()
+
+    def get_strategy_fingerprint(self, strategy_table):
+        """Return hash identifying the strategy table in this game."""
+        strategy_hash = hashlib.sha256(self.game_fingerprint.encode('utf-8'))
+        strategy_hash.update(np.ascontiguousarray(strategy_table, dtype=float).tobytes())
+        return strategy_hash.hexdigest()
+
+    def get_strategy_tables(self, strategies):
+        """Stack strategies into one array.
+
+        Args:
+            strategies (list): Strategy trees, strategy dictionaries or tables returned by MatchSimulator.get_strategy_table.
+
+        Returns:
+            np.array: Array of shape (strategies, hole cards, boards, betting nodes, actions).
+        """
+        return np.array([
+            strategy if isinstance(strategy, np.ndarray) else self.simulator.get_strategy_table(strategy)
+            for strategy in strategies])
+
+    def _get_reach_probabilities(self, strategy_tables):
+        simulator = self.simulator
+        num_strategies, num_hole_cards, num_boards, num_nodes, _ = strategy_tables.shape
+        reach_probabilities = np.zeros([num_strategies, NUM_PLAYERS, num_hole_cards, num_boards, num_nodes])
+        reach_probabilities[:, :, :, :, 0] = 1
+        # Parents are always stored before their children
+        for node_index in simulator.action_nodes:
+            player = simulator.node_players[node_index]
+            for action, child_index in enumerate(simulator.node_children[node_index]):
+                if child_index < 0:
+                    continue
+                reach_probabilities[:, :, :, :, child_index] = reach_probabilities[:, :, :, :, node_index]
+                reach_probabilities[:, player, :, :, child_index] *= strategy_tables[:, :, :, node_index, action]
+        return reach_probabilities[:, :, :, :, self.terminal_nodes]
+
+    def evaluate(self, strategies, opponent_strategies=None):
+        """Compute expected utilities of all pairs of strategies.
+
+        Args:
+            strategies (list): Strategy trees, strategy dictionaries or tables returned by MatchSimulator.get_strategy_table.
+                               Array returned by get_strategy_tables can be provided as well.
+            opponent_strategies (list): Strategies in columns of the matrix in the same format.
+                                        Strategies are played against each other if None.
+
+        Returns:
+            np.array: Matrix of shape (strategies, opponent strategies) with expected utility of the row strategy
+                      playing against the column strategy averaged over both seats.
+        """
+        strategy_tables = strategies if isinstance(strategies, np.ndarray) else self.get_strategy_tables(strategies)
+        reach_probabilities = self._get_reach_probabilities(strategy_tables)
+        if opponent_strategies is None:
+            opponent_reach_probabilities = reach_probabilities
+        else:
+            opponent_strategy_tables = opponent_strategies if isinstance(opponent_strategies, np.ndarray) \
+                else self.get_strategy_tables(opponent_strategies)
+            opponent_reach_probabilities = self._get_reach_probabilities(opponent_strategy_tables)
+
+        first_seat_utilities = np.einsum(
+            'ihbz,jgbz,hgbz->ij',
+            reach_probabilities[:, 0],
+            opponent_reach_probabilities[:, 1],
+            self.deal_utilities,
+            optimize=True)
+        opponent_first_seat_utilities = np.einsum(
+            'jhbz,igbz,hgbz->ij',
+            opponent_reach_probabilities[:, 0],
+            reach_probabilities[:, 1],
+            self.deal_utilities,
+            optimize=True)
+        return (first_seat_utilities - opponent_first_seat_utilities) / 2
+
+
+class CachedUtilityMatrix:
+    """Utility matrix whose entries are stored in a file under fingerprints of the strategies.
+
+    Only utilities of pairs of strategies which are not in the cache yet are computed,
+    so the matrix is extended incrementally when new strategies are added.
+    """
+
+    def __init__(self, utility_matrix, cache_file_path):
+        """Create the cache.
+
+        Args:
+            utility_matrix (UtilityMatrix): Utility matrix of the game.
+            cache_file_path (str): Path to the .npz file of the cache. Created when missing.
+        """
+        self.utility_matrix = utility_matrix
+        self.cache_file_path = cache_file_path
+        self.utilities = {}
+        if os.path.exists(cache_file_path):
+            with np.load(cache_file_path) as cache_data:
+                for fingerprint, opponent_fingerprint, utility in zip(
+                        cache_data['fingerprints'], cache_data['opponent_fingerprints'], cache_data['utilities']):
+                    self.utilities[(str(fingerprint), str(opponent_fingerprint))] = float(utility)
+
+    def _save(self):
+        cache_directory = os.path.dirname(self.cache_file_path)
+        if cache_directory and not os.path.exists(cache_directory):
+            os.makedirs(cache_directory, exist_ok=True)
+        keys = list(self.utilities.keys())
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=cache_directory if cache_directory else None, suffix='.npz')
+        with os.fdopen(file_descriptor, 'wb') as cache_file:
+            np.savez(
+                cache_file,
+                fingerprints=np.array([key[0] for key in keys]),
+                opponent_fingerprints=np.array([key[1] for key in keys]),
+                utilities=np.array([self.utilities[key] for key in keys]))
+        os.replace(tmp_path, self.cache_file_path)
+
+    def evaluate(self, strategies, opponent_strategies):
+        """Return the same matrix as UtilityMatrix.evaluate computing only pairs missing in the cache.
+
+        Returns:
+            tuple(np.array, int): Matrix of utilities and number of its entries which had to be computed.
+        """
+        strategy_tables = self.utility_matrix.get_strategy_tables(strategies)
+        opponent_strategy_tables = self.utility_matrix.get_strategy_tables(opponent_strategies)
+        fingerprints = [self.utility_matrix.get_strategy_fingerprint(table) for table in strategy_tables]
+        opponent_fingerprints = [self.utility_matrix.get_strategy_fingerprint(table) for table in opponent_strategy_tables]
+
+        utilities = np.full([len(fingerprints), len(opponent_fingerprints)], np.nan)
+        for i, fingerprint in enumerate(fingerprints):
+            for j, opponent_fingerprint in enumerate(opponent_fingerprints):
+                utilities[i, j] = self.utilities.get((fingerprint, opponent_fingerprint), np.nan)
+        missing = np.isnan(utilities)
+        num_computed = int(np.sum(missing))
+        if num_computed == 0:
+            return utilities, num_computed
+
+        # New strategies are evaluated against all opponents and all strategies against new opponents
+        missing_rows = np.where(np.any(missing, axis=1))[0]
+        utilities[missing_rows] = self.utility_matrix.evaluate(
+            strategy_tables[missing_rows], opponent_strategy_tables)
+        missing_columns = np.where(np.any(np.isnan(utilities), axis=0))[0]
+        if len(missing_columns) > 0:
+            utilities[:, missing_columns] = self.utility_matrix.evaluate(
+                strategy_tables, opponent_strategy_tables[missing_columns])
+
+        for i, fingerprint in enumerate(fingerprints):
+            for j, opponent_fingerprint in enumerate(opponent_fingerprints):
+                self.utilities[(fingerprint, opponent_fingerprint)] = utilities[i, j]
+        self._save()
+        return utilities, num_computed
@@ -1,25 +1,51 @@
 import sys
+import time
+import heapq
+import random
+import tempfile
 import numpy as np
-import matplotlib.pyplot as plt
 import multiprocessing
 
 import acpc_python_client as acpc
 
 from response.rnr_parameter_optimizer import RnrParameterOptimizer
-from evaluation.exploitability import Exploitability
-from tools.game_utils import is_strategies_equal
+from evaluation.utility_matrix import UtilityMatrix, CachedUtilityMatrix
+from implicit_modelling.response_cache import ResponseCache
+from tools.game_utils import is_strategies_equal, get_big_blind_size
+from tools.io_util import write_strategy_to_file
+from tools.strategy_store import load_strategy, build_strategy_tree
 
 
-def _train_response(params):
-    i, num_opponents, log, parallel, game, rnr_params, opponent_strategy_trees = params
-    log_training = log and not parallel
-    if log_training:
+# State of the worker process set once by _init_worker so that tasks only carry index of the opponent
+_worker_state = None
+
+
+def _get_opponent_strategy_tree(game, opponent_strategy):
+    if isinstance(opponent_strategy, str):
+        return build_strategy_tree(game, load_strategy(opponent_strategy))
+    return opponent_strategy
+
+
+def _init_worker(game_file_path, opponent_strategies, rnr_params, log):
+    global _worker_state
+    _worker_state = [acpc.read_game_file(game_file_path), opponent_strategies, rnr_params, log, None]
+
+
+def _train_response(params, worker_state=None):
+    i, seed = params
+    if worker_state is None:
+        worker_state = _worker_state
+    game, opponent_strategies, rnr_params, log, game_tree = worker_state
+    if log:
         print()
-        print('Training response %s/%s' % (i + 1, num_opponents))
+        print('Training response %s/%s' % (i + 1, len(opponent_strategies)))
+    if seed is not None:
+        random.seed(seed)
     current_rnr_params = rnr_params[i]
     exploitability = current_rnr_params[0]
     exploitability_max_delta = current_rnr_params[1]
-    rnr_args = { 'show_progress': log_training }
+    # Game tree is built by the first training in the process and reused by the others
+    rnr_args = { 'show_progress': log, 'game_tree': game_tree }
     if len(current_rnr_params) > 2:
         rnr_args['iterations'] = current_rnr_params[2]
     if len(current_rnr_params) > 3:
@@ -27,17 +53,45 @@ def _train_response(params):
     if len(current_rnr_params) > 4:
         rnr_args['weigth_delay'] = current_rnr_params[4]
     rnr = RnrParameterOptimizer(game, **rnr_args)
-    response_strategy, _, _ = rnr.train(opponent_strategy_trees[i], exploitability, exploitability_max_delta)
-    return (i, response_strategy)
+    start_time = time.perf_counter()
+    response_strategy, response_exploitability, p = rnr.train(
+        _get_opponent_strategy_tree(game, opponent_strategies[i]), exploitability, exploitability_max_delta)
+    worker_state[4] = rnr.game_tree
+    return (i, response_strategy, response_exploitability, p, time.perf_counter() - start_time)
 
 def train_portfolio_responses(
         game_file_path,
-        opponent_strategy_trees,
+        opponent_strategies,
         rnr_params,
         callback=None,
         log=False,
-        parallel=False):
-    num_opponents = len(opponent_strategy_trees)
+        parallel=False,
+        seed=None,
+        responses_cache_directory=None,
+        num_workers=None):
+    """Train restricted Nash response to each opponent.
+
+    When training in parallel, opponent strategies are written to strategy files which workers
+    load through the strategy store, so that they are shared by all workers as read-only
+    memory-mapped arrays instead of being pickled with every task.
+
+    Args:
+        game_file_path (str): Path to ACPC game definition file.
+        opponent_strategies (list): Strategy trees of opponents or paths to their strategy files.
+        rnr_params (list(tuple)): Target exploitability, maximal exploitability delta and optionally iterations,
+                                  checkpoint iterations and weight delay of RnrParameterOptimizer for each opponent.
+        callback (callable): Called with index of the opponent and the response when the response is ready.
+        log (bool): Print progress of the training.
+        parallel (bool): Train responses in worker processes.
+        seed (int): Seed of the training. Response to i-th opponent is trained with seed + i.
+        responses_cache_directory (str): Directory of trained responses cache. Responses found
+                                         in the cache are not trained again.
+        num_workers (int): Number of worker processes. Half of the CPUs but at least 2 are used if None.
+
+    Returns:
+        list(HoleCardsNode): Responses to the opponents.
+    """
+    num_opponents = len(opponent_strategies)
 
     game = acpc.read_game_file(game_file_path)
 
@@ -45,25 +99,105 @@ def train_portfolio_responses(
         print()
 
     responses = [None] * num_opponents
-    params = [(i, num_opponents, log, parallel, game, rnr_params, opponent_strategy_trees) for i in range(num_opponents)]
-    if parallel:
-        with multiprocessing.Pool(max(int(multiprocessing.cpu_count() / 2), 2)) as p:
-            for i, result in enumerate(p.imap_unordered(_train_response, params)):
-                response_index, response_strategy = result
-                responses[response_index] = response_strategy
-                if callback:
-                    callback(response_index, response_strategy)
-                if log:
-                    print('Progress: %s/%s' % (i + 1, num_opponents))
-    else:
-        for response_index, response_strategy in map(lambda p: _train_response(p), params):
+    response_seeds = [None if seed is None else seed + i for i in range(num_opponents)]
+
+    responses_cache = None
+    response_keys = None
+    if responses_cache_directory:
+        responses_cache = ResponseCache(responses_cache_directory)
+        response_keys = [
+            responses_cache.get_response_key(game_file_path, opponent_strategies[i], rnr_params[i], response_seeds[i])
+            for i in range(num_opponents)]
+
+    params = []
+    for i in range(num_opponents):
+        cached_response = responses_cache.get_response(game, response_keys[i]) if responses_cache else None
+        if cached_response is None:
+            params += [(i, response_seeds[i])]
+        else:
+            responses[i] = cached_response[0]
             if callback:
-                callback(response_index, response_strategy)
-            responses[response_index] = response_strategy
+                callback(i, responses[i])
+    if log and responses_cache:
+        print('%s/%s responses found in cache' % (num_opponents - len(params), num_opponents))
+
+    def on_response_trained(response_index, response_strategy, response_exploitability, p):
+        if responses_cache:
+            responses_cache.add_response(response_keys[response_index], response_strategy, response_exploitability, p)
+        if callback:
+            callback(response_index, response_strategy)
+        responses[response_index] = response_strategy
+
+    if parallel and params:
+        if num_workers is None:
+            num_workers = max(int(multiprocessing.cpu_count() / 2), 2)
+        with tempfile.TemporaryDirectory() as opponents_directory:
+            opponent_strategy_paths = [None] * num_opponents
+            for i, _ in params:
+                opponent_strategy = opponent_strategies[i]
+                if not isinstance(opponent_strategy, str):
+                    opponent_strategy_path = '%s/%s.strategy' % (opponents_directory, i)
+                    write_strategy_to_file(opponent_strategy, opponent_strategy_path)
+                    opponent_strategy = opponent_strategy_path
+                opponent_strategy_paths[i] = opponent_strategy
+            with multiprocessing.Pool(
+                    min(num_workers, len(params)),
+                    initializer=_init_worker,
+                    initargs=(game_file_path, opponent_strategy_paths, rnr_params, False)) as pool:
+                for i, result in enumerate(pool.imap_unordered(_train_response, params)):
+                    response_index, response_strategy, response_exploitability, p, training_time = result
+                    on_response_trained(response_index, response_strategy, response_exploitability, p)
+                    if log:
+                        print('Progress: %s/%s, response %s trained in %.1fs, exploitability %s, p %s' % (
+                            i + 1, len(params), response_index + 1, training_time, response_exploitability, p))
+    else:
+        worker_state = [game, opponent_strategies, rnr_params, log, None]
+        for task_params in params:
+            on_response_trained(*_train_response(task_params, worker_state)[:4])
 
     return responses
 
 
+def _select_portfolio_greedy(utilities):
+    """Order responses by greedy maximization of portfolio utility.
+
+    Portfolio utility is the mean over opponents of the best utility any portfolio
+    response achieves against them. It is submodular so marginal gains of responses
+    can only decrease as the portfolio grows. Lazy greedy selection therefore keeps gains
+    from previous steps as upper bounds and recomputes only the most promising ones.
+
+    Args:
+        utilities (np.array): Utility of each response (rows) against each opponent (columns).
+
+    Returns:
+        tuple(np.array, np.array): Indices of responses in the order of addition and portfolio utility after each addition.
+    """
+    num_responses = utilities.shape[0]
+    response_added = np.ones(num_responses, dtype=np.intp) * -1
+    portfolio_utilities = np.zeros(num_responses)
+
+    response_total_utility = np.mean(utilities, axis=1)
+    best_response_index = np.argmax(response_total_utility)
+    response_added[0] = best_response_index
+    portfolio_utilities[0] = response_total_utility[best_response_index]
+    max_utilities = np.copy(utilities[best_response_index])
+
+    # Gains of all responses are unknown at first so they are all computed in the first step
+    gains_heap = [(-np.inf, j) for j in range(num_responses) if j != best_response_index]
+    heapq.heapify(gains_heap)
+    for i in range(1, num_responses):
+        while True:
+            _, j = heapq.heappop(gains_heap)
+            gain = np.mean(np.maximum(max_utilities, utilities[j])) - portfolio_utilities[i - 1]
+            if not gains_heap or gain >= -gains_heap[0][0]:
+                break
+            heapq.heappush(gains_heap, (-gain, j))
+        np.maximum(max_utilities, utilities[j], out=max_utilities)
+        response_added[i] = j
+        portfolio_utilities[i] = np.mean(max_utilities)
+    return response_added, portfolio_utilities
+
+
 def optimize_portfolio(
         game_file_path,
         opponent_strategies,
@@ -71,54 +205,47 @@ def optimize_portfolio(
         portfolio_size=-1,
         portfolio_cut_improvement_threshold=0.05,
         log=False,
-        output_directory=None):
+        output_directory=None,
+        utilities_cache_path=None):
+    """Select responses for the portfolio.
+
+    Args:
+        game_file_path (str): Path to ACPC game definition file.
+        opponent_strategies (list): Strategy trees of opponents.
+        response_strategies (list): Strategy trees of responses to the opponents.
+        portfolio_size (int): Size of the portfolio. Determined by the improvement threshold if not positive.
+        portfolio_cut_improvement_threshold (float): Minimal improvement of portfolio utility relative to
+                                                     the total improvement for which a response is still added.
+        log (bool): Print and plot the selection.
+        output_directory (str): Directory where the plot is saved, the plot is shown if None.
+        utilities_cache_path (str): Path to the file where utilities of responses against opponents are cached.
+                                    Only utilities of pairs which were not evaluated before are computed.
 
+    Returns:
+        tuple(list, np.array): Portfolio strategies and their indices in response strategies.
+    """
     num_opponents = len(opponent_strategies)
 
     if portfolio_size == num_opponents or portfolio_cut_improvement_threshold == 0:
         return response_strategies, range(num_opponents)
 
     game = acpc.read_game_file(game_file_path)
-    exp = Exploitability(game)
+    utility_matrix = UtilityMatrix(game)
 
     if log:
         print()
 
-    utilities = np.zeros([num_opponents, num_opponents])
-    for i in range(num_opponents):
-        for j in range(num_opponents):
-            utilities[i, j] = exp.evaluate(opponent_strategies[j], response_strategies[i])
-
-    portfolio_utilities = np.zeros(num_opponents)
-    response_added = np.ones(num_opponents, dtype=np.intp) * -1
-
-    response_total_utility = np.mean(utilities, axis=1)
-    best_response_index = np.argmax(response_total_utility)
-
-    portfolio_utilities[0] = response_total_utility[best_response_index]
-    response_added[0] = best_response_index
+    # Utilities are in the same units as returned by evaluation.exploitability.Exploitability
+    if utilities_cache_path:
+        utilities, num_computed = CachedUtilityMatrix(utility_matrix, utilities_cache_path).evaluate(
+            response_strategies, opponent_strategies)
+        if log:
+            print('Utilities computed for %s of %s pairs' % (num_computed, utilities.size))
+    else:
+        utilities = utility_matrix.evaluate(response_strategies, opponent_strategies)
+    utilities = utilities * 1000 * get_big_blind_size(game)
 
-    max_utilities = np.zeros(num_opponents)
-    np.copyto(max_utilities, utilities[best_response_index])
-
-    response_available = [True] * num_opponents
-    response_available[best_response_index] = False
-    for i in range(1, num_opponents):
-        best_portfolio_utility = None
-        best_max_utilities = None
-        best_response_to_add = None
-        for j in range(num_opponents):
-            if response_available[j]:
-                new_max_utilities = np.maximum(max_utilities, utilities[j])
-                new_portfolio_utility = np.mean(new_max_utilities)
-                if not best_portfolio_utility or new_portfolio_utility > best_portfolio_utility:
-                    best_portfolio_utility = new_portfolio_utility
-                    best_max_utilities = new_max_utilities
-                    best_response_to_add = j
-        response_available[best_response_to_add] = False
-        max_utilities = best_max_utilities
-        portfolio_utilities[i] = best_portfolio_utility
-        response_added[i] = best_response_to_add
+    response_added, portfolio_utilities = _select_portfolio_greedy(utilities)
 
     final_portfolio_size = None
 
@@ -143,6 +270,9 @@ def optimize_portfolio(
         print('Response added: %s' % response_added)
         print('Final portfolio size: %s' % final_portfolio_size)
 
+        # Plotting is imported only when needed because it is slow to import
+        import matplotlib.pyplot as plt
+
         plt.figure(dpi=160)
         plt.plot(np.arange(num_opponents, dtype=np.intp) + 1, portfolio_utilities)
         plt.plot(
@@ -1,17 +1,19 @@
 import sys
+import copy
 import numpy as np
 import os
 
 import acpc_python_client as acpc
 
 from tools.constants import NUM_ACTIONS
-from tools.io_util import read_strategy_from_file
-from tools.agent_utils import get_info_set, select_action, convert_action_to_int
+from tools.strategy_store import load_strategy, build_strategy_trees
+from tools.agent_utils import select_action
+from tools.info_set_tracker import InfoSetTracker
+from tools.match_state import State
 from implicit_modelling.strategies_weighted_mixeture import StrategiesWeightedMixture
 from implicit_modelling.exp3g import Exp3G
+from implicit_modelling.utility_estimation_worker import UtilityEstimationWorker
 from utility_estimation.simple import SimpleUtilityEstimator
-from utility_estimation.imaginary_observations import ImaginaryObservationsUtilityEstimator
-from utility_estimation.aivat import AivatUtilityEstimator
 
 
 class ImplicitModellingAgent(acpc.Agent):
@@ -22,7 +24,25 @@ class ImplicitModellingAgent(acpc.Agent):
             exp3g_gamma=0.02,
             exp3g_eta=0.025,
             utility_estimator_class=SimpleUtilityEstimator,
-            utility_estimator_args=None):
+            utility_estimator_args=None,
+            background_estimation=False,
+            background_estimation_process=False,
+            max_staleness=10):
+        """Create implicit modelling agent.
+
+        Args:
+            game_file_path (str): Path to ACPC game definition file.
+            portfolio_strategy_files_paths (list(str)): Paths to strategy files of portfolio members.
+            exp3g_gamma (float): Exploration parameter of Exp3G.
+            exp3g_eta (float): Learning rate of Exp3G.
+            utility_estimator_class: Class of utility estimator used to evaluate finished hands.
+            utility_estimator_args (dict): Additional arguments of the utility estimator.
+            background_estimation (bool): Estimate utilities of finished hands on background worker
+                                          instead of before responding to the next hand.
+            background_estimation_process (bool): Use worker process instead of thread for background estimation.
+            max_staleness (int): Maximum number of finished hands whose estimates were not yet applied
+                                 to weights. The agent waits for the worker when this is exceeded.
+        """
         super().__init__()
         self.portfolio_size = len(portfolio_strategy_files_paths)
         self.bandit_algorithm = Exp3G(exp3g_gamma, exp3g_eta, self.portfolio_size)
@@ -32,72 +52,180 @@ class ImplicitModellingAgent(acpc.Agent):
         else:
             self.utility_estimator = utility_estimator_class(game, True, **utility_estimator_args)
 
-        self.portfolio_trees = []
-        self.portfolio_dicts = []
-        for portfolio_strategy_file_path in portfolio_strategy_files_paths:
-            strategy_tree, strategy_dict = read_strategy_from_file(game_file_path, portfolio_strategy_file_path)
-            self.portfolio_trees += [strategy_tree]
-            self.portfolio_dicts += [strategy_dict]
+        # Strategies are memory-mapped from the strategy store so that agent processes
+        # using the same portfolio strategies share them in memory
+        self.portfolio_dicts = [
+            load_strategy(portfolio_strategy_file_path)
+            for portfolio_strategy_file_path in portfolio_strategy_files_paths]
+        self.portfolio_trees = build_strategy_trees(game, self.portfolio_dicts)
 
         self.portfolio_strategies_mixture = StrategiesWeightedMixture(game, self.portfolio_trees)
 
+        # Strategies of all portfolio members are arrays indexed by the same info set ids
+        # so that the mixed strategy can be computed for all info sets at once when weights change.
+        self.info_set_ids = self.portfolio_dicts[0].info_set_ids
+        self.portfolio_strategies = []
+        for stored_strategy in self.portfolio_dicts:
+            if stored_strategy.info_set_ids == self.info_set_ids:
+                self.portfolio_strategies += [stored_strategy.strategies]
+            else:
+                self.portfolio_strategies += [
+                    np.array([stored_strategy[info_set] for info_set in self.info_set_ids])]
+        self.current_strategy = None
+        self._update_current_strategy()
+
+        self.info_set_tracker = InfoSetTracker(self.info_set_ids)
+
+        self.max_staleness = max_staleness
+        self.estimation_worker = None
+        if background_estimation:
+            self.estimation_worker = UtilityEstimationWorker(
+                game,
+                self.utility_estimator,
+                self.portfolio_trees,
+                use_process=background_estimation_process)
+
+    def __copy__(self):
+        """Return agent which shares portfolio strategies and utility estimator with this agent.
+
+        Bandit state is copied so that the agents adapt to their opponents independently.
+        Copies must be used from one thread and background estimation can't be shared.
+        """
+        if self.estimation_worker is not None:
+            raise AttributeError('Agents with background estimation can\'t be copied')
+        agent = object.__new__(type(self))
+        agent.__dict__.update(self.__dict__)
+        agent.bandit_algorithm = copy.deepcopy(self.bandit_algorithm)
+        agent.info_set_tracker = InfoSetTracker(self.info_set_ids)
+        return agent
+
+    def _update_current_strategy(self):
+        experts_weights = self.bandit_algorithm.get_current_expert_probabilities()
+        current_strategy = np.zeros([len(self.info_set_ids), NUM_ACTIONS])
+        for expert_weight, expert_strategies in zip(experts_weights, self.portfolio_strategies):
+            current_strategy += expert_weight * expert_strategies
+        self.current_strategy = current_strategy
+
+    def _apply_expert_utility_estimates(self, expert_utility_estimates):
+        if expert_utility_estimates is not None:
+            self.bandit_algorithm.update_weights(expert_utility_estimates)
+            self._update_current_strategy()
+
+    def _apply_completed_estimations(self, max_pending=None):
+        for expert_utility_estimates in self.estimation_worker.get_completed(max_pending):
+            self._apply_expert_utility_estimates(expert_utility_estimates)
+
+    def close(self):
+        """Stop background estimation worker, estimates of hands which were not applied are discarded."""
+        if self.estimation_worker is not None:
+            self.estimation_worker.close()
+            self.estimation_worker = None
+
+    def get_estimation_metrics(self):
+        """Return metrics of background utility estimation or None if it is not enabled."""
+        if self.estimation_worker is None:
+            return None
+        return self.estimation_worker.get_metrics()
+
     def on_game_start(self, game):
-        pass
+        self.info_set_tracker.reset()
+        if self.estimation_worker is not None:
+            self._apply_completed_estimations()
 
     def _get_info_set_current_strategy(self, info_set):
-        experts_weights = self.bandit_algorithm.get_current_expert_probabilities()
-        current_strategy = np.zeros(NUM_ACTIONS)
-        for i in range(self.portfolio_size):
-            current_strategy += experts_weights[i] * np.array(self.portfolio_dicts[i][info_set])
-        return current_strategy
+        return self.current_strategy[self.info_set_ids[info_set]]
 
     def on_next_turn(self, game, match_state, is_acting_player):
+        self.info_set_tracker.update(game, match_state)
         if not is_acting_player:
             return
 
-        info_set = get_info_set(game, match_state)
-        current_strategy = self._get_info_set_current_strategy(info_set)
+        current_strategy = self.current_strategy[self.info_set_tracker.get_info_set_id()]
         selected_action = select_action(current_strategy)
         self.set_next_action(selected_action)
 
     def on_game_finished(self, game, match_state):
+        self.info_set_tracker.reset()
         expert_probabilities = self.bandit_algorithm.get_current_expert_probabilities()
+        if self.estimation_worker is not None:
+            self.estimation_worker.submit(
+                State.from_acpc_state(game, match_state.get_state()),
+                match_state.get_viewing_player(),
+                expert_probabilities)
+            self._apply_completed_estimations(self.max_staleness)
+            return
+
         self.portfolio_strategies_mixture.update_weights(expert_probabilities)
         expert_utility_estimates = self.utility_estimator.get_utility_estimations(
             match_state.get_state(),
             match_state.get_viewing_player(),
             self.portfolio_strategies_mixture.strategy,
             self.portfolio_trees)
-        if expert_utility_estimates is not None:
-            self.bandit_algorithm.update_weights(expert_utility_estimates)
+        self._apply_expert_utility_estimates(expert_utility_estimates)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 6:
-        print("Usage {game_file_path} {dealer_hostname} {dealer_port} [none|imaginary_observations] *{portfolio_strategy_files_paths}")
-        sys.exit(1)
+def get_utility_estimator(game_file_path, utility_estimator_type):
+    """Return utility estimator class and its arguments for the utility estimation method name.
 
-    utility_estimator_type = sys.argv[4]
-    utility_estimator_class = None
+    Args:
+        game_file_path (str): Path to ACPC game definition file.
+        utility_estimator_type (str): One of none, imaginary_observations or aivat.
+
+    Returns:
+        tuple: Utility estimator class and dictionary of its additional arguments or None.
+    """
     utility_estimator_args = None
     if utility_estimator_type == 'none':
         utility_estimator_class = SimpleUtilityEstimator
     elif utility_estimator_type == 'imaginary_observations':
+        from utility_estimation.imaginary_observations import ImaginaryObservationsUtilityEstimator
         utility_estimator_class = ImaginaryObservationsUtilityEstimator
     elif utility_estimator_type == 'aivat':
+        from utility_estimation.aivat import AivatUtilityEstimator
         utility_estimator_class = AivatUtilityEstimator
 
-        game_name = os.path.basename(sys.argv[1])[:-len('.game')]
-        equilibrium_strategy_path = '%s/../strategies/%s-equilibrium.strategy' % (os.path.dirname(sys.argv[1]), game_name)
+        game_name = os.path.basename(game_file_path)[:-len('.game')]
+        equilibrium_strategy_path = '%s/../strategies/%s-equilibrium.strategy' % (os.path.dirname(game_file_path), game_name)
         utility_estimator_args = {
             'equilibirum_strategy_path': equilibrium_strategy_path,
         }
     else:
         raise AttributeError('Invalid utility estimation method type %s' % utility_estimator_type)
+    return utility_estimator_class, utility_estimator_args
+
+
+if __name__ == "__main__":
+    # Options precede positional arguments
+    args = sys.argv[1:]
+    background_estimation = None
+    max_staleness = 10
+    while args and args[0].startswith('--'):
+        option, _, value = args.pop(0).partition('=')
+        if option == '--background-estimation' and value in ['thread', 'process']:
+            background_estimation = value
+        elif option == '--max-staleness' and value.isdigit():
+            max_staleness = int(value)
+        else:
+            print('Invalid option %s' % option)
+            sys.exit(1)
+
+    if len(args) < 5:
+        print("Usage [--background-estimation={thread|process}] [--max-staleness={hands}] "
+              "{game_file_path} {dealer_hostname} {dealer_port} [none|imaginary_observations|aivat] *{portfolio_strategy_files_paths}")
+        sys.exit(1)
+
+    utility_estimator_class, utility_estimator_args = get_utility_estimator(args[0], args[3])
 
-    client = acpc.Client(sys.argv[1], sys.argv[2], sys.argv[3])
-    client.play(ImplicitModellingAgent(
-        sys.argv[1],
-        sys.argv[5:],
+    agent = ImplicitModellingAgent(
+        args[0],
+        args[4:],
         utility_estimator_class=utility_estimator_class,
-        utility_estimator_args=utility_estimator_args))
+        utility_estimator_args=utility_estimator_args,
+        background_estimation=background_estimation is not None,
+        background_estimation_process=background_estimation == 'process',
+        max_staleness=max_staleness)
+    try:
+        client = acpc.Client(args[0], args[1], args[2])
+        client.play(agent)
+    finally:
+        agent.close()
@@ -0,0 +1,93 @@
+import os
+import hashlib
+import tempfile
+
+from tools.io_util import get_file_hash, get_strategy_lines, write_strategy_to_file, read_strategy_from_file
+
+
+RNR_PARAMS_DEFAULTS = [None, None, 1500, 10, None]
+
+EXPLOITABILITY_PREFIX = '# exploitability '
+P_PREFIX = '# p '
+
+
+class ResponseCache:
+    """Content addressed store of trained restricted Nash responses.
+
+    Responses are stored under a key derived from everything that determines
+    the training so that responses which were already trained are reused
+    instead of trained again.
+    """
+
+    def __init__(self, cache_directory):
+        self.cache_directory = cache_directory
+        if not os.path.exists(cache_directory):
+            os.makedirs(cache_directory)
+
+    def get_response_key(self, game_file_path, opponent_strategy, rnr_params, seed):
+        """Return key of the response.
+
+        Args:
+            game_file_path (str): Path to the game definition file.
+            opponent_strategy: Strategy tree of the opponent or path to its strategy file.
+            rnr_params (tuple): Target exploitability, maximal exploitability delta and optionally iterations,
+                                checkpoint iterations and weight delay as accepted by train_portfolio_responses.
+            seed (int): Seed of the training.
+
+        Returns:
+            str: Hex digest identifying the response.
+        """
+        # Parameters which are not provided are replaced by the defaults of RnrParameterOptimizer
+        # so that equal trainings have equal keys
+        rnr_params = list(rnr_params) + RNR_PARAMS_DEFAULTS[len(rnr_params):]
+        key_hash = hashlib.sha256()
+        key_hash.update(get_file_hash(game_file_path).encode('utf-8'))
+        if isinstance(opponent_strategy, str):
+            with open(opponent_strategy, 'r') as strategy_file:
+                strategy_lines = [
+                    '%s\n' % line.rstrip('\n') for line in strategy_file if line.strip() and not line.startswith('#')]
+        else:
+            strategy_lines = get_strategy_lines(opponent_strategy)
+        key_hash.update(''.join(sorted(strategy_lines)).encode('utf-8'))
+        key_hash.update(repr([rnr_params, seed]).encode('utf-8'))
+        return key_hash.hexdigest()
+
+    def _get_strategy_file_path(self, key):
+        return '%s/%s/%s.strategy' % (self.cache_directory, key[:2], key)
+
+    def get_response(self, game, key):
+        """Return cached response or None if the response is not cached.
+
+        Returns:
+            tuple(HoleCardsNode, float, float): Response strategy tree, its exploitability and p of the response.
+        """
+        strategy_file_path = self._get_strategy_file_path(key)
+        if not os.path.exists(strategy_file_path):
+            return None
+        exploitability = None
+        p = None
+        with open(strategy_file_path, 'r') as strategy_file:
+            for line in strategy_file:
+                if not line.startswith('#'):
+                    break
+                if line.startswith(EXPLOITABILITY_PREFIX):
+                    exploitability = float(line[len(EXPLOITABILITY_PREFIX):])
+                elif line.startswith(P_PREFIX):
+                    p = float(line[len(P_PREFIX):])
+        response_strategy, _ = read_strategy_from_file(game, strategy_file_path)
+        return response_strategy, exploitability, p
+
+    def add_response(self, key, response_strategy, exploitability, p):
+        """Store the response under the key."""
+        strategy_file_path = self._get_strategy_file_path(key)
+        strategy_directory = os.path.dirname(strategy_file_path)
+        if not os.path.exists(strategy_directory):
+            os.makedirs(strategy_directory, exist_ok=True)
+        # Response is moved to its place at once so that interrupted write never leaves partial strategy in the cache
+        file_descriptor, tmp_file_path = tempfile.mkstemp(dir=strategy_directory)
+        os.close(file_descriptor)
+        write_strategy_to_file(
+            response_strategy,
+            tmp_file_path,
+            ['%s%r' % (EXPLOITABILITY_PREFIX, float(exploitability)), '%s%r' % (P_PREFIX, float(p))])
+        os.replace(tmp_file_path, strategy_file_path)
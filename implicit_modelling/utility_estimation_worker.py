@@ -0,0 +1,138 @@
+import time
+import queue
+import traceback
+import threading
+import multiprocessing
+import numpy as np
+
+from implicit_modelling.strategies_weighted_mixeture import StrategiesWeightedMixture
+
+# Interval in seconds in which the blocked agent checks that the worker is still running
+WORKER_POLL_INTERVAL = 1
+
+
+def _estimation_loop(game, utility_estimator, evaluated_strategies, tasks, results):
+    try:
+        strategies_mixture = StrategiesWeightedMixture(game, evaluated_strategies)
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            state, player, expert_probabilities = task
+            start = time.perf_counter()
+            strategies_mixture.update_weights(expert_probabilities)
+            expert_utility_estimates = utility_estimator.get_utility_estimations(
+                state,
+                player,
+                strategies_mixture.strategy,
+                evaluated_strategies)
+            results.put((expert_utility_estimates, time.perf_counter() - start))
+    except Exception:
+        # Exception itself may not be picklable, the agent re-raises it from the formatted traceback
+        results.put((None, traceback.format_exc()))
+
+
+class UtilityEstimationWorker:
+    """Runs utility estimation of finished hands outside of the agent's thread.
+
+    Finished hands are queued and estimated on a background thread or process
+    so that the agent can respond to the dealer while estimation is running.
+    Completed estimates are collected by the agent which then applies them
+    to its bandit algorithm.
+    """
+
+    def __init__(self, game, utility_estimator, evaluated_strategies, use_process=False):
+        """Start the worker.
+
+        Args:
+            game (Game): ACPC game definition object.
+            utility_estimator: Utility estimator used to evaluate finished hands.
+            evaluated_strategies (list(object)): Strategy trees of portfolio members.
+            use_process (bool): Run estimation in forked process instead of a thread.
+        """
+        if use_process:
+            context = multiprocessing.get_context('fork')
+            self.tasks = context.Queue()
+            self.results = context.Queue()
+            worker_class = context.Process
+        else:
+            self.tasks = queue.Queue()
+            self.results = queue.Queue()
+            worker_class = threading.Thread
+        self.worker = worker_class(
+            target=_estimation_loop,
+            args=(game, utility_estimator, evaluated_strategies, self.tasks, self.results),
+            daemon=True)
+        self.worker.start()
+
+        self.num_pending = 0
+        self.num_submitted = 0
+        self.queue_depths = []
+        self.estimation_latencies = []
+
+    def submit(self, state, player, expert_probabilities):
+        """Queue finished hand for estimation.
+
+        Args:
+            state (State): Copy of the final state of the hand, see tools.match_state.State.
+            player (int): Position of the agent in the hand.
+            expert_probabilities (np.array): Probabilities of portfolio members used to play the hand.
+        """
+        self.tasks.put((state, player, np.array(expert_probabilities)))
+        self.num_pending += 1
+        self.num_submitted += 1
+        self.queue_depths.append(self.num_pending)
+
+    def get_completed(self, max_pending=None):
+        """Collect estimates that are already completed.
+
+        Args:
+            max_pending (int): If provided, block until at most this many hands wait for estimation.
+
+        Returns:
+            list(np.array): Utility estimates of portfolio members in the order in which the hands were submitted.
+
+        Raises:
+            RuntimeError: Estimation failed in the worker or the worker stopped.
+        """
+        completed = []
+        while self.num_pending > 0:
+            block = max_pending is not None and self.num_pending > max_pending
+            try:
+                expert_utility_estimates, latency = self.results.get(block=block, timeout=WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                if not block:
+                    break
+                if not self.worker.is_alive():
+                    raise RuntimeError('Utility estimation worker stopped with %s hands pending' % self.num_pending)
+                continue
+            if expert_utility_estimates is None:
+                raise RuntimeError('Utility estimation failed in the worker:\n%s' % latency)
+            self.num_pending -= 1
+            self.estimation_latencies.append(latency)
+            completed.append(expert_utility_estimates)
+        return completed
+
+    def get_metrics(self):
+        """Return queue depth and estimator latency statistics.
+
+        Queue depth is recorded each time a hand is submitted and includes the submitted hand.
+        Latencies are in seconds.
+        """
+        queue_depths = np.array(self.queue_depths) if self.queue_depths else np.zeros(1)
+        latencies = np.array(self.estimation_latencies) if self.estimation_latencies else np.zeros(1)
+        return {
+            'num_submitted': self.num_submitted,
+            'num_pending': self.num_pending,
+            'queue_depth_mean': np.mean(queue_depths),
+            'queue_depth_max': np.max(queue_depths),
+            'estimation_latency_mean': np.mean(latencies),
+            'estimation_latency_p99': np.percentile(latencies, 99),
+            'estimation_latency_max': np.max(latencies),
+        }
+
+    def close(self):
+        """Stop the worker after all queued hands are estimated."""
+        if self.worker.is_alive():
+            self.tasks.put(None)
+        self.worker.join()
@@ -6,8 +6,9 @@ from acpc_python_client.game_utils import generate_deck
 from tools.game_tree.nodes import HoleCardsNode, TerminalNode, StrategyActionNode, BoardCardsNode
 import numpy as np
 from tools.hand_evaluation import get_utility
-from tools.utils import flatten, intersection
+from tools.utils import flatten
 from tools.tree_utils import get_parent_action
+from tools.deal_table import get_deal_table
 
 
 class BestResponse:
@@ -16,6 +17,7 @@ class BestResponse:
         if game.get_num_players() != 2:
             raise AttributeError(
                 'Only games with two players are supported')
+        self.deal_table = get_deal_table(game)
         self.big_blind = None
         for i in range(game.get_num_players()):
             player_blind = game.get_blind(i)
@@ -58,16 +60,17 @@ class BestResponse:
 
         elif isinstance(best_response_node, HoleCardsNode):
             player_values_sum = 0
-            for cards in best_response_node.children:
+            hole_cards = self.deal_table.hole_cards
+            for i, cards in enumerate(hole_cards):
                 new_best_response_cards = flatten(best_response_cards, cards)
                 new_player_states = np.empty([0, 3])
-                for other_cards in best_response_node.children:
-                    if len(intersection(cards, other_cards)) == 0 and len(intersection(cards, board_cards)) == 0:
-                        for state in player_states:
-                            new_player_states = np.append(
-                                new_player_states,
-                                [[state[0].children[other_cards], state[1], other_cards]],
-                                axis=0)
+                for other_cards_index in self.deal_table.compatible_hole_cards[i]:
+                    other_cards = hole_cards[other_cards_index]
+                    for state in player_states:
+                        new_player_states = np.append(
+                            new_player_states,
+                            [[state[0].children[other_cards], state[1], other_cards]],
+                            axis=0)
 
                 player_values_sum += self._solve(
                     player_position,
@@ -75,11 +78,14 @@ class BestResponse:
                     new_player_states,
                     new_best_response_cards,
                     board_cards)
-            return player_values_sum / len(best_response_node.children)
+            return player_values_sum / len(hole_cards)
 
         elif isinstance(best_response_node, BoardCardsNode):
             player_values_sum = 0
-            for cards in best_response_node.children:
+            board_cards_indexes, round_board_cards, board_cards_probability = \
+                self.deal_table.get_board_cards_deals(best_response_cards, board_cards)
+            for board_cards_index in board_cards_indexes:
+                cards = round_board_cards[board_cards_index]
                 new_board_cards = flatten(board_cards, cards)
 
                 new_player_states = np.empty([0, 3])
@@ -96,7 +102,7 @@ class BestResponse:
                     new_player_states,
                     best_response_cards,
                     new_board_cards)
-            return player_values_sum / len(best_response_node.children)
+            return player_values_sum * board_cards_probability
 
         elif best_response_node.player == player_position:
             values_sum = 0
@@ -1,7 +1,7 @@
 import random
 import numpy as np
 
-from cfr.main import Cfr, NUM_PLAYERS
+from cfr.main import Cfr, NUM_PLAYERS, DEFAULT_INITIAL_STRATEGY_WEIGHT
 from tools.game_tree.nodes import ActionNode
 from tools.walk_trees import walk_trees
 
@@ -12,8 +12,11 @@ class DataBiasedResponse(Cfr):
             game,
             opponent_sample_tree,
             p_max=0.8,
-            show_progress=True):
-        super().__init__(game, show_progress)
+            show_progress=True,
+            game_tree=None,
+            initial_strategy=None,
+            initial_strategy_weight=DEFAULT_INITIAL_STRATEGY_WEIGHT):
+        super().__init__(game, show_progress, game_tree, initial_strategy, initial_strategy_weight)
         self.p_max = p_max
 
         opponent_action_decision_counts = {}
@@ -35,4 +38,4 @@ class DataBiasedResponse(Cfr):
         if random.random() <= p_conf:
             return action_decision_counts / samples_count
         else:
-            return super(DataBiasedResponse, self)._get_opponent_strategy(nodes, player)
+            return super(DataBiasedResponse, self)._get_opponent_strategy(player, nodes)
@@ -1,8 +1,10 @@
+from cfr.main import DEFAULT_INITIAL_STRATEGY_WEIGHT
 from response.restricted_nash_response import RestrictedNashResponse
 from evaluation.exploitability import Exploitability
 from tools.game_tree.builder import GameTreeBuilder
 from tools.game_tree.node_provider import StrategyTreeNodeProvider
 from tools.game_utils import copy_strategy
+from tools.io_util import read_strategy_from_file
 
 
 class RnrParameterOptimizer():
@@ -12,8 +14,24 @@ class RnrParameterOptimizer():
             iterations=1500,
             checkpoint_iterations=10,
             weigth_delay=None,
-            show_progress=True):
+            show_progress=True,
+            game_tree=None,
+            initial_strategy=None,
+            initial_strategy_weight=DEFAULT_INITIAL_STRATEGY_WEIGHT,
+            probe_checkpoint_weight=None,
+            schedule=None):
         self.game = game
+        self.schedule = schedule
+        # When set, each probed p after the first starts from the regrets and strategy sums
+        # of the previous probe multiplied by this weight
+        self.probe_checkpoint_weight = probe_checkpoint_weight
+        # Each probed p is trained starting from the initial strategy
+        if isinstance(initial_strategy, str) and not initial_strategy.endswith('.npz'):
+            initial_strategy = read_strategy_from_file(None, initial_strategy)
+        self.initial_strategy = initial_strategy
+        self.initial_strategy_weight = initial_strategy_weight
+        # Game tree of the RNR is built once and reset for each probed p and each trained opponent
+        self.game_tree = game_tree
         self.iterations = iterations
         self.checkpoint_iterations = checkpoint_iterations
         self.weight_delay = weigth_delay
@@ -50,6 +68,7 @@ class RnrParameterOptimizer():
         iteration = 0
         p_low = 0
         p_high = 1
+        rnr = None
 
         if self.show_progress:
             print()
@@ -61,22 +80,37 @@ class RnrParameterOptimizer():
                 print('Run %s' % iteration)
                 print('Interval: %s - %s' % (p_low, p_high))
             p_current = p_low + (p_high - p_low) / 2
-            rnr = RestrictedNashResponse(
-                self.game,
-                opponent_strategy,
-                p_current,
-                show_progress=self.show_progress)
+            if rnr is None:
+                rnr = RestrictedNashResponse(
+                    self.game,
+                    opponent_strategy,
+                    p_current,
+                    show_progress=self.show_progress,
+                    game_tree=self.game_tree,
+                    initial_strategy=self.initial_strategy,
+                    initial_strategy_weight=self.initial_strategy_weight)
+                self.game_tree = rnr.game_tree
+            elif self.probe_checkpoint_weight:
+                rnr.p = p_current
+                rnr.load_checkpoint(rnr.get_checkpoint(), self.probe_checkpoint_weight)
+            else:
+                rnr.p = p_current
+                rnr.reset()
+                if self.initial_strategy is not None:
+                    rnr.warm_start(self.initial_strategy, self.initial_strategy_weight)
             if self.weight_delay:
                 rnr.train(
                     self.iterations,
                     checkpoint_iterations=self.checkpoint_iterations,
                     checkpoint_callback=checkpoint_callback,
-                    weight_delay=self.weight_delay)
+                    weight_delay=self.weight_delay,
+                    schedule=self.schedule)
             else:
                 rnr.train(
                     self.iterations,
                     checkpoint_iterations=self.checkpoint_iterations,
-                    checkpoint_callback=checkpoint_callback)
+                    checkpoint_callback=checkpoint_callback,
+                    schedule=self.schedule)
 
             if best_exploitability_delta < max_exploitability_delta:
                 print('Result exploitability: %s, p=%s' % (best_exploitability, p_current))
@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.action_sampler import ActionSampler, get_cumulative_table
+from tools.strategy_store import load_strategy
+
+LEDUC_EQUILIBRIUM_STRATEGY_PATH = 'strategies/leduc.limit.2p-equilibrium.strategy'
+
+
+class ActionSamplerTests(unittest.TestCase):
+    def test_cumulative_table(self):
+        cumulative_table = get_cumulative_table([
+            [0.2, 0.3, 0.5],
+            [0, 0.3, 0.3],
+            [0.1, 0.2, 0],
+            [0, 0, 0]])
+        self.assertTrue(np.allclose(cumulative_table, [
+            [0.2, 0.5, 1],
+            [0, 0.5, 1],
+            [1 / 3, 1, 1],
+            [0, 1, 1]]))
+        self.assertTrue(np.all(cumulative_table[:, -1] == 1))
+
+    def test_sampled_action_frequencies(self):
+        strategies = np.array([
+            [0.2, 0.3, 0.5],
+            [0, 1, 0],
+            [0.6, 0.4, 0]])
+        sampler = ActionSampler(strategies, seed=1)
+        num_samples = 100000
+        for info_set_id, strategy in enumerate(strategies):
+            actions = sampler.sample(np.full(num_samples, info_set_id))
+            frequencies = np.bincount(actions, minlength=3) / num_samples
+            self.assertTrue(np.allclose(frequencies, strategy, atol=0.01))
+            self.assertTrue(np.all(frequencies[strategy == 0] == 0))
+
+        self.assertEqual(sampler.sample_action(1), acpc.ActionType.CALL)
+        self.assertNotEqual(sampler.sample_action(2), acpc.ActionType.RAISE)
+
+    def test_seeded_streams_are_reproducible(self):
+        stored_strategy = load_strategy(LEDUC_EQUILIBRIUM_STRATEGY_PATH)
+        info_set_ids = np.arange(len(stored_strategy)).repeat(10)
+
+        first_sampler = ActionSampler(stored_strategy.strategies, seed=42)
+        second_sampler = ActionSampler(stored_strategy.strategies, seed=42)
+        self.assertTrue(np.all(first_sampler.sample(info_set_ids) == second_sampler.sample(info_set_ids)))
+
+        first_copy = first_sampler.copy(seed=7)
+        second_copy = second_sampler.copy(seed=8)
+        self.assertIs(first_copy.cumulative_table, first_sampler.cumulative_table)
+        self.assertFalse(np.all(first_copy.sample(info_set_ids) == second_copy.sample(info_set_ids)))
@@ -0,0 +1,153 @@
+import unittest
+import os
+import shutil
+import asyncio
+import copy
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.agent_host import AgentHost
+from tools.agent_server import create_agent
+from tools.agent_server_client import request_match
+from tools.dealer import play_match_async, play_matches_async
+from tools.match_evaluation import get_player_utilities_from_log_file
+from tools.match_state import MatchState, get_cards_by_str
+
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+LEDUC_EQUILIBRIUM_STRATEGY_PATH = 'strategies/leduc.limit.2p-equilibrium.strategy'
+
+TEST_DIRECTORY = 'test/agent_host'
+SERVER_SOCKET_PATH = '%s/agents.sock' % TEST_DIRECTORY
+
+
+class AgentHostTests(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists(TEST_DIRECTORY):
+            shutil.rmtree(TEST_DIRECTORY)
+        os.makedirs(TEST_DIRECTORY)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIRECTORY)
+
+    def test_parse_match_state(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        cards_by_str = get_cards_by_str(game)
+
+        match_state = MatchState.parse(game, 'MATCHSTATE:1:7:rc/r:|Ks/Ah', cards_by_str)
+        self.assertEqual(match_state.get_viewing_player(), 1)
+        self.assertEqual(match_state.hand_number, 7)
+        self.assertEqual(match_state.acting_player, 1)
+        self.assertFalse(match_state.is_finished())
+        state = match_state.get_state()
+        self.assertEqual(state.get_round(), 1)
+        self.assertEqual(state.get_hole_card(1, 0), cards_by_str['Ks'])
+        self.assertEqual(state.get_board_card(0), cards_by_str['Ah'])
+        self.assertEqual(state.get_betting_string(), 'rc/r')
+
+        match_state = MatchState.parse(game, 'MATCHSTATE:0:8:rf:Qs|', cards_by_str)
+        self.assertTrue(match_state.is_finished())
+        self.assertTrue(match_state.get_state().get_player_folded(1))
+
+    def test_concurrent_matches(self):
+        agents = {
+            'Equilibrium': (
+                LEDUC_POKER_GAME_FILE_PATH,
+                create_agent('strategy', LEDUC_POKER_GAME_FILE_PATH, LEDUC_EQUILIBRIUM_STRATEGY_PATH)),
+            'ImplicitModelling': (
+                LEDUC_POKER_GAME_FILE_PATH,
+                create_agent(
+                    'implicit_modelling',
+                    LEDUC_POKER_GAME_FILE_PATH,
+                    'none',
+                    LEDUC_EQUILIBRIUM_STRATEGY_PATH,
+                    LEDUC_EQUILIBRIUM_STRATEGY_PATH)),
+        }
+        host = AgentHost(agents)
+        num_matches = 10
+
+        async def play():
+            tables = []
+
+            def on_port(player_index, port):
+                agent_name = 'Equilibrium' if player_index == 0 else 'ImplicitModelling'
+                tables.append(asyncio.ensure_future(host.play_match_async(agent_name, 'localhost', port)))
+
+            await play_matches_async(
+                [('%s/match_%s' % (TEST_DIRECTORY, i),
+                  LEDUC_POKER_GAME_FILE_PATH,
+                  50,
+                  i,
+                  [('Equilibrium', None), ('ImplicitModelling', None)])
+                 for i in range(num_matches)],
+                timeout=60,
+                on_port=on_port)
+            return await asyncio.gather(*tables)
+
+        num_decisions = asyncio.run(play())
+
+        self.assertEqual(len(num_decisions), 2 * num_matches)
+        self.assertEqual(sum(num_decisions), host.num_decisions)
+        self.assertEqual(host.num_active_matches, 0)
+        for i in range(num_matches):
+            log_reading = get_player_utilities_from_log_file('%s/match_%s.log' % (TEST_DIRECTORY, i))
+            self.assertEqual(log_reading[0].shape, (50, 2, 1))
+
+        # Preloaded agent is never played with, tables play with its copies
+        implicit_agent = agents['ImplicitModelling'][1]
+        self.assertTrue((implicit_agent.bandit_algorithm.weights == 1).all())
+
+    def test_implicit_modelling_agent_copy(self):
+        agent = create_agent(
+            'implicit_modelling',
+            LEDUC_POKER_GAME_FILE_PATH,
+            'none',
+            LEDUC_EQUILIBRIUM_STRATEGY_PATH,
+            LEDUC_EQUILIBRIUM_STRATEGY_PATH)
+        agent_copy = copy.copy(agent)
+        self.assertIs(agent_copy.portfolio_trees, agent.portfolio_trees)
+        self.assertIs(agent_copy.portfolio_strategies, agent.portfolio_strategies)
+        self.assertIsNot(agent_copy.bandit_algorithm, agent.bandit_algorithm)
+
+        agent_copy._apply_expert_utility_estimates(np.array([1, -1]))
+        self.assertTrue((agent.bandit_algorithm.weights == 1).all())
+        self.assertFalse((agent_copy.current_strategy == agent.current_strategy).all())
+
+    def test_serve_match_requests(self):
+        agents = {
+            'Equilibrium': (
+                LEDUC_POKER_GAME_FILE_PATH,
+                create_agent('strategy', LEDUC_POKER_GAME_FILE_PATH, LEDUC_EQUILIBRIUM_STRATEGY_PATH)),
+        }
+        host = AgentHost(agents)
+
+        async def play():
+            loop = asyncio.get_running_loop()
+            server = asyncio.ensure_future(host.serve_async(SERVER_SOCKET_PATH))
+            while not os.path.exists(SERVER_SOCKET_PATH):
+                await asyncio.sleep(0.01)
+            requests = []
+
+            def on_port(player_index, port):
+                requests.append(loop.run_in_executor(
+                    None, request_match, SERVER_SOCKET_PATH, 'Equilibrium', 'localhost', port))
+
+            try:
+                invalid_request_result = await loop.run_in_executor(
+                    None, request_match, SERVER_SOCKET_PATH, 'Unknown', 'localhost', 0)
+                await play_match_async(
+                    '%s/match' % TEST_DIRECTORY,
+                    LEDUC_POKER_GAME_FILE_PATH,
+                    20,
+                    1,
+                    [('Equilibrium_1', None), ('Equilibrium_2', None)],
+                    timeout=60,
+                    on_port=on_port)
+                return invalid_request_result, await asyncio.gather(*requests)
+            finally:
+                server.cancel()
+
+        invalid_request_result, results = asyncio.run(play())
+        self.assertFalse(invalid_request_result)
+        self.assertEqual(results, [True, True])
+        self.assertFalse(os.path.exists(SERVER_SOCKET_PATH))
@@ -0,0 +1,70 @@
+import unittest
+import os
+import shutil
+import threading
+
+from tools.agent_server import AgentServer, read_agents_file
+from tools.agent_server_client import request_match
+from tools.dealer import play_match
+from tools.match_evaluation import get_player_utilities_from_log_file
+
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+LEDUC_EQUILIBRIUM_STRATEGY_PATH = 'strategies/leduc.limit.2p-equilibrium.strategy'
+
+TEST_DIRECTORY = 'test/agent_server'
+SERVER_SOCKET_PATH = '%s/agents.sock' % TEST_DIRECTORY
+
+
+class AgentServerTests(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists(TEST_DIRECTORY):
+            shutil.rmtree(TEST_DIRECTORY)
+        os.makedirs(TEST_DIRECTORY)
+
+    def tearDown(self):
+        shutil.rmtree(TEST_DIRECTORY)
+
+    def test_matches_with_preloaded_agents(self):
+        agents_file_path = '%s/agents' % TEST_DIRECTORY
+        with open(agents_file_path, 'w') as agents_file:
+            agents_file.write('# Test agents\n')
+            agents_file.write('Equilibrium strategy %s %s\n' % (LEDUC_POKER_GAME_FILE_PATH, LEDUC_EQUILIBRIUM_STRATEGY_PATH))
+
+        server = AgentServer(SERVER_SOCKET_PATH, read_agents_file(agents_file_path))
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        try:
+            threads = []
+            results = []
+
+            def on_port(player_index, port):
+                def request():
+                    results.append(request_match(SERVER_SOCKET_PATH, 'Equilibrium', 'localhost', port))
+                thread = threading.Thread(target=request, daemon=True)
+                thread.start()
+                threads.append(thread)
+
+            self.assertFalse(request_match(SERVER_SOCKET_PATH, 'Unknown', 'localhost', 0))
+
+            log_readings = []
+            for i in range(2):
+                match_name = '%s/match_%s' % (TEST_DIRECTORY, i)
+                play_match(
+                    match_name,
+                    LEDUC_POKER_GAME_FILE_PATH,
+                    100,
+                    1,
+                    [('Equilibrium_1', None), ('Equilibrium_2', None)],
+                    timeout=60,
+                    on_port=on_port)
+                log_readings += [get_player_utilities_from_log_file(match_name + '.log')]
+            for thread in threads:
+                thread.join()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(results, [True] * 4)
+        self.assertEqual(log_readings[0][0].shape, (100, 2, 1))
+        # Children of the server must not share random state
+        self.assertFalse((log_readings[0][0] == log_readings[1][0]).all())
@@ -0,0 +1,112 @@
+import unittest
+import os
+import random
+import shutil
+import itertools
+
+import acpc_python_client as acpc
+
+from cfr.main import Cfr
+from cfr.schedules import LinearCfrSchedule
+from evaluation.exploitability import Exploitability
+from tools.card_abstraction import CardAbstraction, create_card_abstraction, load_card_abstraction, \
+    expand_abstract_strategy
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.node_provider import StrategyTreeNodeProvider
+from tools.game_utils import is_strategies_equal
+from tools.io_util import walk_action_nodes
+
+KUHN_BIG_DECK_POKER_GAME_FILE_PATH = 'games/kuhn.bigdeck.limit.2p.game'
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+
+ABSTRACTIONS_DIRECTORY = 'test/card_abstractions'
+
+
+def get_info_sets(game_tree):
+    info_sets = []
+    walk_action_nodes(game_tree, lambda info_set, node: info_sets.append(info_set))
+    return info_sets
+
+
+class CardAbstractionTests(unittest.TestCase):
+    def test_leduc_equity_buckets(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        card_abstraction = create_card_abstraction(game, [3, 3], seed=0)
+        self.assertEqual(card_abstraction.num_buckets, [3, 3])
+        self.assertEqual(card_abstraction.get_bucket([43], []), 0)
+        self.assertEqual(card_abstraction.get_bucket([46], []), 1)
+        self.assertEqual(card_abstraction.get_bucket([50], []), 2)
+        # Pairs are the strongest hands of the second round
+        self.assertEqual(card_abstraction.get_bucket([42], [43]), 2)
+        self.assertEqual(card_abstraction.get_abstract_info_set('43:cc:42:r'), 'b0:cc:b2:r')
+        self.assertEqual(card_abstraction.get_abstract_info_set('51:'), 'b2:')
+
+    def test_kuhn_bigdeck_histogram_buckets(self):
+        game = acpc.read_game_file(KUHN_BIG_DECK_POKER_GAME_FILE_PATH)
+        card_abstraction = create_card_abstraction(game, 2, features='histogram', seed=0)
+        self.assertEqual(card_abstraction.num_buckets, [2])
+        buckets = [card_abstraction.get_bucket([card], []) for card in card_abstraction.deck]
+        self.assertEqual(buckets, sorted(buckets))
+
+    def test_leduc_abstraction_save_load(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        card_abstraction = create_card_abstraction(game, [2, 3], features='histogram', seed=0)
+
+        if os.path.exists(ABSTRACTIONS_DIRECTORY):
+            shutil.rmtree(ABSTRACTIONS_DIRECTORY)
+        os.makedirs(ABSTRACTIONS_DIRECTORY)
+        abstraction_file_path = '%s/leduc.npz' % ABSTRACTIONS_DIRECTORY
+        card_abstraction.save(abstraction_file_path)
+        loaded_card_abstraction = load_card_abstraction(game, abstraction_file_path)
+        shutil.rmtree(ABSTRACTIONS_DIRECTORY)
+
+        self.assertEqual(loaded_card_abstraction.buckets, card_abstraction.buckets)
+        self.assertEqual(loaded_card_abstraction.num_buckets, card_abstraction.num_buckets)
+
+    def test_leduc_abstract_tree(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        card_abstraction = create_card_abstraction(game, [2, 3], seed=0)
+        tree = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+        abstract_tree = GameTreeBuilder(game, StrategyTreeNodeProvider(), card_abstraction=card_abstraction).build_tree()
+
+        abstract_info_sets = get_info_sets(abstract_tree)
+        self.assertLess(len(abstract_info_sets), len(get_info_sets(tree)))
+        # Tree contains all sequences of buckets, some of them are never dealt
+        self.assertTrue(
+            set(card_abstraction.get_abstract_info_set(info_set) for info_set in get_info_sets(tree))
+            <= set(abstract_info_sets))
+
+    def test_leduc_lossless_abstraction_cfr_is_exact(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        # Buckets by ranks lose only suits which don't matter in Leduc
+        deck = sorted(acpc.game_utils.generate_deck(game))
+        min_rank = deck[0] // 4
+        num_ranks = deck[-1] // 4 - min_rank + 1
+        card_abstraction = CardAbstraction(game, [
+            {((hole_card,), ()): hole_card // 4 - min_rank for hole_card in deck},
+            {((hole_card,), (board_card,)): (hole_card // 4 - min_rank) * num_ranks + board_card // 4 - min_rank
+             for hole_card, board_card in itertools.permutations(deck, 2)},
+        ])
+
+        cfr = Cfr(game, show_progress=False)
+        cfr.train(5, weight_delay=0, schedule=LinearCfrSchedule())
+        abstract_cfr = Cfr(game, show_progress=False, card_abstraction=card_abstraction)
+        abstract_cfr.train(5, weight_delay=0, schedule=LinearCfrSchedule())
+
+        strategy = expand_abstract_strategy(game, abstract_cfr.game_tree, card_abstraction)
+        self.assertTrue(is_strategies_equal(cfr.game_tree, strategy))
+
+    def test_leduc_sampled_abstract_cfr_converges(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        card_abstraction = create_card_abstraction(game, [3, 6], seed=0)
+        exploitability = Exploitability(game)
+        random.seed(0)
+
+        cfr = Cfr(game, show_progress=False, card_abstraction=card_abstraction)
+        cfr.train(10, weight_delay=0, schedule=LinearCfrSchedule(), sample_deals=True)
+        initial_exploitability = exploitability.evaluate(
+            expand_abstract_strategy(game, cfr.game_tree, card_abstraction))
+        cfr.train(300, weight_delay=0, schedule=LinearCfrSchedule(), sample_deals=True)
+        trained_exploitability = exploitability.evaluate(
+            expand_abstract_strategy(game, cfr.game_tree, card_abstraction))
+        self.assertLess(trained_exploitability, initial_exploitability / 2)
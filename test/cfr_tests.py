@@ -1,14 +1,24 @@
 import unittest
+import os
+import shutil
 
 import acpc_python_client as acpc
 
 from cfr.main import Cfr
+from cfr.schedules import LinearCfrSchedule, DiscountedCfrSchedule, PredictiveCfrPlusSchedule
+from evaluation.exploitability import Exploitability
+from tools.game_utils import is_strategies_equal
+from tools.io_util import read_strategy_from_file
 
 KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
 KUHN_BIG_DECK_POKER_GAME_FILE_PATH = 'games/kuhn.bigdeck.limit.2p.game'
 KUHN_BIG_DECK_2ROUND_POKER_GAME_FILE_PATH = 'games/kuhn.bigdeck.2round.limit.2p.game'
 LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
 
+KUHN_EQUILIBRIUM_STRATEGY_PATH = 'strategies/kuhn.limit.2p-equilibrium.strategy'
+
+CHECKPOINTS_DIRECTORY = 'test/cfr_checkpoints'
+
 
 class CfrTests(unittest.TestCase):
     def test_kuhn_cfr_works(self):
@@ -45,3 +55,75 @@ class CfrTests(unittest.TestCase):
         cfr.train(60, weight_delay=15, checkpoint_iterations=15, checkpoint_callback=checkpoint_callback)
 
         self.assertEqual(checkpoints_count, 3)
+
+    def test_kuhn_cfr_reset(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        expected_strategy = Cfr(game, show_progress=False).train(30, weight_delay=10)
+
+        cfr = Cfr(game, show_progress=False)
+        cfr.train(20, weight_delay=5)
+        cfr.reset()
+        self.assertTrue(is_strategies_equal(cfr.train(30, weight_delay=10), expected_strategy))
+
+        game_tree = cfr.game_tree
+        reused_tree_cfr = Cfr(game, show_progress=False, game_tree=game_tree)
+        self.assertIs(reused_tree_cfr.game_tree, game_tree)
+        self.assertTrue(is_strategies_equal(reused_tree_cfr.train(30, weight_delay=10), expected_strategy))
+
+    def test_kuhn_cfr_checkpoint(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        cfr = Cfr(game, show_progress=False)
+        cfr.train(20, weight_delay=5)
+
+        if os.path.exists(CHECKPOINTS_DIRECTORY):
+            shutil.rmtree(CHECKPOINTS_DIRECTORY)
+        os.makedirs(CHECKPOINTS_DIRECTORY)
+        try:
+            checkpoint_file_path = '%s/kuhn.npz' % CHECKPOINTS_DIRECTORY
+            cfr.save_checkpoint(checkpoint_file_path)
+            restored_cfr = Cfr(game, show_progress=False, initial_strategy=checkpoint_file_path, initial_strategy_weight=1)
+        finally:
+            shutil.rmtree(CHECKPOINTS_DIRECTORY)
+
+        expected_strategy = cfr.train(10, weight_delay=2)
+        self.assertTrue(is_strategies_equal(restored_cfr.train(10, weight_delay=2), expected_strategy))
+
+    def test_kuhn_cfr_warm_start(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        equilibrium_strategy, _ = read_strategy_from_file(game, KUHN_EQUILIBRIUM_STRATEGY_PATH)
+
+        for initial_strategy in [equilibrium_strategy, KUHN_EQUILIBRIUM_STRATEGY_PATH]:
+            cfr = Cfr(game, show_progress=False, initial_strategy=initial_strategy)
+            # Strategy sums are not changed in the first iteration so the average strategy is the initial one
+            self.assertTrue(is_strategies_equal(cfr.train(1, weight_delay=0), equilibrium_strategy))
+
+    def test_kuhn_cfr_schedules_converge(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        exploitability = Exploitability(game)
+        for schedule in [LinearCfrSchedule(), DiscountedCfrSchedule(), PredictiveCfrPlusSchedule()]:
+            cfr = Cfr(game, show_progress=False)
+            self.assertLess(exploitability.evaluate(cfr.train(100, schedule=schedule)), 5)
+
+    def test_leduc_cfr_schedules_work(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        for schedule in [LinearCfrSchedule(), DiscountedCfrSchedule(), PredictiveCfrPlusSchedule()]:
+            cfr = Cfr(game, show_progress=False)
+            cfr.train(3, schedule=schedule)
+
+    def test_kuhn_cfr_zero_reach_pruning_is_exact(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        expected_strategy = Cfr(game, show_progress=False).train(50, schedule=PredictiveCfrPlusSchedule())
+
+        cfr = Cfr(game, show_progress=False)
+        cfr.train(50, schedule=PredictiveCfrPlusSchedule(), zero_reach_pruning=True)
+        self.assertTrue(is_strategies_equal(cfr.game_tree, expected_strategy))
+        self.assertGreater(cfr.num_zero_reach_pruned_visits, 0)
+        self.assertEqual(cfr.num_regret_pruned_visits, 0)
+
+    def test_kuhn_cfr_regret_pruning_converges(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        exploitability = Exploitability(game)
+        cfr = Cfr(game, show_progress=False)
+        cfr.train(200, weight_delay=50, zero_reach_pruning=True, regret_pruning=True)
+        self.assertGreater(cfr.num_regret_pruned_visits, 0)
+        self.assertLess(exploitability.evaluate(cfr.game_tree), 5)
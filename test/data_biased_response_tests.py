@@ -1,48 +1,83 @@
 import unittest
+import os
+import shutil
 import random
 
 import acpc_python_client as acpc
 
+from cfr.schedules import LinearCfrSchedule, PredictiveCfrPlusSchedule
 from tools.game_tree.builder import GameTreeBuilder
 from tools.sampling import SamplesTreeNodeProvider
 from tools.game_tree.nodes import ActionNode
 from tools.walk_trees import walk_trees
+from tools.game_utils import is_strategies_equal
 from response.data_biased_response import DataBiasedResponse
 
 
 KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
 LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
 
+CHECKPOINTS_DIRECTORY = 'test/dbr_checkpoints'
+
+
+def create_random_samples_tree(game):
+    samples_game_tree = GameTreeBuilder(
+        game, SamplesTreeNodeProvider()).build_tree()
+
+    # Create random strategy
+    def on_node(node):
+        if isinstance(node, ActionNode):
+            for a in node.children:
+                node.action_decision_counts[a] = random.randrange(15)
+    walk_trees(on_node, samples_game_tree)
+    return samples_game_tree
+
 
 class DataBiasedResponseTests(unittest.TestCase):
-    pass
-    # TODO make this work
-    # def test_kuhn_data_biased_response_works(self):
-    #     game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
-    #     samples_game_tree = GameTreeBuilder(
-    #         game, SamplesTreeNodeProvider()).build_tree()
-
-    #     # Create random strategy
-    #     def on_node(node):
-    #         if isinstance(node, ActionNode):
-    #             for a in node.children:
-    #                 node.action_decision_counts[a] = random.randrange(15)
-    #     walk_trees(on_node, samples_game_tree)
-
-    #     dbr = DataBiasedResponse(game, samples_game_tree, show_progress=False)
-    #     dbr.train(10, 5)
-
-    # def test_leduc_data_biased_response_works(self):
-    #     game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
-    #     samples_game_tree = GameTreeBuilder(
-    #         game, SamplesTreeNodeProvider()).build_tree()
-
-    #     # Create random strategy
-    #     def on_node(node):
-    #         if isinstance(node, ActionNode):
-    #             for a in node.children:
-    #                 node.action_decision_counts[a] = random.randrange(15)
-    #     walk_trees(on_node, samples_game_tree)
-
-    #     dbr = DataBiasedResponse(game, samples_game_tree, show_progress=False)
-    #     dbr.train(10, 5)
+    def test_kuhn_data_biased_response_works(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        samples_game_tree = create_random_samples_tree(game)
+
+        dbr = DataBiasedResponse(game, samples_game_tree, show_progress=False)
+        dbr.train(10, 5)
+
+    def test_leduc_data_biased_response_works(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        samples_game_tree = create_random_samples_tree(game)
+
+        dbr = DataBiasedResponse(game, samples_game_tree, show_progress=False)
+        dbr.train(10, 5)
+
+    def test_kuhn_data_biased_response_with_schedule_works(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        samples_game_tree = create_random_samples_tree(game)
+
+        for schedule in [LinearCfrSchedule(), PredictiveCfrPlusSchedule()]:
+            dbr = DataBiasedResponse(game, samples_game_tree, show_progress=False)
+            dbr.train(10, schedule=schedule)
+
+    def test_kuhn_data_biased_response_checkpoint(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        samples_game_tree = create_random_samples_tree(game)
+        dbr = DataBiasedResponse(game, samples_game_tree, show_progress=False)
+        dbr.train(20, 5)
+
+        if os.path.exists(CHECKPOINTS_DIRECTORY):
+            shutil.rmtree(CHECKPOINTS_DIRECTORY)
+        os.makedirs(CHECKPOINTS_DIRECTORY)
+        try:
+            checkpoint_file_path = '%s/kuhn.npz' % CHECKPOINTS_DIRECTORY
+            dbr.save_checkpoint(checkpoint_file_path)
+            restored_dbr = DataBiasedResponse(
+                game,
+                samples_game_tree,
+                show_progress=False,
+                initial_strategy=checkpoint_file_path,
+                initial_strategy_weight=1)
+        finally:
+            shutil.rmtree(CHECKPOINTS_DIRECTORY)
+
+        random.seed(0)
+        expected_strategy = dbr.train(10, weight_delay=2)
+        random.seed(0)
+        self.assertTrue(is_strategies_equal(restored_dbr.train(10, weight_delay=2), expected_strategy))
@@ -0,0 +1,34 @@
+import unittest
+
+import acpc_python_client as acpc
+
+from tools.deal_table import get_deal_table
+from tools.game_utils import get_num_hole_card_combinations
+
+KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+
+
+class DealTableTests(unittest.TestCase):
+    def test_kuhn_hole_cards_deals(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        deal_table = get_deal_table(game)
+        self.assertEqual(deal_table.hole_cards_deals.shape, (get_num_hole_card_combinations(game), 2))
+        hole_cards_combinations = [
+            deal_table.get_hole_cards(hole_cards_deal) for hole_cards_deal in deal_table.hole_cards_deals]
+        self.assertEqual(len(set(hole_cards_combinations)), get_num_hole_card_combinations(game))
+        for hole_cards_combination in hole_cards_combinations:
+            self.assertNotEqual(*hole_cards_combination)
+
+    def test_leduc_board_cards_deals(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        deal_table = get_deal_table(game)
+        board_cards_indexes, round_board_cards, probability = deal_table.get_board_cards_deals([42, 46], [])
+        board_cards = [round_board_cards[i] for i in board_cards_indexes]
+        self.assertEqual(board_cards, [(43,), (47,), (50,), (51,)])
+        self.assertEqual(probability, 1 / 4)
+
+    def test_deal_table_is_shared(self):
+        self.assertIs(
+            get_deal_table(acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)),
+            get_deal_table(acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)))
@@ -0,0 +1,71 @@
+import unittest
+import shutil
+import threading
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.dealer import play_match, play_matches
+from tools.strategy_agent import StrategyAgent
+from tools.match_evaluation import get_player_final_utilities_from_log_file, get_player_utilities_from_log_file
+
+KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
+KUHN_EQUILIBRIUM_STRATEGY_PATH = 'strategies/kuhn.limit.2p-equilibrium.strategy'
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+LEDUC_EQUILIBRIUM_STRATEGY_PATH = 'strategies/leduc.limit.2p-equilibrium.strategy'
+
+LOGS_DIRECTORY = 'test/dealer_logs'
+
+
+class DealerTests(unittest.TestCase):
+    def tearDown(self):
+        shutil.rmtree(LOGS_DIRECTORY, ignore_errors=True)
+
+    def create_agent_starter(self, game_file_path, strategy_file_path, threads):
+        def on_port(player_index, port):
+            client = acpc.Client(game_file_path, 'localhost', str(port))
+            thread = threading.Thread(target=client.play, args=(StrategyAgent(strategy_file_path),), daemon=True)
+            thread.start()
+            threads.append(thread)
+        return on_port
+
+    def check_match_log(self, match_name, scores, player_names, num_hands):
+        log_scores, log_player_names = get_player_final_utilities_from_log_file(match_name + '.log')
+        utilities, utilities_player_names = get_player_utilities_from_log_file(match_name + '.log')
+        self.assertEqual(log_player_names, player_names)
+        self.assertEqual(utilities_player_names, player_names)
+        self.assertEqual(log_scores, [float(score) for score in scores])
+        self.assertEqual(utilities.shape, (num_hands, 2, 1))
+        self.assertTrue(np.all(np.sum(utilities, axis=1) == 0))
+        self.assertTrue(np.all(np.sum(utilities, axis=0)[:, 0] == log_scores))
+
+    def test_kuhn_match(self):
+        threads = []
+        match_name = '%s/kuhn' % LOGS_DIRECTORY
+        scores, player_names = play_match(
+            match_name,
+            KUHN_POKER_GAME_FILE_PATH,
+            100,
+            1,
+            [('Equilibrium_1', None), ('Equilibrium_2', None)],
+            timeout=60,
+            on_port=self.create_agent_starter(KUHN_POKER_GAME_FILE_PATH, KUHN_EQUILIBRIUM_STRATEGY_PATH, threads))
+        for thread in threads:
+            thread.join()
+        self.assertEqual(player_names, ['Equilibrium_1', 'Equilibrium_2'])
+        self.check_match_log(match_name, scores, player_names, 100)
+
+    def test_leduc_concurrent_matches(self):
+        threads = []
+        match_names = ['%s/leduc_%s' % (LOGS_DIRECTORY, i) for i in range(4)]
+        results = play_matches(
+            [
+                (match_name, LEDUC_POKER_GAME_FILE_PATH, 100, i, [('Equilibrium_1', None), ('Equilibrium_2', None)])
+                for i, match_name in enumerate(match_names)
+            ],
+            timeout=60,
+            on_port=self.create_agent_starter(LEDUC_POKER_GAME_FILE_PATH, LEDUC_EQUILIBRIUM_STRATEGY_PATH, threads))
+        for thread in threads:
+            thread.join()
+        for match_name, (scores, player_names) in zip(match_names, results):
+            self.check_match_log(match_name, scores, player_names, 100)
@@ -1,4 +1,8 @@
 import unittest
+import os
+import shutil
+import time
+import numpy as np
 
 import acpc_python_client as acpc
 
@@ -6,11 +10,42 @@ from tools.game_tree.builder import GameTreeBuilder
 from tools.game_tree.node_provider import StrategyTreeNodeProvider
 from tools.game_tree.nodes import ActionNode
 from tools.walk_trees import walk_trees
-from implicit_modelling.build_portfolio import train_portfolio_responses, optimize_portfolio
+from tools.game_utils import is_strategies_equal
+from tools.io_util import write_strategy_to_file
+from implicit_modelling.build_portfolio import train_portfolio_responses, optimize_portfolio, _select_portfolio_greedy
+from implicit_modelling.response_cache import ResponseCache
+from implicit_modelling.implicit_modelling_agent import ImplicitModellingAgent
+from tools.match_state import MatchState, get_cards_by_str
+from utility_estimation.simple import SimpleUtilityEstimator
 
 
 KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
 
+RESPONSES_CACHE_DIRECTORY = 'test/responses_cache'
+PORTFOLIO_DIRECTORY = 'test/implicit_agent_portfolio'
+
+FINISHED_HANDS = [
+    'MATCHSTATE:0:0:cc:Ks|Qs',
+    'MATCHSTATE:1:1:rc:As|Ks',
+    'MATCHSTATE:0:2:crc:Qs|As',
+    'MATCHSTATE:1:3:rc:Ks|Qs',
+    'MATCHSTATE:0:4:crc:As|Qs',
+    'MATCHSTATE:1:5:cc:Qs|Ks',
+]
+
+
+class SlowUtilityEstimator(SimpleUtilityEstimator):
+    def __init__(self, game, mucking_enabled, delay=0, fail=False):
+        super().__init__(game, mucking_enabled)
+        self.delay = delay
+        self.fail = fail
+
+    def get_utility_estimations(self, state, player, sampling_strategy, evaluated_strategies=None):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError('Estimation failed')
+        return super().get_utility_estimations(state, player, sampling_strategy, evaluated_strategies)
+
 
 class ImplicitAgentTests(unittest.TestCase):
     def create_strategy(self, game, node_strategy_creator_callback):
@@ -54,3 +89,222 @@ class ImplicitAgentTests(unittest.TestCase):
             opponent_responses)
         self.assertGreaterEqual(len(portfolio_strategies), 1)
         self.assertEqual(len(portfolio_strategies), len(opponent_indices))
+
+    def test_responses_cache(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+
+        def on_node_always_call(node):
+            if isinstance(node, ActionNode):
+                node.strategy[1] = 1
+
+        def on_node_always_raise(node):
+            if isinstance(node, ActionNode):
+                if 2 in node.children:
+                    node.strategy[2] = 1
+                else:
+                    node.strategy[1] = 1
+
+        def get_num_cached_responses():
+            return sum(len(files) for _, _, files in os.walk(RESPONSES_CACHE_DIRECTORY))
+
+        if os.path.exists(RESPONSES_CACHE_DIRECTORY):
+            shutil.rmtree(RESPONSES_CACHE_DIRECTORY)
+        try:
+            opponents = [self.create_strategy(game, on_node_always_call)] * 2
+            rnr_params = [(100, 800, 10, 2, 2)] * 2
+
+            responses = train_portfolio_responses(
+                KUHN_POKER_GAME_FILE_PATH, opponents, rnr_params,
+                seed=0, responses_cache_directory=RESPONSES_CACHE_DIRECTORY)
+            # Responses to the same opponent differ in seed
+            self.assertEqual(get_num_cached_responses(), 2)
+
+            # Only response to the changed opponent is trained
+            opponents[1] = self.create_strategy(game, on_node_always_raise)
+            callback_responses = {}
+            cached_responses = train_portfolio_responses(
+                KUHN_POKER_GAME_FILE_PATH, opponents, rnr_params,
+                callback=lambda i, response: callback_responses.update({i: response}),
+                seed=0, responses_cache_directory=RESPONSES_CACHE_DIRECTORY)
+            self.assertEqual(get_num_cached_responses(), 3)
+            self.assertTrue(is_strategies_equal(cached_responses[0], responses[0]))
+            self.assertEqual(sorted(callback_responses.keys()), [0, 1])
+            self.assertIs(callback_responses[1], cached_responses[1])
+
+            # Omitted parameters are equal to their defaults
+            responses_cache = ResponseCache(RESPONSES_CACHE_DIRECTORY)
+            self.assertEqual(
+                responses_cache.get_response_key(KUHN_POKER_GAME_FILE_PATH, opponents[0], (100, 800), 0),
+                responses_cache.get_response_key(KUHN_POKER_GAME_FILE_PATH, opponents[0], (100, 800, 1500, 10, None), 0))
+            self.assertNotEqual(
+                responses_cache.get_response_key(KUHN_POKER_GAME_FILE_PATH, opponents[0], (100, 800), 0),
+                responses_cache.get_response_key(KUHN_POKER_GAME_FILE_PATH, opponents[1], (100, 800), 0))
+        finally:
+            shutil.rmtree(RESPONSES_CACHE_DIRECTORY)
+
+    def test_train_responses_in_workers(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+
+        def on_node_always_call(node):
+            if isinstance(node, ActionNode):
+                node.strategy[1] = 1
+
+        if os.path.exists(RESPONSES_CACHE_DIRECTORY):
+            shutil.rmtree(RESPONSES_CACHE_DIRECTORY)
+        try:
+            opponent = self.create_strategy(game, on_node_always_call)
+            opponent_strategy_path = '%s/opponent.strategy' % RESPONSES_CACHE_DIRECTORY
+            write_strategy_to_file(opponent, opponent_strategy_path)
+
+            responses_cache = ResponseCache(RESPONSES_CACHE_DIRECTORY)
+            self.assertEqual(
+                responses_cache.get_response_key(KUHN_POKER_GAME_FILE_PATH, opponent, (100, 800), 0),
+                responses_cache.get_response_key(KUHN_POKER_GAME_FILE_PATH, opponent_strategy_path, (100, 800), 0))
+
+            trained_indices = []
+            responses = train_portfolio_responses(
+                KUHN_POKER_GAME_FILE_PATH,
+                [opponent, opponent_strategy_path, opponent],
+                [(100, 800, 10, 2, 2)] * 3,
+                callback=lambda i, response: trained_indices.append(i),
+                parallel=True,
+                num_workers=2)
+            self.assertEqual(sorted(trained_indices), [0, 1, 2])
+            for response in responses:
+                self.assertIsNotNone(response)
+        finally:
+            shutil.rmtree(RESPONSES_CACHE_DIRECTORY)
+
+    def test_lazy_greedy_portfolio_selection(self):
+        utilities = np.random.RandomState(0).normal(size=[40, 40])
+
+        # Naive greedy selection evaluates all remaining responses in each step
+        max_utilities = np.full(40, -np.inf)
+        expected_response_added = []
+        for _ in range(40):
+            available_responses = [j for j in range(40) if j not in expected_response_added]
+            portfolio_utilities = [np.mean(np.maximum(max_utilities, utilities[j])) for j in available_responses]
+            response_to_add = available_responses[int(np.argmax(portfolio_utilities))]
+            expected_response_added += [response_to_add]
+            max_utilities = np.maximum(max_utilities, utilities[response_to_add])
+
+        response_added, portfolio_utilities = _select_portfolio_greedy(utilities)
+        self.assertEqual(response_added.tolist(), expected_response_added)
+        self.assertAlmostEqual(portfolio_utilities[-1], np.mean(np.max(utilities, axis=0)))
+        self.assertTrue(np.all(np.diff(portfolio_utilities) >= 0))
+
+    def create_portfolio_files(self, game):
+        def on_node_always_call(node):
+            if isinstance(node, ActionNode):
+                node.strategy[1] = 1
+
+        def on_node_always_raise(node):
+            if isinstance(node, ActionNode):
+                if 2 in node.children:
+                    node.strategy[2] = 1
+                else:
+                    node.strategy[1] = 1
+
+        portfolio_strategy_files_paths = []
+        for i, callback in enumerate([on_node_always_call, on_node_always_raise]):
+            strategy_file_path = '%s/portfolio-%s.strategy' % (PORTFOLIO_DIRECTORY, i)
+            write_strategy_to_file(self.create_strategy(game, callback), strategy_file_path)
+            portfolio_strategy_files_paths += [strategy_file_path]
+        return portfolio_strategy_files_paths
+
+    def play_finished_hands(self, agent, game):
+        cards_by_str = get_cards_by_str(game)
+        for match_state_string in FINISHED_HANDS:
+            agent.on_game_start(game)
+            agent.on_game_finished(game, MatchState.parse(game, match_state_string, cards_by_str))
+
+    def test_background_estimation(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        if os.path.exists(PORTFOLIO_DIRECTORY):
+            shutil.rmtree(PORTFOLIO_DIRECTORY)
+        try:
+            portfolio_strategy_files_paths = self.create_portfolio_files(game)
+
+            synchronous_agent = ImplicitModellingAgent(KUHN_POKER_GAME_FILE_PATH, portfolio_strategy_files_paths)
+            self.play_finished_hands(synchronous_agent, game)
+            self.assertIsNone(synchronous_agent.get_estimation_metrics())
+            expected_probabilities = synchronous_agent.bandit_algorithm.get_current_expert_probabilities()
+
+            for use_process in [False, True]:
+                # Estimates are applied before the next hand starts when no staleness is allowed
+                agent = ImplicitModellingAgent(
+                    KUHN_POKER_GAME_FILE_PATH,
+                    portfolio_strategy_files_paths,
+                    background_estimation=True,
+                    background_estimation_process=use_process,
+                    max_staleness=0)
+                try:
+                    self.play_finished_hands(agent, game)
+                    self.assertTrue(np.allclose(
+                        agent.bandit_algorithm.get_current_expert_probabilities(), expected_probabilities))
+
+                    metrics = agent.get_estimation_metrics()
+                    self.assertEqual(metrics['num_submitted'], len(FINISHED_HANDS))
+                    self.assertEqual(metrics['num_pending'], 0)
+                    self.assertEqual(metrics['queue_depth_max'], 1)
+                    self.assertGreater(metrics['estimation_latency_max'], 0)
+                finally:
+                    agent.close()
+                self.assertIsNone(agent.get_estimation_metrics())
+        finally:
+            shutil.rmtree(PORTFOLIO_DIRECTORY)
+
+    def test_background_estimation_max_staleness(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        cards_by_str = get_cards_by_str(game)
+        if os.path.exists(PORTFOLIO_DIRECTORY):
+            shutil.rmtree(PORTFOLIO_DIRECTORY)
+        try:
+            portfolio_strategy_files_paths = self.create_portfolio_files(game)
+            max_staleness = 2
+            agent = ImplicitModellingAgent(
+                KUHN_POKER_GAME_FILE_PATH,
+                portfolio_strategy_files_paths,
+                utility_estimator_class=SlowUtilityEstimator,
+                utility_estimator_args={'delay': 0.05},
+                background_estimation=True,
+                max_staleness=max_staleness)
+            try:
+                for match_state_string in FINISHED_HANDS:
+                    agent.on_game_start(game)
+                    agent.on_game_finished(game, MatchState.parse(game, match_state_string, cards_by_str))
+                    # Agent waits for the worker instead of falling further behind
+                    self.assertLessEqual(agent.get_estimation_metrics()['num_pending'], max_staleness)
+                metrics = agent.get_estimation_metrics()
+                self.assertEqual(metrics['queue_depth_max'], max_staleness + 1)
+                self.assertGreaterEqual(metrics['estimation_latency_mean'], 0.05)
+            finally:
+                agent.close()
+        finally:
+            shutil.rmtree(PORTFOLIO_DIRECTORY)
+
+    def test_background_estimation_failure(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        if os.path.exists(PORTFOLIO_DIRECTORY):
+            shutil.rmtree(PORTFOLIO_DIRECTORY)
+        try:
+            portfolio_strategy_files_paths = self.create_portfolio_files(game)
+            for use_process in [False, True]:
+                agent = ImplicitModellingAgent(
+                    KUHN_POKER_GAME_FILE_PATH,
+                    portfolio_strategy_files_paths,
+                    utility_estimator_class=SlowUtilityEstimator,
+                    utility_estimator_args={'fail': True},
+                    background_estimation=True,
+                    background_estimation_process=use_process,
+                    max_staleness=0)
+                try:
+                    # Error of the worker is raised in the agent instead of blocking it forever
+                    with self.assertRaisesRegex(RuntimeError, 'Estimation failed'):
+                        self.play_finished_hands(agent, game)
+                    with self.assertRaisesRegex(RuntimeError, 'worker stopped'):
+                        self.play_finished_hands(agent, game)
+                finally:
+                    agent.close()
+        finally:
+            shutil.rmtree(PORTFOLIO_DIRECTORY)
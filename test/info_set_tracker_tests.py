@@ -0,0 +1,65 @@
+import unittest
+
+import acpc_python_client as acpc
+
+from tools.agent_utils import get_info_set
+from tools.info_set_tracker import InfoSetTracker, get_hand_decisions
+from tools.match_state import MatchState, get_cards_by_str
+from tools.strategy_store import load_strategy
+from tools.card_abstraction import create_card_abstraction
+
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+LEDUC_EQUILIBRIUM_STRATEGY_PATH = 'strategies/leduc.limit.2p-equilibrium.strategy'
+
+
+class InfoSetTrackerTests(unittest.TestCase):
+    def test_incremental_updates_match_full_info_set(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        cards_by_str = get_cards_by_str(game)
+        strategy = load_strategy(LEDUC_EQUILIBRIUM_STRATEGY_PATH)
+        tracker = InfoSetTracker(strategy.info_set_ids)
+
+        match_states = [
+            'MATCHSTATE:1:0::|Ks',
+            'MATCHSTATE:1:0:r:|Ks',
+            'MATCHSTATE:1:0:rc/:|Ks/Ah',
+            'MATCHSTATE:1:0:rc/rr:|Ks/Ah',
+        ]
+        for match_state_string in match_states:
+            match_state = MatchState.parse(game, match_state_string, cards_by_str)
+            info_set = tracker.update(game, match_state)
+            self.assertEqual(info_set, get_info_set(game, match_state))
+            self.assertEqual(tracker.get_info_set_id(), strategy.info_set_ids[info_set])
+        self.assertEqual(tracker.get_info_set(), '%s:rc:%s:rr' % (cards_by_str['Ks'], cards_by_str['Ah']))
+
+        tracker.reset()
+        match_state = MatchState.parse(game, 'MATCHSTATE:0:1:rc/:Qs|/Kh', cards_by_str)
+        self.assertEqual(tracker.update(game, match_state), get_info_set(game, match_state))
+
+    def test_abstract_info_sets(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        cards_by_str = get_cards_by_str(game)
+        card_abstraction = create_card_abstraction(game, [2, 3], seed=0)
+        tracker = InfoSetTracker(card_abstraction=card_abstraction)
+
+        for match_state_string in ['MATCHSTATE:1:0::|Ks', 'MATCHSTATE:1:0:rc/:|Ks/Ah', 'MATCHSTATE:1:0:rc/rr:|Ks/Ah']:
+            match_state = MatchState.parse(game, match_state_string, cards_by_str)
+            info_set = tracker.update(game, match_state)
+            self.assertEqual(info_set, get_info_set(game, match_state, card_abstraction))
+            self.assertEqual(info_set, card_abstraction.get_abstract_info_set(get_info_set(game, match_state)))
+        self.assertTrue(tracker.get_info_set().startswith('b'))
+
+    def test_get_hand_decisions(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        cards_by_str = get_cards_by_str(game)
+        queen = cards_by_str['Qs']
+        king = cards_by_str['Ks']
+        ace = cards_by_str['Ah']
+        state = MatchState.parse(game, 'MATCHSTATE:0:0:rc/cr:Qs|Ks/Ah', cards_by_str).get_state()
+
+        self.assertEqual(get_hand_decisions(game, state), [
+            (0, '%s:' % queen, 2),
+            (1, '%s:r' % king, 1),
+            (0, '%s:rc:%s:' % (queen, ace), 1),
+            (1, '%s:rc:%s:c' % (king, ace), 2),
+        ])
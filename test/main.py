@@ -12,6 +12,19 @@ from test.weak_agents_tests import WeakAgentsTests
 from test.restricted_nash_response_tests import RnrTests
 from test.implicit_agent_tests import ImplicitAgentTests
 from test.match_evaluation_tests import MatchEvaluationTests
+from test.match_simulator_tests import MatchSimulatorTests
+from test.dealer_tests import DealerTests
+from test.match_results_cache_tests import MatchResultsCacheTests
+from test.strategy_store_tests import StrategyStoreTests
+from test.agent_server_tests import AgentServerTests
+from test.agent_host_tests import AgentHostTests
+from test.info_set_tracker_tests import InfoSetTrackerTests
+from test.action_sampler_tests import ActionSamplerTests
+from test.utility_matrix_tests import UtilityMatrixTests
+from test.startup_time_tests import StartupTimeTests
+from test.suit_isomorphism_tests import SuitIsomorphismTests
+from test.card_abstraction_tests import CardAbstractionTests
+from test.deal_table_tests import DealTableTests
 
 test_classes = [
     HandEvaluationTests,
@@ -25,6 +38,19 @@ test_classes = [
     RnrTests,
     ImplicitAgentTests,
     MatchEvaluationTests,
+    MatchSimulatorTests,
+    DealerTests,
+    MatchResultsCacheTests,
+    StrategyStoreTests,
+    AgentServerTests,
+    AgentHostTests,
+    InfoSetTrackerTests,
+    ActionSamplerTests,
+    UtilityMatrixTests,
+    StartupTimeTests,
+    SuitIsomorphismTests,
+    CardAbstractionTests,
+    DealTableTests,
 ]
 
 
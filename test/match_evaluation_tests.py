@@ -2,7 +2,14 @@ import unittest
 import numpy as np
 from scipy.stats import norm
 
-from tools.match_evaluation import get_player_final_utilities_from_log_file, get_player_utilities_from_log_file, get_logs_data, calculate_confidence_interval
+import acpc_python_client as acpc
+
+from tools.match_evaluation import get_player_final_utilities_from_log_file, get_player_utilities_from_log_file, get_logs_data, calculate_confidence_interval, UtilityAccumulator
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.node_provider import StrategyTreeNodeProvider
+from tools.game_tree.nodes import ActionNode
+from tools.walk_trees import walk_trees
+from utility_estimation.simple import SimpleUtilityEstimator
 
 
 class MatchEvaluationTests(unittest.TestCase):
@@ -34,3 +41,81 @@ class MatchEvaluationTests(unittest.TestCase):
         self.assertEqual(interval_half_size.tolist(), [interval_size] * 2)
         self.assertEqual(lower_bounds.tolist(), [mean - interval_size for mean in means])
         self.assertEqual(upper_bounds.tolist(), [mean + interval_size for mean in means])
+
+    def check_accumulator(self, accumulator, data, player_names):
+        means, interval_half_size, lower_bounds, upper_bounds = calculate_confidence_interval(data, 0.95)
+        accumulator_means, accumulator_interval_half_size, accumulator_lower_bounds, accumulator_upper_bounds = \
+            accumulator.get_confidence_interval(0.95)
+        self.assertEqual(accumulator.player_names, player_names)
+        self.assertEqual(accumulator.count, data.shape[0])
+        self.assertTrue(np.allclose(accumulator_means, means))
+        self.assertTrue(np.allclose(accumulator_interval_half_size, interval_half_size))
+        self.assertTrue(np.allclose(accumulator_lower_bounds, lower_bounds))
+        self.assertTrue(np.allclose(accumulator_upper_bounds, upper_bounds))
+
+    def test_utility_accumulator_logs(self):
+        log_files_paths = [
+            'test/match_evaluation/sample_log_1.log',
+            'test/match_evaluation/sample_log_2.log',
+        ]
+        log_readings = [get_player_utilities_from_log_file(log_file_path) for log_file_path in log_files_paths]
+        data, player_names = get_logs_data(*log_readings)
+
+        accumulator = UtilityAccumulator()
+        for log_reading in log_readings:
+            accumulator.add_log_reading(log_reading)
+        self.check_accumulator(accumulator, data, player_names)
+
+    def test_utility_accumulator_hands(self):
+        log_reading = get_player_utilities_from_log_file('test/sample_log-large.log')
+        data, player_names = get_logs_data(log_reading)
+
+        accumulator = UtilityAccumulator()
+        utilities, log_player_names = log_reading
+        for hand_utilities in utilities[:1000]:
+            accumulator.add_hand(hand_utilities, log_player_names)
+        self.check_accumulator(accumulator, data[:1000], player_names)
+
+    def test_utility_accumulator_merge(self):
+        utilities, log_player_names = get_player_utilities_from_log_file('test/sample_log-large.log')
+        data, player_names = get_logs_data((utilities, log_player_names))
+
+        accumulators = []
+        for start, end in [(0, 10), (10, 20000), (20000, 20001), (20001, 50000)]:
+            accumulator = UtilityAccumulator()
+            accumulator.add_log_reading((utilities[start:end], log_player_names))
+            accumulators += [accumulator]
+        merged_accumulator = UtilityAccumulator()
+        for accumulator in accumulators:
+            merged_accumulator.merge(accumulator)
+        self.check_accumulator(merged_accumulator, data, player_names)
+
+        reversed_accumulator = UtilityAccumulator()
+        reversed_accumulator.add_log_reading((utilities[:, ::-1], log_player_names[::-1]))
+        self.check_accumulator(reversed_accumulator, data, player_names)
+
+    def test_log_reading_with_utility_estimator(self):
+        log_file_path = 'test/sample_log-large.log'
+        game_file_path = 'games/leduc.limit.2p.game'
+        game = acpc.read_game_file(game_file_path)
+        strategy = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+
+        def on_node(node):
+            if isinstance(node, ActionNode):
+                for action in node.children:
+                    node.strategy[action] = 1 / len(node.children)
+        walk_trees(on_node, strategy)
+
+        utilities, player_names = get_player_utilities_from_log_file(log_file_path)
+        estimates_cache = {}
+        estimated_utilities, estimated_player_names = get_player_utilities_from_log_file(
+            log_file_path,
+            game_file_path=game_file_path,
+            utility_estimator=SimpleUtilityEstimator(game, False),
+            player_strategies={'Random_1': strategy},
+            estimates_cache=estimates_cache)
+
+        # Simple estimator evaluating the sampling strategy returns the outcome of the hand
+        self.assertEqual(estimated_player_names, player_names)
+        self.assertTrue(np.allclose(estimated_utilities, utilities))
+        self.assertLess(len(estimates_cache), utilities.shape[0])
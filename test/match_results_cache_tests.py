@@ -0,0 +1,82 @@
+import unittest
+import os
+import shutil
+
+from tools.match_results_cache import get_agent_fingerprint, MatchResultsCache, is_complete_log_file
+
+KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
+KUHN_EQUILIBRIUM_AGENT_SCRIPT_PATH = 'strategies/kuhn.limit.2p-equilibrium-agent.sh'
+KUHN_EQUILIBRIUM_STRATEGY_PATH = 'strategies/kuhn.limit.2p-equilibrium.strategy'
+LOG_FILE_PATH = 'test/sample_log.log'
+
+CACHE_DIRECTORY = 'test/match_results_cache'
+AGENT_DIRECTORY = 'test/match_results_cache_agent'
+
+
+class MatchResultsCacheTests(unittest.TestCase):
+    def setUp(self):
+        for directory in [CACHE_DIRECTORY, AGENT_DIRECTORY]:
+            if os.path.exists(directory):
+                shutil.rmtree(directory)
+
+    def tearDown(self):
+        self.setUp()
+
+    def test_agent_fingerprint_covers_referenced_files(self):
+        os.makedirs(AGENT_DIRECTORY)
+        agent_script_path = '%s/agent.sh' % AGENT_DIRECTORY
+        strategy_path = '%s/agent.strategy' % AGENT_DIRECTORY
+        shutil.copyfile(KUHN_EQUILIBRIUM_AGENT_SCRIPT_PATH, agent_script_path)
+        shutil.copyfile(KUHN_EQUILIBRIUM_STRATEGY_PATH, strategy_path)
+        with open(agent_script_path, 'a') as file:
+            file.write('# "${SCRIPT_DIR}/agent.strategy"\n')
+
+        fingerprint = get_agent_fingerprint(agent_script_path)
+        self.assertEqual(get_agent_fingerprint(agent_script_path), fingerprint)
+        self.assertNotEqual(get_agent_fingerprint(agent_script_path, [KUHN_EQUILIBRIUM_STRATEGY_PATH]), fingerprint)
+
+        with open(strategy_path, 'a') as file:
+            file.write('# changed\n')
+        self.assertNotEqual(get_agent_fingerprint(agent_script_path), fingerprint)
+
+    def test_match_keys(self):
+        cache = MatchResultsCache(CACHE_DIRECTORY)
+        players = [('Equilibrium_1', 'a'), ('Equilibrium_2', 'b')]
+        key = cache.get_match_key(KUHN_POKER_GAME_FILE_PATH, 3000, 1, players, 'acpc')
+        self.assertEqual(cache.get_match_key(KUHN_POKER_GAME_FILE_PATH, 3000, 1, players, 'acpc'), key)
+        other_keys = [
+            cache.get_match_key(KUHN_POKER_GAME_FILE_PATH, 3000, 2, players, 'acpc'),
+            cache.get_match_key(KUHN_POKER_GAME_FILE_PATH, 1000, 1, players, 'acpc'),
+            cache.get_match_key(KUHN_POKER_GAME_FILE_PATH, 3000, 1, players[::-1], 'acpc'),
+            cache.get_match_key(KUHN_POKER_GAME_FILE_PATH, 3000, 1, players, 'python'),
+            cache.get_match_key('games/leduc.limit.2p.game', 3000, 1, players, 'acpc'),
+        ]
+        self.assertEqual(len(set(other_keys + [key])), len(other_keys) + 1)
+
+    def test_log_storing(self):
+        cache = MatchResultsCache(CACHE_DIRECTORY)
+        key = cache.get_match_key(KUHN_POKER_GAME_FILE_PATH, 3000, 1, [('a', 'a'), ('b', 'b')], 'acpc')
+        self.assertIsNone(cache.get_log_file_path(key))
+
+        cache.add_log_file(key, LOG_FILE_PATH)
+        cached_log_file_path = MatchResultsCache(CACHE_DIRECTORY).get_log_file_path(key)
+        self.assertIsNotNone(cached_log_file_path)
+        with open(cached_log_file_path, 'r') as cached_log_file, open(LOG_FILE_PATH, 'r') as log_file:
+            self.assertEqual(cached_log_file.read(), log_file.read())
+
+    def test_complete_log_file(self):
+        os.makedirs(CACHE_DIRECTORY)
+        with open(LOG_FILE_PATH, 'r') as log_file:
+            log_lines = ['%s\n' % line.strip() for line in log_file if line.startswith('STATE')]
+        complete_log_file_path = '%s/complete.log' % CACHE_DIRECTORY
+        with open(complete_log_file_path, 'w') as file:
+            file.writelines(log_lines)
+            file.write('SCORE:-1|1:a|b\n')
+        truncated_log_file_path = '%s/truncated.log' % CACHE_DIRECTORY
+        with open(truncated_log_file_path, 'w') as file:
+            file.writelines(log_lines[:-1])
+
+        self.assertTrue(is_complete_log_file(complete_log_file_path, len(log_lines)))
+        self.assertFalse(is_complete_log_file(complete_log_file_path, len(log_lines) + 1))
+        self.assertFalse(is_complete_log_file(truncated_log_file_path, len(log_lines) - 1))
+        self.assertFalse(is_complete_log_file('%s/missing.log' % CACHE_DIRECTORY, len(log_lines)))
@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+
+import acpc_python_client as acpc
+
+from evaluation.match_simulator import MatchSimulator
+from evaluation.player_utility import PlayerUtility
+from tools.io_util import read_strategy_from_file
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.node_provider import StrategyTreeNodeProvider
+from tools.game_tree.nodes import ActionNode
+from tools.walk_trees import walk_trees
+
+KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+
+
+class MatchSimulatorTests(unittest.TestCase):
+    def create_uniform_strategy(self, game):
+        strategy = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+
+        def on_node(node):
+            if isinstance(node, ActionNode):
+                action_probability = 1 / len(node.children)
+                for a in node.children:
+                    node.strategy[a] = action_probability
+        walk_trees(on_node, strategy)
+        return strategy
+
+    def evaluate_against_exact_value(self, game_file_path, strategy_file_path):
+        game = acpc.read_game_file(game_file_path)
+        equilibrium_strategy, equilibrium_strategy_dict = read_strategy_from_file(game_file_path, strategy_file_path)
+        uniform_strategy = self.create_uniform_strategy(game)
+
+        player_utilities, positions = PlayerUtility(game).evaluate(equilibrium_strategy, uniform_strategy)
+        expected_utility = np.mean([player_utilities[i, positions[i].tolist().index(0)] for i in range(2)])
+
+        utilities = MatchSimulator(game).simulate(
+            [equilibrium_strategy_dict, uniform_strategy], 200000, seed=1)
+        self.assertEqual(utilities.shape, (400000, 2, 1))
+        self.assertTrue(np.all(np.sum(utilities, axis=1) == 0))
+        self.assertAlmostEqual(np.mean(utilities[:, 0, 0]), expected_utility, delta=0.02)
+
+    def test_kuhn_simulation_value(self):
+        self.evaluate_against_exact_value(
+            KUHN_POKER_GAME_FILE_PATH,
+            'strategies/kuhn.limit.2p-equilibrium.strategy')
+
+    def test_leduc_simulation_value(self):
+        self.evaluate_against_exact_value(
+            LEDUC_POKER_GAME_FILE_PATH,
+            'strategies/leduc.limit.2p-equilibrium.strategy')
+
+    def test_simulation_is_reproducible(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        uniform_strategy = self.create_uniform_strategy(game)
+        simulator = MatchSimulator(game)
+        strategy_table = simulator.get_strategy_table(uniform_strategy)
+
+        first_utilities = simulator.simulate([strategy_table, uniform_strategy], 5000, seed=7, batch_size=1000)
+        second_utilities = simulator.simulate([uniform_strategy, strategy_table], 5000, seed=7, batch_size=1000)
+        self.assertTrue(np.array_equal(first_utilities, second_utilities))
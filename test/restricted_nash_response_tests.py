@@ -1,12 +1,15 @@
 import unittest
+import random
 
 import acpc_python_client as acpc
 
 from response.restricted_nash_response import RestrictedNashResponse
+from cfr.schedules import PredictiveCfrPlusSchedule
 from tools.game_tree.builder import GameTreeBuilder
 from tools.game_tree.node_provider import StrategyTreeNodeProvider
 from tools.game_tree.nodes import ActionNode
 from tools.walk_trees import walk_trees
+from tools.game_utils import is_strategies_equal, copy_strategy
 
 KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
 KUHN_BIG_DECK_POKER_GAME_FILE_PATH = 'games/kuhn.bigdeck.limit.2p.game'
@@ -78,3 +81,43 @@ class RnrTests(unittest.TestCase):
         rnr = RestrictedNashResponse(
             game, opponent_strategy, 0.5, show_progress=False)
         rnr.train(10, 5)
+
+    def test_kuhn_rnr_reuses_game_tree(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+
+        opponent_strategy = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+        def on_node(node):
+            if isinstance(node, ActionNode):
+                action_count = len(node.children)
+                action_probability = 1 / action_count
+                for a in node.children:
+                    node.strategy[a] = action_probability
+        walk_trees(on_node, opponent_strategy)
+
+        random.seed(0)
+        rnr = RestrictedNashResponse(
+            game, opponent_strategy, 0.5, show_progress=False)
+        expected_strategy = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+        copy_strategy(expected_strategy, rnr.train(20, 5))
+
+        random.seed(0)
+        reused_tree_rnr = RestrictedNashResponse(
+            game, opponent_strategy, 0.5, show_progress=False, game_tree=rnr.game_tree)
+        self.assertIs(reused_tree_rnr.game_tree, rnr.game_tree)
+        self.assertTrue(is_strategies_equal(reused_tree_rnr.train(20, 5), expected_strategy))
+
+    def test_kuhn_rnr_with_schedule_works(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+
+        opponent_strategy = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+        def on_node(node):
+            if isinstance(node, ActionNode):
+                action_count = len(node.children)
+                action_probability = 1 / action_count
+                for a in node.children:
+                    node.strategy[a] = action_probability
+        walk_trees(on_node, opponent_strategy)
+
+        rnr = RestrictedNashResponse(
+            game, opponent_strategy, 0.5, show_progress=False)
+        rnr.train(10, schedule=PredictiveCfrPlusSchedule())
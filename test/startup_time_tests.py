@@ -0,0 +1,56 @@
+import unittest
+import sys
+import subprocess
+
+AGENT_ENTRY_POINTS = [
+    'tools.strategy_agent',
+    'implicit_modelling.implicit_modelling_agent',
+]
+
+# Modules used only for training, evaluation or plotting
+HEAVY_MODULES = [
+    'scipy',
+    'matplotlib',
+    'tqdm',
+    'cfr.main',
+    'evaluation.player_utility',
+    'utility_estimation.aivat',
+]
+
+# Maximal time of cold import of an agent entry point in seconds
+IMPORT_TIME_BUDGET = 1.0
+NUM_IMPORT_TIME_MEASUREMENTS = 3
+
+
+def _get_imported_modules(module_name):
+    output = subprocess.run(
+        [sys.executable, '-c', 'import sys, %s; print(" ".join(sys.modules))' % module_name],
+        stdout=subprocess.PIPE,
+        check=True).stdout.decode('utf-8')
+    return set(output.split())
+
+
+def _get_import_time(module_name):
+    """Return cumulative import time of the module in seconds measured in a new interpreter."""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import %s' % module_name],
+        stderr=subprocess.PIPE,
+        check=True).stderr.decode('utf-8')
+    for line in output.splitlines():
+        line_segments = [segment.strip() for segment in line.split('|')]
+        if len(line_segments) == 3 and line_segments[2] == module_name:
+            return int(line_segments[1]) / 1e6
+    raise AttributeError('Import time of %s not found' % module_name)
+
+
+class StartupTimeTests(unittest.TestCase):
+    def test_agent_entry_points_do_not_import_heavy_modules(self):
+        for module_name in AGENT_ENTRY_POINTS:
+            imported_modules = _get_imported_modules(module_name)
+            for heavy_module_name in HEAVY_MODULES:
+                self.assertNotIn(heavy_module_name, imported_modules, '%s imports %s' % (module_name, heavy_module_name))
+
+    def test_agent_entry_points_import_time_budget(self):
+        for module_name in AGENT_ENTRY_POINTS:
+            import_time = min([_get_import_time(module_name) for _ in range(NUM_IMPORT_TIME_MEASUREMENTS)])
+            self.assertLess(import_time, IMPORT_TIME_BUDGET, '%s import takes %.3fs' % (module_name, import_time))
@@ -0,0 +1,72 @@
+import unittest
+import os
+import shutil
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.io_util import read_strategy_from_file
+from tools.game_utils import is_strategies_equal
+from tools.strategy_store import load_strategy, build_strategy_tree, build_strategy_trees
+from tools.action_sampler import get_cumulative_table
+from tools.strategy_agent import StrategyAgent
+
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+LEDUC_EQUILIBRIUM_STRATEGY_PATH = 'strategies/leduc.limit.2p-equilibrium.strategy'
+
+STORE_DIRECTORY = 'test/strategy_store'
+
+
+class StrategyStoreTests(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists(STORE_DIRECTORY):
+            shutil.rmtree(STORE_DIRECTORY)
+
+    def tearDown(self):
+        self.setUp()
+
+    def test_stored_strategy_equals_strategy_file(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        strategy_tree, strategy = read_strategy_from_file(game, LEDUC_EQUILIBRIUM_STRATEGY_PATH)
+
+        for _ in range(2):
+            stored_strategy = load_strategy(LEDUC_EQUILIBRIUM_STRATEGY_PATH, STORE_DIRECTORY)
+            self.assertIsInstance(stored_strategy.strategies, np.memmap)
+            self.assertEqual(set(stored_strategy.keys()), set(strategy.keys()))
+            for info_set, info_set_strategy in strategy.items():
+                self.assertTrue(np.all(stored_strategy[info_set] == info_set_strategy))
+            self.assertTrue(is_strategies_equal(build_strategy_tree(game, stored_strategy), strategy_tree))
+        self.assertEqual(len(os.listdir(STORE_DIRECTORY)), 3)
+
+    def test_stored_strategy_is_read_only(self):
+        stored_strategy = load_strategy(LEDUC_EQUILIBRIUM_STRATEGY_PATH, STORE_DIRECTORY)
+        info_set = next(iter(stored_strategy))
+        with self.assertRaises(ValueError):
+            stored_strategy[info_set][0] = 1
+
+    def test_stored_cumulative_table(self):
+        for _ in range(2):
+            stored_strategy = load_strategy(LEDUC_EQUILIBRIUM_STRATEGY_PATH, STORE_DIRECTORY)
+            self.assertIsInstance(stored_strategy.cumulative_table, np.memmap)
+            self.assertTrue(np.array_equal(
+                stored_strategy.cumulative_table, get_cumulative_table(stored_strategy.strategies)))
+
+    def test_strategy_agent_samples_from_stored_cumulative_table(self):
+        agent = StrategyAgent(LEDUC_EQUILIBRIUM_STRATEGY_PATH)
+        self.assertIsInstance(agent.action_sampler.cumulative_table, np.memmap)
+        self.assertIs(agent.action_sampler.cumulative_table, agent.strategy.cumulative_table)
+
+    def test_strategy_trees_do_not_share_nodes(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        strategy_tree, _ = read_strategy_from_file(game, LEDUC_EQUILIBRIUM_STRATEGY_PATH)
+        stored_strategy = load_strategy(LEDUC_EQUILIBRIUM_STRATEGY_PATH, STORE_DIRECTORY)
+        first_tree, second_tree = build_strategy_trees(game, [stored_strategy, stored_strategy])
+
+        self.assertTrue(is_strategies_equal(first_tree, strategy_tree))
+        self.assertTrue(is_strategies_equal(second_tree, strategy_tree))
+        hole_cards = next(iter(first_tree.children))
+        first_node = first_tree.children[hole_cards]
+        second_node = second_tree.children[hole_cards]
+        self.assertIsNot(first_node, second_node)
+        self.assertIs(first_node.parent, first_tree)
+        self.assertIs(second_node.parent, second_tree)
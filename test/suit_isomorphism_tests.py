@@ -0,0 +1,74 @@
+import unittest
+
+import acpc_python_client as acpc
+
+from cfr.main import Cfr
+from cfr.schedules import LinearCfrSchedule
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.node_provider import StrategyTreeNodeProvider
+from tools.game_utils import is_strategies_equal
+from tools.io_util import walk_action_nodes
+from tools.suit_isomorphism import SuitIsomorphism, expand_strategy
+
+KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
+KUHN_BIG_DECK_2ROUND_POKER_GAME_FILE_PATH = 'games/kuhn.bigdeck.2round.limit.2p.game'
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+
+
+def get_num_action_nodes(game_tree):
+    num_action_nodes = [0]
+    def on_node(info_set, node):
+        num_action_nodes[0] += 1
+    walk_action_nodes(game_tree, on_node)
+    return num_action_nodes[0]
+
+
+class SuitIsomorphismTests(unittest.TestCase):
+    def test_leduc_canonical_info_sets(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        suit_isomorphism = SuitIsomorphism(game)
+        self.assertEqual(suit_isomorphism.get_canonical_info_set('42:cc:46:c'), '42:cc:46:c')
+        self.assertEqual(suit_isomorphism.get_canonical_info_set('43:cc:47:c'), '42:cc:46:c')
+        self.assertEqual(suit_isomorphism.get_canonical_info_set('43:cc:46:c'), '42:cc:47:c')
+        self.assertEqual(suit_isomorphism.get_canonical_info_set('51:r'), '50:r')
+
+    def test_leduc_continuation_weights(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        suit_isomorphism = SuitIsomorphism(game)
+        self.assertEqual(
+            suit_isomorphism.get_canonical_continuations((), 1),
+            [((42,), 2), ((46,), 2), ((50,), 2)])
+        # Suits are no longer interchangeable once a card is dealt
+        self.assertEqual(
+            suit_isomorphism.get_canonical_continuations(((42,),), 1),
+            [((43,), 1), ((46,), 1), ((47,), 1), ((50,), 1), ((51,), 1)])
+
+    def test_kuhn_tree_is_not_compressed(self):
+        game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+        tree = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+        canonical_tree = GameTreeBuilder(game, StrategyTreeNodeProvider(), SuitIsomorphism(game)).build_tree()
+        self.assertEqual(get_num_action_nodes(canonical_tree), get_num_action_nodes(tree))
+
+    def test_leduc_tree_is_compressed(self):
+        game = acpc.read_game_file(LEDUC_POKER_GAME_FILE_PATH)
+        tree = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+        canonical_tree = GameTreeBuilder(game, StrategyTreeNodeProvider(), SuitIsomorphism(game)).build_tree()
+        self.assertEqual(get_num_action_nodes(canonical_tree) * 2, get_num_action_nodes(tree))
+
+    def test_kuhn_bigdeck_2round_cfr_is_exact(self):
+        self.check_cfr_is_exact(KUHN_BIG_DECK_2ROUND_POKER_GAME_FILE_PATH, 20)
+
+    def test_leduc_cfr_is_exact(self):
+        self.check_cfr_is_exact(LEDUC_POKER_GAME_FILE_PATH, 5)
+
+    def check_cfr_is_exact(self, game_file_path, iterations):
+        game = acpc.read_game_file(game_file_path)
+        # CFR+ floors regrets on each visit which depends on order of the deals,
+        # schedules update regrets once per iteration so results are equal
+        cfr = Cfr(game, show_progress=False)
+        cfr.train(iterations, weight_delay=0, schedule=LinearCfrSchedule())
+        isomorphic_cfr = Cfr(game, show_progress=False, suit_isomorphism=True)
+        isomorphic_cfr.train(iterations, weight_delay=0, schedule=LinearCfrSchedule())
+
+        strategy = expand_strategy(game, isomorphic_cfr.game_tree, isomorphic_cfr.suit_isomorphism)
+        self.assertTrue(is_strategies_equal(cfr.game_tree, strategy))
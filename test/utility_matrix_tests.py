@@ -0,0 +1,88 @@
+import unittest
+import os
+import shutil
+import random
+import numpy as np
+
+import acpc_python_client as acpc
+
+from evaluation.utility_matrix import UtilityMatrix, CachedUtilityMatrix
+from evaluation.player_utility import PlayerUtility
+from tools.io_util import read_strategy_from_file
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.node_provider import StrategyTreeNodeProvider
+from tools.game_tree.nodes import ActionNode
+from tools.walk_trees import walk_trees
+
+KUHN_POKER_GAME_FILE_PATH = 'games/kuhn.limit.2p.game'
+LEDUC_POKER_GAME_FILE_PATH = 'games/leduc.limit.2p.game'
+
+CACHE_DIRECTORY = 'test/utility_matrix_cache'
+
+
+class UtilityMatrixTests(unittest.TestCase):
+    def create_random_strategy(self, game, seed):
+        rng = random.Random(seed)
+        strategy = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+
+        def on_node(node):
+            if isinstance(node, ActionNode):
+                weights = [rng.random() for _ in node.children]
+                for a, weight in zip(node.children, weights):
+                    node.strategy[a] = weight / sum(weights)
+        walk_trees(on_node, strategy)
+        return strategy
+
+    def evaluate_against_player_utility(self, game_file_path, strategy_file_path):
+        game = acpc.read_game_file(game_file_path)
+        equilibrium_strategy, _ = read_strategy_from_file(game_file_path, strategy_file_path)
+        strategies = [equilibrium_strategy] + [self.create_random_strategy(game, seed) for seed in range(3)]
+
+        utility_matrix = UtilityMatrix(game).evaluate(strategies)
+        self.assertEqual(utility_matrix.shape, (4, 4))
+        self.assertTrue(np.allclose(utility_matrix, -utility_matrix.T))
+
+        player_utility = PlayerUtility(game)
+        for i in range(len(strategies)):
+            for j in range(i + 1, len(strategies)):
+                player_utilities, positions = player_utility.evaluate(strategies[i], strategies[j])
+                expected_utility = np.mean([player_utilities[k, positions[k].tolist().index(0)] for k in range(2)])
+                self.assertAlmostEqual(utility_matrix[i, j], expected_utility)
+
+    def test_kuhn_utility_matrix(self):
+        self.evaluate_against_player_utility(
+            KUHN_POKER_GAME_FILE_PATH,
+            'strategies/kuhn.limit.2p-equilibrium.strategy')
+
+    def test_leduc_utility_matrix(self):
+        self.evaluate_against_player_utility(
+            LEDUC_POKER_GAME_FILE_PATH,
+            'strategies/leduc.limit.2p-equilibrium.strategy')
+
+    def test_cached_utility_matrix_is_extended_incrementally(self):
+        if os.path.exists(CACHE_DIRECTORY):
+            shutil.rmtree(CACHE_DIRECTORY)
+        try:
+            game = acpc.read_game_file(KUHN_POKER_GAME_FILE_PATH)
+            strategies = [self.create_random_strategy(game, seed) for seed in range(5)]
+            opponents = [self.create_random_strategy(game, seed) for seed in range(5, 9)]
+            utility_matrix = UtilityMatrix(game)
+            expected_utilities = utility_matrix.evaluate(strategies, opponents)
+            cache_file_path = '%s/utilities.npz' % CACHE_DIRECTORY
+
+            utilities, num_computed = CachedUtilityMatrix(utility_matrix, cache_file_path).evaluate(
+                strategies[:3], opponents[:3])
+            self.assertEqual(num_computed, 9)
+            self.assertTrue(np.allclose(utilities, expected_utilities[:3, :3]))
+
+            utilities, num_computed = CachedUtilityMatrix(utility_matrix, cache_file_path).evaluate(
+                strategies, opponents)
+            self.assertEqual(num_computed, 20 - 9)
+            self.assertTrue(np.allclose(utilities, expected_utilities))
+
+            utilities, num_computed = CachedUtilityMatrix(utility_matrix, cache_file_path).evaluate(
+                strategies[::-1], opponents)
+            self.assertEqual(num_computed, 0)
+            self.assertTrue(np.allclose(utilities, expected_utilities[::-1]))
+        finally:
+            shutil.rmtree(CACHE_DIRECTORY)
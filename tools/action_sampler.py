@@ -0,0 +1,90 @@
+import numpy as np
+
+from tools.agent_utils import ACTIONS
+
+
+def get_cumulative_table(strategies):
+    """Convert action probabilities to cumulative distributions used for sampling.
+
+    Distributions are normalized and equal exactly 1 from the last action with nonzero
+    probability on, so that actions with zero probability are never sampled due to floating
+    point error. Rows without any probability always sample call.
+
+    Args:
+        strategies (np.array): Action probabilities in the last dimension.
+
+    Returns:
+        np.array: Cumulative distributions with the same shape.
+    """
+    strategies = np.asarray(strategies, dtype=float)
+    probability_sums = np.sum(strategies, axis=-1, keepdims=True)
+    cumulative_table = np.cumsum(strategies, axis=-1) / np.where(probability_sums > 0, probability_sums, 1)
+    num_actions = strategies.shape[-1]
+    last_actions = num_actions - 1 - np.argmax((strategies > 0)[..., ::-1], axis=-1)
+    last_actions = np.where(probability_sums[..., 0] > 0, last_actions, 1)
+    cumulative_table[np.arange(num_actions) >= last_actions[..., np.newaxis]] = 1
+    return cumulative_table
+
+
+def sample_actions(rng, cumulative_distributions):
+    """Draw one action from each of the cumulative distributions.
+
+    Args:
+        rng (np.random.Generator): Generator of the random numbers.
+        cumulative_distributions (np.array): Array of shape (samples, actions) returned by get_cumulative_table.
+
+    Returns:
+        np.array: Indices of sampled actions.
+    """
+    choices = rng.random(len(cumulative_distributions))
+    return np.sum(choices[:, np.newaxis] >= cumulative_distributions, axis=1)
+
+
+class ActionSampler:
+    """Samples actions of a strategy from cumulative distributions precomputed for all info sets.
+
+    Table is built once for the strategy and can be shared by many samplers,
+    each with its own seeded generator so that every match has reproducible stream of actions.
+    """
+
+    def __init__(self, strategies, seed=None, cumulative_table=None):
+        """Create the sampler.
+
+        Args:
+            strategies (np.array): Action probabilities of info sets in shape (info sets, actions),
+                                   e.g. strategies of StoredStrategy.
+            seed: Seed of the NumPy generator. Fresh entropy is used if None.
+            cumulative_table (np.array): Already computed table of the strategies.
+        """
+        if cumulative_table is None:
+            cumulative_table = get_cumulative_table(strategies)
+        self.cumulative_table = cumulative_table
+        self.rng = np.random.default_rng(seed)
+
+    def copy(self, seed=None):
+        """Return sampler sharing the table with this sampler which has its own generator."""
+        return ActionSampler(None, seed, self.cumulative_table)
+
+    def sample(self, info_set_ids):
+        """Draw actions for a batch of info sets.
+
+        Args:
+            info_set_ids (np.array): Ids of the info sets.
+
+        Returns:
+            np.array: Indices of sampled actions.
+        """
+        return sample_actions(self.rng, self.cumulative_table[info_set_ids])
+
+    def sample_action(self, info_set_id):
+        """Draw action for one info set.
+
+        Returns:
+            acpc.ActionType: Sampled action.
+        """
+        cumulative_distribution = self.cumulative_table[info_set_id]
+        choice = self.rng.random()
+        for action_index in range(len(cumulative_distribution)):
+            if choice < cumulative_distribution[action_index]:
+                return ACTIONS[action_index]
+        return ACTIONS[len(cumulative_distribution) - 1]
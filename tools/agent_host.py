@@ -0,0 +1,158 @@
+import os
+import sys
+import copy
+import asyncio
+import traceback
+
+import acpc_python_client as acpc
+
+from tools.agent_utils import convert_action_to_str
+from tools.match_state import MatchState, get_cards_by_str
+from tools.agent_server import read_agents_file
+
+
+"""Asyncio host of preloaded agents.
+
+Host speaks ACPC protocol with the dealer itself so that hundreds of matches
+can be played concurrently from one process. Agents are created once when the host
+starts and each match is played with a shallow copy of the preloaded agent,
+so all tables share one copy of the loaded strategies in memory while each
+ImplicitModellingAgent copy keeps its own bandit state.
+
+Matches are requested with tools/agent_server_client.py in the same way as from tools/agent_server.py.
+
+!!! Only limit betting games are supported !!!
+
+Usage:
+python agent_host.py {server_socket_path} {agents_file_path}
+
+  Agents file has the same format as the agents file of tools/agent_server.py.
+"""
+
+
+PROTOCOL_VERSION = 'VERSION:2.0.0'
+
+
+class AgentHost:
+    """Plays matches of preloaded agents concurrently on one asyncio event loop."""
+
+    def __init__(self, agents):
+        """Create the host.
+
+        Args:
+            agents (dict): Game file path and preloaded agent by agent name, see tools.agent_server.read_agents_file.
+        """
+        self.agents = agents
+        self.games = {}
+        self.num_decisions = 0
+        self.num_active_matches = 0
+
+    def _get_game(self, game_file_path):
+        if game_file_path not in self.games:
+            game = acpc.read_game_file(game_file_path)
+            if game.get_betting_type() != acpc.BettingType.LIMIT:
+                raise AttributeError('Only limit betting games are supported')
+            self.games[game_file_path] = game, get_cards_by_str(game)
+        return self.games[game_file_path]
+
+    async def play_match_async(self, agent_name, dealer_hostname, dealer_port):
+        """Connect to the dealer and play the match with a copy of the agent.
+
+        Args:
+            agent_name (str): Name of the preloaded agent.
+            dealer_hostname (str): Host of the dealer.
+            dealer_port (int): Port of the dealer.
+
+        Returns:
+            int: Number of actions taken by the agent in the match.
+        """
+        game_file_path, preloaded_agent = self.agents[agent_name]
+        game, cards_by_str = self._get_game(game_file_path)
+
+        agent = copy.copy(preloaded_agent)
+        next_actions = []
+        agent.set_next_action = next_actions.append
+
+        num_decisions = 0
+        reader, writer = await asyncio.open_connection(dealer_hostname, int(dealer_port))
+        self.num_active_matches += 1
+        try:
+            writer.write(('%s\r\n' % PROTOCOL_VERSION).encode('utf-8'))
+            hand_number = None
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode('utf-8').strip()
+                # Everything else than match states are comments in ACPC protocol
+                if not line.startswith('MATCHSTATE:'):
+                    continue
+
+                match_state = MatchState.parse(game, line, cards_by_str)
+                if match_state.hand_number != hand_number:
+                    hand_number = match_state.hand_number
+                    agent.on_game_start(game)
+                if match_state.is_finished():
+                    agent.on_game_finished(game, match_state)
+                    continue
+
+                is_acting_player = match_state.acting_player == match_state.viewing_player
+                next_actions.clear()
+                agent.on_next_turn(game, match_state, is_acting_player)
+                if is_acting_player:
+                    action_string = convert_action_to_str(next_actions[-1]) if next_actions else 'c'
+                    writer.write(('%s:%s\r\n' % (line, action_string)).encode('utf-8'))
+                    await writer.drain()
+                    num_decisions += 1
+                    self.num_decisions += 1
+        finally:
+            self.num_active_matches -= 1
+            writer.close()
+        return num_decisions
+
+    async def _handle_request(self, reader, writer):
+        try:
+            request = (await reader.readline()).decode('utf-8').split()
+            if len(request) != 3 or request[0] not in self.agents:
+                writer.write(('ERROR Invalid request %s\n' % ' '.join(request)).encode('utf-8'))
+                return
+            try:
+                await self.play_match_async(*request)
+            except Exception:
+                traceback.print_exc()
+                writer.write(b'ERROR Match failed\n')
+                return
+            writer.write(b'DONE\n')
+        finally:
+            await writer.drain()
+            writer.close()
+
+    async def serve_async(self, server_socket_path, backlog=1024):
+        """Serve match requests on the unix socket until cancelled.
+
+        Args:
+            server_socket_path (str): Path of the unix socket the host listens on.
+            backlog (int): Maximal number of match requests waiting to be accepted. Requests
+                           of all tables are often sent at once so it should exceed the number of tables.
+        """
+        if os.path.exists(server_socket_path):
+            os.remove(server_socket_path)
+        server = await asyncio.start_unix_server(self._handle_request, server_socket_path, backlog=backlog)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(server_socket_path):
+                os.remove(server_socket_path)
+
+    def serve(self, *args, **kwargs):
+        """Blocking version of serve_async."""
+        asyncio.run(self.serve_async(*args, **kwargs))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage {server_socket_path} {agents_file_path}")
+        sys.exit(1)
+
+    AgentHost(read_agents_file(sys.argv[2])).serve(sys.argv[1])
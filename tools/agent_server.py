@@ -0,0 +1,128 @@
+import os
+import sys
+import copy
+import random
+import socketserver
+import traceback
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.strategy_agent import StrategyAgent
+from implicit_modelling.implicit_modelling_agent import ImplicitModellingAgent, get_utility_estimator
+
+
+"""Server of preloaded agents.
+
+Agents are created once when the server starts. For each match requested
+by tools/agent_server_client.py the server forks a child process
+which plays the match with a copy of the preloaded agent. Children
+don't pay for interpreter startup, imports and strategy loading, so each
+match starts with an agent in its initial state within milliseconds.
+
+Agents must not start threads when created because threads don't survive fork.
+
+Usage:
+python agent_server.py {server_socket_path} {agents_file_path}
+
+  Each line of the agents file specifies one agent, lines starting with # are ignored:
+  {agent_name} strategy {game_file_path} {strategy_file_path}
+  {agent_name} implicit_modelling {game_file_path} [none|imaginary_observations|aivat] *{portfolio_strategy_files_paths}
+"""
+
+
+def create_agent(agent_type, game_file_path, *args):
+    """Create agent of given type.
+
+    Args:
+        agent_type (str): Either strategy or implicit_modelling.
+        game_file_path (str): Path to ACPC game definition file.
+        args: Strategy file path for strategy agent. Utility estimation method name
+              and portfolio strategy file paths for implicit modelling agent.
+
+    Returns:
+        acpc.Agent: Created agent.
+    """
+    if agent_type == 'strategy':
+        return StrategyAgent(args[0])
+    elif agent_type == 'implicit_modelling':
+        utility_estimator_class, utility_estimator_args = get_utility_estimator(game_file_path, args[0])
+        return ImplicitModellingAgent(
+            game_file_path,
+            list(args[1:]),
+            utility_estimator_class=utility_estimator_class,
+            utility_estimator_args=utility_estimator_args)
+    else:
+        raise AttributeError('Invalid agent type %s' % agent_type)
+
+
+def read_agents_file(agents_file_path):
+    """Read agents specification and create the agents.
+
+    Returns:
+        dict: Game file path and created agent by agent name.
+    """
+    agents = {}
+    with open(agents_file_path, 'r') as agents_file:
+        for line in agents_file:
+            if not line.strip() or line.strip().startswith('#'):
+                continue
+            agent_name, agent_type, game_file_path, *args = line.split()
+            agents[agent_name] = (game_file_path, create_agent(agent_type, game_file_path, *args))
+    return agents
+
+
+class _MatchRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = self.rfile.readline().decode('utf-8').split()
+        if len(request) != 3 or request[0] not in self.server.agents:
+            self.wfile.write(('ERROR Invalid request %s\n' % ' '.join(request)).encode('utf-8'))
+            return
+        agent_name, dealer_hostname, dealer_port = request
+        game_file_path, agent = self.server.agents[agent_name]
+        # Forked children would otherwise play with the same random state as the server
+        random.seed()
+        np.random.seed()
+        try:
+            # Copy of the agent has its own generator of actions
+            acpc.Client(game_file_path, dealer_hostname, dealer_port).play(copy.copy(agent))
+        except Exception:
+            traceback.print_exc()
+            self.wfile.write(b'ERROR Match failed\n')
+            return
+        self.wfile.write(b'DONE\n')
+
+
+class AgentServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server playing each requested match in a forked child process."""
+
+    def __init__(self, server_socket_path, agents, max_concurrent_matches=64):
+        """Create the server, call serve_forever to start serving.
+
+        Args:
+            server_socket_path (str): Path of the unix socket the server listens on.
+            agents (dict): Game file path and preloaded agent by agent name, see read_agents_file.
+            max_concurrent_matches (int): Maximal number of matches played at the same time.
+        """
+        if os.path.exists(server_socket_path):
+            os.remove(server_socket_path)
+        self.agents = agents
+        self.max_children = max_concurrent_matches
+        super().__init__(server_socket_path, _MatchRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage {server_socket_path} {agents_file_path}")
+        sys.exit(1)
+
+    server = AgentServer(sys.argv[1], read_agents_file(sys.argv[2]))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,44 @@
+import sys
+import socket
+
+
+"""Client of the agent server started by tools/agent_server.py.
+
+Asks the agent server to play a match with one of its agents and waits until the match ends.
+Only standard library is imported so that startup of this script is fast.
+
+Usage:
+python agent_server_client.py {server_socket_path} {agent_name} {dealer_hostname} {dealer_port}
+
+  Can be used in agent scripts instead of starting the agent itself, e.g.:
+  python -I -S tools/agent_server_client.py /tmp/agents.sock Equilibrium $1 $2
+"""
+
+
+def request_match(server_socket_path, agent_name, dealer_hostname, dealer_port):
+    """Request match from the agent server and wait until it ends.
+
+    Returns:
+        bool: True if the match was played, False if the server refused it.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server_socket:
+        server_socket.connect(server_socket_path)
+        server_socket.sendall(('%s %s %s\n' % (agent_name, dealer_hostname, dealer_port)).encode('utf-8'))
+        with server_socket.makefile('r') as server_file:
+            for line in server_file:
+                line = line.strip()
+                if line == 'DONE':
+                    return True
+                if line.startswith('ERROR'):
+                    sys.stderr.write('%s\n' % line)
+                    return False
+    return False
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 5:
+        print("Usage {server_socket_path} {agent_name} {dealer_hostname} {dealer_port}")
+        sys.exit(1)
+
+    if not request_match(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4]):
+        sys.exit(1)
@@ -54,14 +54,16 @@ def select_action(strategy):
     return ACTIONS[2]
 
 
-def get_info_set(game, match_state):
+def get_info_set(game, match_state, card_abstraction=None):
     """Return unique string representing each game state.
 
-    Result is used as a node key in strategy.
+    Result is used as a node key in strategy. Whole key is built on each call,
+    tools.info_set_tracker.InfoSetTracker maintains it incrementally during the hand.
 
     Args:
         game (Game): Game definition object
         match_state (MatchState): Current game state
+        card_abstraction (CardAbstraction): When provided, key of the abstract info set is returned.
 
     Returns:
         string: Representation of current game state.
@@ -71,18 +73,22 @@ def get_info_set(game, match_state):
 
     num_hole_cards = game.get_num_hole_cards()
     viewing_player = match_state.get_viewing_player()
-    info_set += '%s:' % ':'.join([str(state.get_hole_card(viewing_player, i)) for i in range(num_hole_cards)])
+    info_set += '%s:' % ':'.join(
+        [str(card) for card in sorted([state.get_hole_card(viewing_player, i) for i in range(num_hole_cards)])])
 
     total_board_cards_count = 0
     for round_index in range(state.get_round() + 1):
         new_total_board_cards_count = game.get_total_num_board_cards(round_index)
         if new_total_board_cards_count > total_board_cards_count:
             info_set += ':%s:' % ':'.join(
-                [str(state.get_board_card(i))
-                 for i in range(total_board_cards_count, new_total_board_cards_count)])
+                [str(card) for card in sorted([
+                    state.get_board_card(i)
+                    for i in range(total_board_cards_count, new_total_board_cards_count)])])
             total_board_cards_count = new_total_board_cards_count
 
         info_set += ''.join(
             [convert_action_to_str(state.get_action_type(round_index, action_index))
              for action_index in range(state.get_num_actions(round_index))])
+    if card_abstraction:
+        return card_abstraction.get_abstract_info_set(info_set)
     return info_set
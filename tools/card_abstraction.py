@@ -0,0 +1,275 @@
+import itertools
+import random
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.node_provider import StrategyTreeNodeProvider
+from tools.hand_evaluation import get_winners
+from tools.io_util import walk_action_nodes
+
+DEFAULT_NUM_HISTOGRAM_BINS = 10
+DEFAULT_KMEANS_ITERATIONS = 100
+
+
+class CardAbstraction:
+    """Maps cards seen by a player in each round to one of a small number of buckets.
+
+    Game tree built with the abstraction has one child of each hole cards and board cards node
+    for each bucket of the round instead of one child for each dealt cards. Bucket keys
+    of the tree are strings like 'b3' so info sets of abstract strategies, e.g. "b2:cc:b0:c",
+    can't be confused with info sets of strategies over cards.
+
+    The abstraction reduces the size of the tree, i.e. memory of the training. Cost of an exhaustive
+    CFR iteration still depends on the number of deals of cards, the training has to sample deals
+    (Cfr.train with sample_deals) for the cost to depend on the number of buckets.
+    """
+
+    def __init__(self, game, buckets):
+        """Create the abstraction.
+
+        Args:
+            game (Game): ACPC game definition object.
+            buckets (list(dict)): For each round bucket index by tuple of sorted hole cards
+                                  and tuple of sorted board cards dealt up to the round.
+        """
+        self.game = game
+        self.deck = sorted(acpc.game_utils.generate_deck(game))
+        self.buckets = buckets
+        self.num_buckets = [max(round_buckets.values()) + 1 for round_buckets in buckets]
+
+    def get_bucket(self, hole_cards, board_cards):
+        round_index = self._get_round_index(len(board_cards))
+        return self.buckets[round_index][(tuple(sorted(hole_cards)), tuple(sorted(board_cards)))]
+
+    def get_bucket_key(self, hole_cards, board_cards):
+        """Return key of the game tree node child for the cards.
+
+        Args:
+            hole_cards (list(int)): Hole cards of the player.
+            board_cards (list(int)): All board cards dealt so far.
+
+        Returns:
+            tuple(str): Key of the child of hole cards or board cards node.
+        """
+        return _get_bucket_key(self.get_bucket(hole_cards, board_cards))
+
+    def get_bucket_keys(self, round_index):
+        return [_get_bucket_key(bucket) for bucket in range(self.num_buckets[round_index])]
+
+    def get_abstract_info_set(self, info_set):
+        """Return key of the abstract info set to which the info set belongs.
+
+        Args:
+            info_set (str): Info set key as returned by tools.agent_utils.get_info_set.
+
+        Returns:
+            str: Info set key with cards dealt in each round replaced by their bucket.
+        """
+        num_hole_cards = self.game.get_num_hole_cards()
+        tokens = info_set.split(':')
+        cards = [int(token) for token in tokens if token.isdigit()]
+
+        # Cards dealt in each round are replaced by one bucket token
+        group_ends = {0: num_hole_cards}
+        for round_index in range(1, self.game.get_num_rounds()):
+            if self.game.get_num_board_cards(round_index) > 0:
+                group_ends[num_hole_cards + self.game.get_total_num_board_cards(round_index - 1)] = \
+                    num_hole_cards + self.game.get_total_num_board_cards(round_index)
+
+        abstract_tokens = []
+        card_index = 0
+        for token in tokens:
+            if not token.isdigit():
+                abstract_tokens += [token]
+                continue
+            if card_index in group_ends:
+                abstract_tokens += self.get_bucket_key(
+                    cards[:num_hole_cards], cards[num_hole_cards:group_ends[card_index]])
+            card_index += 1
+        return ':'.join(abstract_tokens)
+
+    def save(self, abstraction_file_path):
+        arrays = {}
+        for round_index, round_buckets in enumerate(self.buckets):
+            cards = sorted(round_buckets.keys())
+            arrays['hole_cards_%s' % round_index] = np.array([hole_cards for hole_cards, _ in cards], dtype=int)
+            arrays['board_cards_%s' % round_index] = np.array(
+                [board_cards for _, board_cards in cards], dtype=int).reshape(len(cards), -1)
+            arrays['buckets_%s' % round_index] = np.array([round_buckets[key] for key in cards], dtype=int)
+        np.savez(abstraction_file_path, **arrays)
+
+    def _get_round_index(self, num_board_cards):
+        for round_index in range(self.game.get_num_rounds()):
+            if self.game.get_total_num_board_cards(round_index) >= num_board_cards:
+                return round_index
+        raise AttributeError('Game does not have %s board cards' % num_board_cards)
+
+
+def _get_bucket_key(bucket):
+    return ('b%s' % bucket,)
+
+
+def load_card_abstraction(game, abstraction_file_path):
+    """Load abstraction saved with CardAbstraction.save."""
+    with np.load(abstraction_file_path) as arrays:
+        buckets = []
+        for round_index in range(game.get_num_rounds()):
+            hole_cards = arrays['hole_cards_%s' % round_index]
+            board_cards = arrays['board_cards_%s' % round_index]
+            round_buckets = arrays['buckets_%s' % round_index]
+            buckets += [{
+                (tuple(int(card) for card in hole_cards[i]), tuple(int(card) for card in board_cards[i])):
+                    int(round_buckets[i])
+                for i in range(len(round_buckets))}]
+    return CardAbstraction(game, buckets)
+
+
+def _get_hand_strength(hole_cards, board_cards, deck):
+    """Return probability of winning plus half of the probability of tie against each opponent's hole cards."""
+    dealt_cards = set(hole_cards) | set(board_cards)
+    remaining_cards = [card for card in deck if card not in dealt_cards]
+    hand = list(hole_cards) + list(board_cards)
+    value_sum = 0
+    num_opponent_hole_cards = 0
+    for opponent_hole_cards in itertools.combinations(remaining_cards, len(hole_cards)):
+        winners = get_winners([hand, list(opponent_hole_cards) + list(board_cards)])
+        value_sum += 1 / len(winners) if 0 in winners else 0
+        num_opponent_hole_cards += 1
+    return value_sum / num_opponent_hole_cards
+
+
+def _get_final_hand_strengths(game, hole_cards, board_cards, deck, num_samples, rng):
+    """Return hand strengths on the final round for each possible (or sampled) rest of the board."""
+    dealt_cards = set(hole_cards) | set(board_cards)
+    remaining_cards = [card for card in deck if card not in dealt_cards]
+    num_missing_board_cards = game.get_total_num_board_cards(game.get_num_rounds() - 1) - len(board_cards)
+    board_completions = list(itertools.combinations(remaining_cards, num_missing_board_cards))
+    if num_samples and num_samples < len(board_completions):
+        board_completions = rng.sample(board_completions, num_samples)
+    return [
+        _get_hand_strength(hole_cards, list(board_cards) + list(completion), deck)
+        for completion in board_completions]
+
+
+def _kmeans(points, num_clusters, rng, iterations):
+    """Cluster points with k-means initialized by k-means++.
+
+    Returns:
+        np.array: Cluster index of each point.
+    """
+    unique_points = np.unique(points, axis=0)
+    if len(unique_points) <= num_clusters:
+        return np.array([np.nonzero((unique_points == point).all(axis=1))[0][0] for point in points])
+
+    centers = [points[rng.randrange(len(points))]]
+    for _ in range(1, num_clusters):
+        distances = np.min([np.sum((points - center) ** 2, axis=1) for center in centers], axis=0)
+        choice = rng.random() * np.sum(distances)
+        centers += [points[min(np.searchsorted(np.cumsum(distances), choice, side='right'), len(points) - 1)]]
+    centers = np.array(centers, dtype=float)
+
+    assignment = None
+    for _ in range(iterations):
+        distances = np.array([np.sum((points - center) ** 2, axis=1) for center in centers])
+        new_assignment = np.argmin(distances, axis=0)
+        if assignment is not None and np.array_equal(assignment, new_assignment):
+            break
+        assignment = new_assignment
+        for cluster in range(num_clusters):
+            cluster_points = points[assignment == cluster]
+            if len(cluster_points) > 0:
+                centers[cluster] = np.mean(cluster_points, axis=0)
+    # Drop empty clusters so that bucket indexes are contiguous
+    _, assignment = np.unique(assignment, return_inverse=True)
+    return assignment
+
+
+def create_card_abstraction(
+        game,
+        num_buckets,
+        features='equity',
+        num_histogram_bins=DEFAULT_NUM_HISTOGRAM_BINS,
+        num_samples=None,
+        seed=None,
+        kmeans_iterations=DEFAULT_KMEANS_ITERATIONS):
+    """Cluster cards seen by the player in each round into buckets.
+
+    All hands of each round are enumerated and evaluated, num_samples limits only the evaluated rests of the board.
+
+    Args:
+        game (Game): ACPC game definition object.
+        num_buckets (int or list(int)): Number of buckets in each round.
+        features (str): 'equity' clusters hands by expected hand strength at the end of the hand,
+                        'histogram' by histogram of hand strengths over the possible rests of the board.
+        num_histogram_bins (int): Number of bins of the hand strength histograms.
+        num_samples (int): Number of sampled rests of the board, all of them are evaluated if None.
+        seed: Seed of the sampling and of k-means initialization.
+        kmeans_iterations (int): Maximal number of k-means iterations.
+
+    Returns:
+        CardAbstraction: Abstraction where weaker hands are in buckets with lower indexes.
+    """
+    if features not in ['equity', 'histogram']:
+        raise AttributeError('Unknown features %s' % features)
+    if game.get_num_board_cards(0) > 0:
+        raise AttributeError('Games with board cards in the first round are not supported')
+
+    num_rounds = game.get_num_rounds()
+    if isinstance(num_buckets, int):
+        num_buckets = [num_buckets] * num_rounds
+    rng = random.Random(seed)
+    deck = sorted(acpc.game_utils.generate_deck(game))
+
+    buckets = []
+    for round_index in range(num_rounds):
+        hands = [
+            (hole_cards, board_cards)
+            for hole_cards in itertools.combinations(deck, game.get_num_hole_cards())
+            for board_cards in itertools.combinations(
+                [card for card in deck if card not in hole_cards], game.get_total_num_board_cards(round_index))]
+        final_hand_strengths = [
+            _get_final_hand_strengths(game, hole_cards, board_cards, deck, num_samples, rng)
+            for hole_cards, board_cards in hands]
+        equities = np.array([np.mean(hand_strengths) for hand_strengths in final_hand_strengths])
+        if features == 'equity':
+            points = equities.reshape(-1, 1)
+        else:
+            # Cumulative histograms make euclidean distance respect the distance of the bins
+            points = np.array([
+                np.cumsum(np.histogram(hand_strengths, bins=num_histogram_bins, range=(0, 1))[0]) / len(hand_strengths)
+                for hand_strengths in final_hand_strengths])
+
+        assignment = _kmeans(points, num_buckets[round_index], rng, kmeans_iterations)
+        # Order buckets by mean equity of their hands
+        bucket_equities = [np.mean(equities[assignment == bucket]) for bucket in range(np.max(assignment) + 1)]
+        bucket_order = np.argsort(np.argsort(bucket_equities, kind='stable'), kind='stable')
+        buckets += [{hand: int(bucket_order[assignment[i]]) for i, hand in enumerate(hands)}]
+    return CardAbstraction(game, buckets)
+
+
+def expand_abstract_strategy(game, abstract_strategy, card_abstraction):
+    """Create strategy over cards from strategy over buckets.
+
+    Each info set gets strategy of its abstract info set, the result can be written to strategy file,
+    used by agents and evaluated as any other strategy.
+
+    Args:
+        game (Game): ACPC game definition object.
+        abstract_strategy (HoleCardsNode): Strategy tree built with the card abstraction.
+        card_abstraction (CardAbstraction): Abstraction of the strategy.
+
+    Returns:
+        HoleCardsNode: Strategy tree over cards.
+    """
+    abstract_node_strategies = {}
+    def on_abstract_node(info_set, node):
+        abstract_node_strategies[info_set] = node.strategy
+    walk_action_nodes(abstract_strategy, on_abstract_node)
+
+    strategy = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+    def on_node(info_set, node):
+        np.copyto(node.strategy, abstract_node_strategies[card_abstraction.get_abstract_info_set(info_set)])
+    walk_action_nodes(strategy, on_node)
+    return strategy
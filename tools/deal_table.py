@@ -0,0 +1,89 @@
+import itertools
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.utils import is_unique
+
+_deal_tables = {}
+
+
+class DealTable:
+    """Deals of cards of the game enumerated once and shared by all tree traversals.
+
+    Hole cards and board cards of each round are stored as lists of sorted card tuples,
+    the same tuples which are keys of hole cards and board cards nodes of game trees.
+    Deals are integer index arrays into these lists.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.num_players = game.get_num_players()
+        self.deck = sorted(acpc.game_utils.generate_deck(game))
+
+        self.hole_cards = list(itertools.combinations(self.deck, game.get_num_hole_cards()))
+        hole_cards_indexes = {hole_cards: i for i, hole_cards in enumerate(self.hole_cards)}
+        # Deals of hole cards to all players as indexes of each player's hole cards in the hole cards list
+        self.hole_cards_deals = np.array([
+            [hole_cards_indexes[hole_cards] for hole_cards in comb]
+            for comb in itertools.product(self.hole_cards, repeat=self.num_players) if is_unique(*comb)],
+            dtype=np.intp).reshape(-1, self.num_players)
+        self.hole_cards_deal_probability = 1 / len(self.hole_cards_deals)
+        # Hole cards of the opponent which don't collide with hole cards of the player
+        self.compatible_hole_cards = [
+            np.array([j for j, other_cards in enumerate(self.hole_cards) if is_unique(cards, other_cards)], dtype=np.intp)
+            for cards in self.hole_cards]
+
+        self.board_cards = [
+            list(itertools.combinations(self.deck, game.get_num_board_cards(round_index)))
+            for round_index in range(game.get_num_rounds())]
+        self._board_cards_deals = {}
+
+    def get_hole_cards(self, hole_cards_deal):
+        """Return tuple of hole cards of each player in the deal from hole_cards_deals."""
+        return tuple(self.hole_cards[i] for i in hole_cards_deal)
+
+    def get_board_cards_deals(self, hole_cards, board_cards):
+        """Return board cards of the next round which can be dealt after the cards.
+
+        Args:
+            hole_cards (list(int)): Hole cards of all players known to the traversal.
+            board_cards (list(int)): Board cards dealt in previous rounds.
+
+        Returns:
+            tuple(np.array, list(tuple(int)), float): Indexes into the board cards of the next round,
+                                                      the board cards of the round and probability of each deal.
+        """
+        dealt_cards = tuple(sorted(itertools.chain(hole_cards, board_cards)))
+        round_index = self._get_next_board_cards_round(len(board_cards))
+        key = (round_index, dealt_cards)
+        deals = self._board_cards_deals.get(key)
+        if deals is None:
+            dealt_cards = set(dealt_cards)
+            indexes = np.array([
+                i for i, round_board_cards in enumerate(self.board_cards[round_index])
+                if dealt_cards.isdisjoint(round_board_cards)], dtype=np.intp)
+            deals = (indexes, self.board_cards[round_index], 1 / len(indexes))
+            self._board_cards_deals[key] = deals
+        return deals
+
+    def _get_next_board_cards_round(self, num_board_cards):
+        for round_index in range(self.game.get_num_rounds()):
+            if self.game.get_total_num_board_cards(round_index) > num_board_cards:
+                return round_index
+        raise AttributeError('No more board cards are dealt after %s board cards' % num_board_cards)
+
+
+def get_deal_table(game):
+    """Return deal table of the game, the table is built only once for each game definition."""
+    key = (
+        game.get_num_players(),
+        game.get_num_hole_cards(),
+        game.get_num_suits(),
+        game.get_num_ranks(),
+        tuple(game.get_num_board_cards(round_index) for round_index in range(game.get_num_rounds())))
+    deal_table = _deal_tables.get(key)
+    if deal_table is None:
+        deal_table = DealTable(game)
+        _deal_tables[key] = deal_table
+    return deal_table
@@ -0,0 +1,271 @@
+import os
+import sys
+import random
+import asyncio
+import subprocess
+
+import acpc_python_client as acpc
+
+from tools.hand_evaluation import get_utility
+from tools.match_state import BettingState, State, ACTION_CHARS
+
+
+"""Python implementation of ACPC dealer.
+
+Dealer speaks ACPC text protocol with agents over localhost sockets and writes
+log files in the same format as the dealer from ACPC infrastructure.
+Many matches can run concurrently from one process.
+
+!!! Only limit betting games are supported !!!
+
+Usage:
+python dealer.py {match_name} {game_file_path} {num_hands} {seed} {player_1_name} {player_1_script} ...
+
+  Arguments are the same as the arguments of play_match.pl from ACPC infrastructure.
+  Log is written into {match_name}.log and final scores are printed to stdout.
+"""
+
+
+PROTOCOL_VERSION_PREFIX = 'VERSION:2.'
+
+
+class _Hand(BettingState):
+    """State of a hand being dealt. Players in this class are indexed by seats."""
+
+    def __init__(self, game, deck, rng):
+        super().__init__(game)
+        num_players = game.get_num_players()
+        num_hole_cards = game.get_num_hole_cards()
+
+        cards = list(deck)
+        rng.shuffle(cards)
+        self.hole_cards = [cards[p * num_hole_cards:(p + 1) * num_hole_cards] for p in range(num_players)]
+        total_num_board_cards = game.get_total_num_board_cards(game.get_num_rounds() - 1)
+        board_start = num_players * num_hole_cards
+        self.board_cards = cards[board_start:board_start + total_num_board_cards]
+
+    def get_state(self):
+        visible_board_cards = self.board_cards[:self.game.get_total_num_board_cards(self._get_round())]
+        return State(
+            [list(actions) for actions in self.round_actions],
+            self.hole_cards,
+            visible_board_cards,
+            list(self.players_folded))
+
+    def get_visible_players(self, seat):
+        """Return seats whose hole cards are shown to the player in given seat."""
+        if self.finished and sum(self.players_folded) == 0:
+            return list(range(self.game.get_num_players()))
+        return [seat]
+
+    def get_utilities(self):
+        state = self.get_state()
+        return get_utility(
+            self.hole_cards,
+            state.board_cards,
+            self.players_folded,
+            self.pot_commitment)
+
+
+def _format_value(value):
+    return '%g' % value
+
+
+class _PlayerConnection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, message):
+        self.writer.write(('%s\r\n' % message).encode('utf-8'))
+        await self.writer.drain()
+
+    async def read_line(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError('Player disconnected')
+            line = line.decode('utf-8').strip()
+            # Lines starting with # or ; are comments in ACPC protocol
+            if line and not line.startswith('#') and not line.startswith(';'):
+                return line
+
+    def close(self):
+        self.writer.close()
+
+
+async def _connect_player(host, player_script_path, on_port=None, stderr=None, timeout=None):
+    connection_future = asyncio.get_running_loop().create_future()
+
+    def on_connect(reader, writer):
+        if connection_future.done():
+            writer.close()
+        else:
+            connection_future.set_result(_PlayerConnection(reader, writer))
+
+    server = await asyncio.start_server(on_connect, host, 0)
+    port = server.sockets[0].getsockname()[1]
+    process = None
+    try:
+        if on_port is not None:
+            on_port(port)
+        if player_script_path is not None:
+            process = await asyncio.create_subprocess_exec(
+                player_script_path, host, str(port),
+                stdout=subprocess.DEVNULL,
+                stderr=stderr)
+        connection = await asyncio.wait_for(connection_future, timeout)
+    finally:
+        server.close()
+
+    version_line = await asyncio.wait_for(connection.read_line(), timeout)
+    if not version_line.startswith(PROTOCOL_VERSION_PREFIX):
+        connection.close()
+        raise ConnectionError('Unsupported protocol version %s' % version_line)
+    return connection, process
+
+
+async def play_match_async(
+        match_name,
+        game_file_path,
+        num_hands,
+        seed,
+        players,
+        host='localhost',
+        timeout=None,
+        on_port=None):
+    """Play match between agents and write its log to {match_name}.log.
+
+    Args:
+        match_name (str): Path prefix of the match log file.
+        game_file_path (str): Path to ACPC game definition file.
+        num_hands (int): Number of hands in the match.
+        seed (int): Seed of the card shuffling.
+        players (list(tuple(str, str))): Name and agent script path of each player. Agent script
+                                         is executed with dealer host and port as arguments. When
+                                         the script path is None the agent must connect on its own.
+        host (str): Host on which the dealer listens.
+        timeout (float): Maximal time in seconds to wait for each agent's connection and response.
+        on_port (callable): Called with player index and port when the player's port is opened.
+
+    Returns:
+        tuple(list(float), list(str)): Final scores of players and their names.
+    """
+    game = acpc.read_game_file(game_file_path)
+    if game.get_betting_type() != acpc.BettingType.LIMIT:
+        raise AttributeError('Only limit betting games are supported')
+    num_players = game.get_num_players()
+    if len(players) != num_players:
+        raise AttributeError('Wrong number of players')
+    player_names = [player[0] for player in players]
+
+    match_directory = os.path.dirname(match_name)
+    if match_directory and not os.path.exists(match_directory):
+        os.makedirs(match_directory)
+
+    connections = []
+    processes = []
+    with open('%s.err' % match_name, 'w') as err_file:
+        try:
+            for i, (_, player_script_path) in enumerate(players):
+                connection, process = await _connect_player(
+                    host,
+                    player_script_path,
+                    None if on_port is None else lambda port, i=i: on_port(i, port),
+                    err_file,
+                    timeout)
+                connections.append(connection)
+                if process is not None:
+                    processes.append(process)
+
+            scores = [0] * num_players
+            deck = acpc.game_utils.generate_deck(game)
+            rng = random.Random(seed)
+            with open('%s.log' % match_name, 'w') as log_file:
+                log_file.write('# name/game/hands/seed %s %s %s %s\n' % (match_name, game_file_path, num_hands, seed))
+                for hand_index in range(num_hands):
+                    # Players rotate seats after each hand
+                    seat_players = [(seat + hand_index) % num_players for seat in range(num_players)]
+                    hand = _Hand(game, deck, rng)
+                    while True:
+                        state = hand.get_state()
+                        betting_string = state.get_betting_string()
+                        for seat, player in enumerate(seat_players):
+                            await connections[player].send('MATCHSTATE:%s:%s:%s:%s' % (
+                                seat,
+                                hand_index,
+                                betting_string,
+                                state.get_cards_string(game, hand.get_visible_players(seat))))
+                        if hand.finished:
+                            break
+                        response = await asyncio.wait_for(
+                            connections[seat_players[hand.current_player]].read_line(), timeout)
+                        action_string = response.rsplit(':', 1)[-1][:1]
+                        action = ACTION_CHARS.index(action_string) if action_string in ACTION_CHARS else 1
+                        hand.apply_action(hand.get_valid_action(action))
+
+                    utilities = hand.get_utilities()
+                    for seat, player in enumerate(seat_players):
+                        scores[player] += utilities[seat]
+                    log_file.write('STATE:%s:%s:%s:%s:%s\n' % (
+                        hand_index,
+                        hand.get_state().get_betting_string(),
+                        hand.get_state().get_cards_string(game),
+                        '|'.join([_format_value(u) for u in utilities]),
+                        '|'.join([player_names[player] for player in seat_players])))
+                log_file.write('SCORE:%s:%s\n' % (
+                    '|'.join([_format_value(score) for score in scores]),
+                    '|'.join(player_names)))
+        finally:
+            for connection in connections:
+                connection.close()
+            for process in processes:
+                try:
+                    await asyncio.wait_for(process.wait(), timeout)
+                except asyncio.TimeoutError:
+                    process.kill()
+
+    return scores, player_names
+
+
+async def play_matches_async(matches, max_concurrent_matches=None, **kwargs):
+    """Play multiple matches concurrently.
+
+    Args:
+        matches (list(tuple)): Arguments (match_name, game_file_path, num_hands, seed, players) of each match.
+        max_concurrent_matches (int): Maximal number of matches running at the same time. Unlimited if None.
+        kwargs: Additional arguments of play_match_async.
+
+    Returns:
+        list(tuple(list(float), list(str))): Results of the matches in the same order as the matches.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent_matches) if max_concurrent_matches else None
+
+    async def play(match):
+        if semaphore is None:
+            return await play_match_async(*match, **kwargs)
+        async with semaphore:
+            return await play_match_async(*match, **kwargs)
+
+    return await asyncio.gather(*[play(match) for match in matches])
+
+
+def play_match(*args, **kwargs):
+    """Blocking version of play_match_async."""
+    return asyncio.run(play_match_async(*args, **kwargs))
+
+
+def play_matches(*args, **kwargs):
+    """Blocking version of play_matches_async."""
+    return asyncio.run(play_matches_async(*args, **kwargs))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 7 or (len(sys.argv) - 5) % 2 != 0:
+        print("Usage {match_name} {game_file_path} {num_hands} {seed} *[{player_name} {player_script}]")
+        sys.exit(1)
+
+    player_arguments = sys.argv[5:]
+    players = [(player_arguments[i], player_arguments[i + 1]) for i in range(0, len(player_arguments), 2)]
+    scores, player_names = play_match(sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), players)
+    print('SCORE:%s:%s' % ('|'.join([_format_value(score) for score in scores]), '|'.join(player_names)))
@@ -18,6 +18,7 @@ class GameTreeBuilder:
             self.players_folded = [False] * game.get_num_players()
             self.pot_commitment = [game.get_blind(p) for p in range(game.get_num_players())]
             self.deck = deck
+            self.card_groups = ()
 
             # Round properties
             self.rounds_left = game.get_num_rounds()
@@ -39,9 +40,21 @@ class GameTreeBuilder:
             res.players_acted += 1
             return res
 
-    def __init__(self, game, node_provider=NodeProvider()):
+    def __init__(self, game, node_provider=NodeProvider(), suit_isomorphism=None, card_abstraction=None):
+        """Create the builder.
+
+        Args:
+            game (Game): ACPC game definition object.
+            node_provider (NodeProvider): Creates nodes of the tree.
+            suit_isomorphism (SuitIsomorphism): When provided, only deals which are canonical
+                                                under the isomorphism are put into the tree.
+            card_abstraction (CardAbstraction): When provided, cards nodes have one child
+                                                for each bucket of the round instead of each deal.
+        """
         self.game = game
         self.node_provider = node_provider
+        self.suit_isomorphism = suit_isomorphism
+        self.card_abstraction = card_abstraction
 
     def build_tree(self):
         """Builds and returns the game tree."""
@@ -50,13 +63,20 @@ class GameTreeBuilder:
         # First generate hole cards node which is only generated once at the beginning of the game
         root = self.node_provider.create_hole_cards_node(None, self.game.get_num_hole_cards())
         num_hole_cards = self.game.get_num_hole_cards()
+        if self.card_abstraction:
+            for bucket_key in self.card_abstraction.get_bucket_keys(0):
+                self._generate_board_cards_node(root, bucket_key, GameTreeBuilder.GameState(self.game, deck))
+            return root
         hole_card_combinations = itertools.combinations(range(len(deck)), num_hole_cards)
         for hole_cards_indexes in hole_card_combinations:
             hole_cards = tuple(sorted(map(lambda i: deck[i], hole_cards_indexes)))
+            if self.suit_isomorphism and not self.suit_isomorphism.is_canonical((hole_cards,)):
+                continue
             next_deck = list(deck)
             for hole_card_index in reversed(hole_cards_indexes):
                 del next_deck[hole_card_index]
             game_state = GameTreeBuilder.GameState(self.game, next_deck)
+            game_state.card_groups = (hole_cards,)
             # Start first game round with board cards node
             self._generate_board_cards_node(root, hole_cards, game_state)
         return root
@@ -71,14 +91,23 @@ class GameTreeBuilder:
             new_node = self.node_provider.create_board_cards_node(parent, num_board_cards)
             parent.children[child_key] = new_node
 
+            if self.card_abstraction:
+                for bucket_key in self.card_abstraction.get_bucket_keys(round_index):
+                    self._generate_action_node(new_node, bucket_key, copy.deepcopy(game_state))
+                return
+
             deck = game_state.deck
             board_card_combinations = itertools.combinations(range(len(deck)), num_board_cards)
 
             for board_cards_idxs in board_card_combinations:
+                board_cards = tuple(map(lambda i: deck[i], board_cards_idxs))
+                card_groups = game_state.card_groups + (tuple(sorted(board_cards)),)
+                if self.suit_isomorphism and not self.suit_isomorphism.is_canonical(card_groups):
+                    continue
                 next_game_state = copy.deepcopy(game_state)
                 for board_card_index in board_cards_idxs:
                     del next_game_state.deck[board_card_index]
-                board_cards = tuple(map(lambda i: deck[i], board_cards_idxs))
+                next_game_state.card_groups = card_groups
                 self._generate_action_node(new_node, board_cards, next_game_state)
 
     @staticmethod
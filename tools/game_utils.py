@@ -1,7 +1,5 @@
-from math import isclose
+from math import isclose, comb, perm
 import numpy as np
-import scipy.misc
-import scipy.special
 
 from tools.walk_trees import walk_trees
 from tools.game_tree.nodes import ActionNode
@@ -12,8 +10,7 @@ def get_num_hole_card_combinations(game):
     num_hole_cards = game.get_num_hole_cards()
     num_cards = game.get_num_suits() * game.get_num_ranks()
     num_total_hole_cards = num_players * num_hole_cards
-    return scipy.misc.comb(num_cards, num_total_hole_cards, exact=True) \
-        * scipy.special.perm(num_total_hole_cards, num_total_hole_cards, exact=True)
+    return comb(num_cards, num_total_hole_cards) * perm(num_total_hole_cards, num_total_hole_cards)
 
 
 def is_correct_strategy(strategy_tree):
@@ -0,0 +1,132 @@
+from tools.agent_utils import convert_action_to_int
+from tools.match_state import BettingState, ACTION_CHARS
+
+
+class InfoSetTracker:
+    """Info set of one player maintained incrementally as the hand advances.
+
+    Each new action and board cards are appended to the info set key instead of
+    building the whole key again on each turn. Key has the format of keys in strategy files,
+    e.g. "42:cc:43:r", and cards dealt in one round are sorted the same way as in game trees.
+    When card abstraction is used, cards are replaced by their buckets, e.g. "b2:cc:b0:r".
+    """
+
+    def __init__(self, info_set_ids=None, card_abstraction=None):
+        """Create the tracker.
+
+        Args:
+            info_set_ids (dict): Integer id by info set key, e.g. info_set_ids of StoredStrategy.
+                                 Required only by get_info_set_id.
+            card_abstraction (CardAbstraction): Abstraction of the tracked strategy.
+        """
+        self.info_set_ids = info_set_ids
+        self.card_abstraction = card_abstraction
+        self.reset()
+
+    def reset(self):
+        """Start tracking new hand."""
+        self.info_set = ''
+        self.info_set_id = None
+        self.round_index = 0
+        self.num_actions = 0
+        self.num_board_cards = 0
+        self.hole_cards = []
+        self.board_cards = []
+
+    def _get_cards_key(self, cards):
+        if self.card_abstraction:
+            return self.card_abstraction.get_bucket_key(self.hole_cards, self.board_cards)
+        return sorted(cards)
+
+    def add_hole_cards(self, cards):
+        self.hole_cards = list(cards)
+        self.info_set = '%s:' % ':'.join([str(card) for card in self._get_cards_key(cards)])
+        self.info_set_id = None
+
+    def add_board_cards(self, cards):
+        self.board_cards += cards
+        self.info_set += ':%s:' % ':'.join([str(card) for card in self._get_cards_key(cards)])
+        self.info_set_id = None
+
+    def add_action(self, action):
+        self.info_set += ACTION_CHARS[action]
+        self.info_set_id = None
+
+    def update(self, game, match_state):
+        """Read hole cards, board cards and actions revealed since the last update from the match state.
+
+        Args:
+            game (Game): ACPC game definition object.
+            match_state (MatchState): ACPC wrapper match state or tools.match_state.MatchState.
+
+        Returns:
+            str: Current info set key.
+        """
+        state = match_state.get_state()
+        if not self.info_set:
+            viewing_player = match_state.get_viewing_player()
+            self.add_hole_cards([state.get_hole_card(viewing_player, i) for i in range(game.get_num_hole_cards())])
+
+        current_round = state.get_round()
+        while True:
+            new_num_board_cards = game.get_total_num_board_cards(self.round_index)
+            if new_num_board_cards > self.num_board_cards:
+                self.add_board_cards([state.get_board_card(i) for i in range(self.num_board_cards, new_num_board_cards)])
+                self.num_board_cards = new_num_board_cards
+
+            num_actions = state.get_num_actions(self.round_index)
+            for action_index in range(self.num_actions, num_actions):
+                self.add_action(convert_action_to_int(state.get_action_type(self.round_index, action_index)))
+            self.num_actions = num_actions
+
+            if self.round_index >= current_round:
+                break
+            self.round_index += 1
+            self.num_actions = 0
+        return self.info_set
+
+    def get_info_set(self):
+        return self.info_set
+
+    def get_info_set_id(self):
+        """Return integer id of the current info set, the lookup is done only once for each info set."""
+        if self.info_set_id is None:
+            self.info_set_id = self.info_set_ids[self.info_set]
+        return self.info_set_id
+
+
+def get_hand_decisions(game, state):
+    """Replay the hand and return each decision made in it.
+
+    Args:
+        game (Game): ACPC game definition object, only limit betting games are supported.
+        state (State): ACPC wrapper state or tools.match_state.State of a finished hand.
+
+    Returns:
+        list(tuple(int, str, int)): Acting player, info set of the acting player and the taken action of each decision.
+    """
+    num_players = game.get_num_players()
+    num_hole_cards = game.get_num_hole_cards()
+    trackers = [InfoSetTracker() for _ in range(num_players)]
+    for p, tracker in enumerate(trackers):
+        tracker.add_hole_cards([state.get_hole_card(p, c) for c in range(num_hole_cards)])
+
+    betting_state = BettingState(game)
+    decisions = []
+    num_board_cards = 0
+    for round_index in range(state.get_round() + 1):
+        new_num_board_cards = game.get_total_num_board_cards(round_index)
+        if new_num_board_cards > num_board_cards:
+            board_cards = [state.get_board_card(i) for i in range(num_board_cards, new_num_board_cards)]
+            for tracker in trackers:
+                tracker.add_board_cards(board_cards)
+            num_board_cards = new_num_board_cards
+
+        for action_index in range(state.get_num_actions(round_index)):
+            action = convert_action_to_int(state.get_action_type(round_index, action_index))
+            player = betting_state.current_player
+            decisions.append((player, trackers[player].get_info_set(), action))
+            for tracker in trackers:
+                tracker.add_action(action)
+            betting_state.apply_action(action)
+    return decisions
@@ -1,4 +1,5 @@
 import os
+import hashlib
 import numpy as np
 
 import acpc_python_client as acpc
@@ -18,18 +19,23 @@ def _action_to_str(action):
         return 'r'
 
 
-def get_strategy(tree, callback, prefix=''):
+def walk_action_nodes(tree, callback, prefix=''):
+    """Call callback with info set key and node for each action node of the tree."""
     if isinstance(tree, HoleCardsNode) or isinstance(tree, BoardCardsNode):
         for key, child_node in tree.children.items():
             new_prefix = prefix
             if new_prefix and not new_prefix.endswith(':'):
                 new_prefix += ':'
             new_prefix += ':'.join([str(card) for card in key]) + ':'
-            get_strategy(child_node, callback, new_prefix)
+            walk_action_nodes(child_node, callback, new_prefix)
     elif isinstance(tree, ActionNode):
-        callback((prefix, tree.strategy))
+        callback(prefix, tree)
         for action, child_node in tree.children.items():
-            get_strategy(child_node, callback, prefix + _action_to_str(action))
+            walk_action_nodes(child_node, callback, prefix + _action_to_str(action))
+
+
+def get_strategy(tree, callback, prefix=''):
+    walk_action_nodes(tree, lambda info_set, node: callback((info_set, node.strategy)), prefix)
 
 
 def get_strategy_lines(tree):
@@ -84,6 +90,14 @@ def read_strategy_from_file(game, strategy_file_path):
     walk_trees(on_node, strategy_tree)
     return strategy_tree, strategy
 
+def get_file_hash(file_path):
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
 def get_new_path(path_base, path_suffix='', overwrite_base_path=False):
     new_path = path_base + path_suffix
     if overwrite_base_path:
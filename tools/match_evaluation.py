@@ -20,7 +20,28 @@ def get_player_utilities_from_log_file(
         game_file_path=None,
         utility_estimator=None,
         player_strategies=None,
-        evaluated_strategies=None):
+        evaluated_strategies=None,
+        estimates_cache=None):
+    """Read utilities of players in each hand of the match log.
+
+    When utility estimator is provided, utilities of players present in player_strategies
+    are replaced by estimates of the estimator. Estimates depend only on the hand
+    and position and strategy of the player, so each distinct hand is evaluated only once.
+
+    Args:
+        log_file_path (str): Path to the log file.
+        game_file_path (str): Path to the game definition file. Required with utility estimator.
+        utility_estimator: Utility estimator used to estimate players' utilities.
+        player_strategies (dict): Strategy trees of players by their names.
+        evaluated_strategies (list(object)): Strategies evaluated by the estimator.
+                                             Player's strategy is evaluated if None.
+        estimates_cache (dict): Estimates reused across calls. Calls sharing the cache
+                                must use the same estimator and strategies.
+
+    Returns:
+        tuple(np.array, list(str)): Utilities with shape (num_hands, num_players, num_evaluated_strategies)
+                                    and names of players in the order of the utilities.
+    """
     player_names = None
     num_hands = 0
 
@@ -37,6 +58,8 @@ def get_player_utilities_from_log_file(
     if not player_names:
         raise AttributeError('Log file does not contain SCORE line')
 
+    if estimates_cache is None:
+        estimates_cache = {}
     num_evaluated_strategies = 1 if evaluated_strategies is None else len(evaluated_strategies)
     player_utilities = np.zeros([num_hands, len(player_names), num_evaluated_strategies])
 
@@ -48,14 +71,17 @@ def get_player_utilities_from_log_file(
                 scores = [float(score) for score in line_segments[-2].split('|')]
                 players = line_segments[-1].split('|')
                 state = None
-                if utility_estimator is not None:
-                    state = acpc.parse_state(game_file_path, line)
                 for i, player_name in enumerate(players):
                     player_index = player_names.index(player_name)
                     if utility_estimator is not None and player_name in player_strategies:
-                        player_strategy = player_strategies[player_name]
-                        utility_estimates = utility_estimator.get_utility_estimations(state, i, player_strategy, evaluated_strategies)
-                        player_utilities[hand_index, player_index] = utility_estimates
+                        estimate_key = (player_name, i, line_segments[2], line_segments[3])
+                        if estimate_key not in estimates_cache:
+                            if state is None:
+                                state = acpc.parse_state(game_file_path, line)
+                            player_strategy = player_strategies[player_name]
+                            estimates_cache[estimate_key] = utility_estimator.get_utility_estimations(
+                                state, i, player_strategy, evaluated_strategies)
+                        player_utilities[hand_index, player_index] = estimates_cache[estimate_key]
                     else:
                         player_utilities[hand_index, player_index] = scores[i]
 
@@ -108,3 +134,84 @@ def calculate_confidence_interval(data, confidence):
     upper_bounds = means + interval_half_size
 
     return means, interval_half_size, lower_bounds, upper_bounds
+
+
+class UtilityAccumulator:
+    """Streaming version of get_logs_data and calculate_confidence_interval.
+
+    Keeps only number of hands and running mean and sum of squared differences
+    from the mean of utilities of each player and evaluated strategy,
+    so memory does not grow with number of evaluated hands.
+    Players are ordered by their names the same way as in get_logs_data.
+    """
+
+    def __init__(self):
+        self.player_names = None
+        self.count = 0
+        self.means = None
+        self.m2 = None
+
+    def _get_player_order(self, player_names):
+        if self.player_names is None:
+            self.player_names = list(sorted(player_names))
+        elif list(sorted(player_names)) != self.player_names:
+            raise AttributeError('Utilities must contain same set of players')
+        return [player_names.index(player_name) for player_name in self.player_names]
+
+    def _add(self, count, means, m2):
+        if self.count == 0:
+            self.count = count
+            self.means = np.array(means, dtype=float)
+            self.m2 = np.array(m2, dtype=float)
+            return
+        if means.shape != self.means.shape:
+            raise AttributeError('Utilities must contain same number of players and evaluated strategies')
+
+        # Parallel variant of Welford's algorithm by Chan et al.
+        total_count = self.count + count
+        delta = means - self.means
+        self.means = self.means + delta * (count / total_count)
+        self.m2 = self.m2 + m2 + (delta ** 2) * (self.count * count / total_count)
+        self.count = total_count
+
+    def add_hand(self, utilities, player_names):
+        """Add utilities of single hand.
+
+        Args:
+            utilities (np.array): Utilities of the hand with shape (num_players, num_evaluated_strategies).
+            player_names (list(str)): Names of the players in the order of utilities.
+        """
+        player_order = self._get_player_order(player_names)
+        utilities = np.array(utilities, dtype=float)[player_order]
+        self._add(1, utilities, np.zeros(utilities.shape))
+
+    def add_log_reading(self, log_reading):
+        """Add all hands from result of get_player_utilities_from_log_file."""
+        utilities, player_names = log_reading
+        if utilities.shape[0] == 0:
+            return
+        utilities = utilities[:, self._get_player_order(player_names)]
+        means = np.mean(utilities, axis=0)
+        self._add(utilities.shape[0], means, np.sum((utilities - means) ** 2, axis=0))
+
+    def merge(self, other):
+        """Add all hands accumulated by other accumulator."""
+        if other.count == 0:
+            return
+        player_order = self._get_player_order(other.player_names)
+        self._add(other.count, other.means[player_order], other.m2[player_order])
+
+    def get_confidence_interval(self, confidence):
+        """Return the same values as calculate_confidence_interval on all added hands."""
+        if self.count == 0:
+            raise AttributeError('No utilities were added')
+        standard_error = np.sqrt(self.m2 / self.count) / np.sqrt(self.count)
+
+        alpha = 1 - confidence
+        phi = 1 - (alpha / 2)
+        z = norm.ppf(phi)
+        interval_half_size = z * standard_error
+        lower_bounds = self.means - interval_half_size
+        upper_bounds = self.means + interval_half_size
+
+        return self.means, interval_half_size, lower_bounds, upper_bounds
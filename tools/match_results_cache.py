@@ -0,0 +1,115 @@
+import os
+import re
+import shutil
+import hashlib
+import tempfile
+
+from tools.io_util import get_file_hash
+
+
+SCRIPT_DIR_FILE_PATTERN = re.compile(r'\$\{SCRIPT_DIR\}/([^"\'\s]+)')
+
+
+def get_agent_fingerprint(agent_script_path, strategy_file_paths=None):
+    """Return hash identifying behavior of the agent.
+
+    Hash covers the agent script, files referenced in the script
+    relative to its directory as ${SCRIPT_DIR}/{file} and provided strategy files.
+
+    Args:
+        agent_script_path (str): Path to the agent script.
+        strategy_file_paths (list(str)): Paths to additional strategy files used by the agent.
+
+    Returns:
+        str: Hex digest of the agent's files.
+    """
+    agent_script_dir = os.path.dirname(os.path.abspath(agent_script_path))
+    with open(agent_script_path, 'r') as agent_script_file:
+        referenced_files = SCRIPT_DIR_FILE_PATTERN.findall(agent_script_file.read())
+    referenced_file_paths = [
+        '%s/%s' % (agent_script_dir, file_name)
+        for file_name in referenced_files
+        if os.path.isfile('%s/%s' % (agent_script_dir, file_name))]
+
+    file_hashes = [get_file_hash(agent_script_path)]
+    file_hashes += [get_file_hash(file_path) for file_path in sorted(set(referenced_file_paths))]
+    if strategy_file_paths:
+        file_hashes += [get_file_hash(file_path) for file_path in strategy_file_paths]
+    return hashlib.sha256(':'.join(file_hashes).encode('utf-8')).hexdigest()
+
+
+def is_complete_log_file(log_file_path, num_hands):
+    """Return whether the match log contains all hands of the match and the final score.
+
+    Log of a match in which the dealer or an agent failed is truncated or misses the SCORE line
+    and must not be stored in the cache.
+
+    Args:
+        log_file_path (str): Path to the log file.
+        num_hands (int): Number of hands in the match.
+
+    Returns:
+        bool: True if the log is complete.
+    """
+    if not os.path.exists(log_file_path):
+        return False
+    num_logged_hands = 0
+    with open(log_file_path, 'r') as log_file:
+        for line in log_file:
+            if line.startswith('STATE'):
+                num_logged_hands += 1
+            elif line.startswith('SCORE'):
+                return num_logged_hands == num_hands
+    return False
+
+
+class MatchResultsCache:
+    """Content addressed store of match logs.
+
+    Logs are stored under a key derived from everything that determines the match
+    so that matches which were already played can be reused instead of played again.
+    """
+
+    def __init__(self, cache_directory):
+        self.cache_directory = cache_directory
+        if not os.path.exists(cache_directory):
+            os.makedirs(cache_directory)
+
+    def get_match_key(self, game_file_path, num_hands, seed, players, dealer_name):
+        """Return key of the match.
+
+        Args:
+            game_file_path (str): Path to the game definition file.
+            num_hands (int): Number of hands in the match.
+            seed (int): Seed of the match.
+            players (list(tuple(str, str))): Name and fingerprint of each player in seat order.
+            dealer_name (str): Identifier of the dealer, different dealers deal different cards for the same seed.
+
+        Returns:
+            str: Hex digest identifying the match.
+        """
+        key_parts = [dealer_name, get_file_hash(game_file_path), str(num_hands), str(seed)]
+        for player_name, player_fingerprint in players:
+            key_parts += [player_name, player_fingerprint]
+        return hashlib.sha256('\n'.join(key_parts).encode('utf-8')).hexdigest()
+
+    def _get_log_file_path(self, key):
+        return '%s/%s/%s.log' % (self.cache_directory, key[:2], key)
+
+    def get_log_file_path(self, key):
+        """Return path to the cached log of the match or None if the match is not cached."""
+        log_file_path = self._get_log_file_path(key)
+        return log_file_path if os.path.exists(log_file_path) else None
+
+    def add_log_file(self, key, log_file_path):
+        """Store copy of the match log under the key."""
+        cache_log_file_path = self._get_log_file_path(key)
+        cache_log_directory = os.path.dirname(cache_log_file_path)
+        if not os.path.exists(cache_log_directory):
+            os.makedirs(cache_log_directory, exist_ok=True)
+        # Copy is moved to its place at once so that interrupted write never leaves partial log in the cache
+        file_descriptor, tmp_file_path = tempfile.mkstemp(dir=cache_log_directory)
+        os.close(file_descriptor)
+        shutil.copyfile(log_file_path, tmp_file_path)
+        os.replace(tmp_file_path, cache_log_file_path)
+        return cache_log_file_path
@@ -0,0 +1,232 @@
+import acpc_python_client as acpc
+
+from tools.agent_utils import ACTIONS, convert_action_to_int
+
+
+RANK_CHARS = '23456789TJQKA'
+SUIT_CHARS = 'cdhs'
+ACTION_CHARS = 'fcr'
+
+
+def card_to_str(card):
+    """Return ACPC string representation of a card, e.g. "Ks"."""
+    return RANK_CHARS[acpc.game_utils.card_rank(card)] + SUIT_CHARS[acpc.game_utils.card_suit(card)]
+
+
+def get_cards_by_str(game):
+    """Return dictionary mapping ACPC string representation of each card in the game's deck to the card."""
+    return {card_to_str(card): card for card in acpc.game_utils.generate_deck(game)}
+
+
+class BettingState:
+    """Betting of a limit hand in progress.
+
+    Tracks pot commitment of players, folded players and the player who acts next
+    as actions are applied. Players in this class are indexed by seats.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        num_players = game.get_num_players()
+        self.round_actions = [[]]
+        self.players_folded = [False] * num_players
+        self.pot_commitment = [game.get_blind(p) for p in range(num_players)]
+        self.round_raise_count = 0
+        self.players_acted = 0
+        self.current_player = game.get_first_player(0)
+        self.finished = False
+
+    def _get_round(self):
+        return len(self.round_actions) - 1
+
+    def _bets_settled(self):
+        non_folded_bets = [bet for p, bet in enumerate(self.pot_commitment) if not self.players_folded[p]]
+        return non_folded_bets.count(non_folded_bets[0]) == len(non_folded_bets)
+
+    def get_valid_action(self, action):
+        """Return the action if it is valid in current state, otherwise call which is always valid."""
+        if action == 0 and self._bets_settled():
+            return 1
+        if action == 2 and self.round_raise_count >= self.game.get_max_raises(self._get_round()):
+            return 1
+        return action
+
+    def apply_action(self, action):
+        round_index = self._get_round()
+        num_players = self.game.get_num_players()
+        max_pot_commitment = max(self.pot_commitment)
+        if action == 0:
+            self.players_folded[self.current_player] = True
+        elif action == 1:
+            self.pot_commitment[self.current_player] = max_pot_commitment
+        else:
+            self.round_raise_count += 1
+            self.pot_commitment[self.current_player] = max_pot_commitment + self.game.get_raise_size(round_index)
+        self.round_actions[round_index].append(action)
+        self.players_acted += 1
+
+        if sum(self.players_folded) >= num_players - 1:
+            self.finished = True
+            return
+
+        if self._bets_settled() and self.players_acted >= num_players - sum(self.players_folded):
+            if round_index + 1 >= self.game.get_num_rounds():
+                self.finished = True
+                return
+            self.round_actions.append([])
+            self.round_raise_count = 0
+            self.players_acted = 0
+            self.current_player = self.game.get_first_player(round_index + 1)
+        else:
+            self.current_player = (self.current_player + 1) % num_players
+        while self.players_folded[self.current_player]:
+            self.current_player = (self.current_player + 1) % num_players
+
+
+class State:
+    """Pure Python copy of ACPC game state.
+
+    Provides the same getters as the state object of ACPC python wrapper
+    which are used in this repository, so it can be used in its place.
+    Unlike the wrapper state it can be stored after the match moved on
+    and passed between threads or processes.
+    """
+
+    def __init__(self, round_actions, hole_cards, board_cards, players_folded):
+        self.round_actions = round_actions
+        self.hole_cards = hole_cards
+        self.board_cards = board_cards
+        self.players_folded = players_folded
+
+    @staticmethod
+    def from_acpc_state(game, state):
+        """Create copy of ACPC wrapper state object.
+
+        Args:
+            game (Game): ACPC game definition object.
+            state (State): ACPC wrapper state object.
+
+        Returns:
+            State: Copy of the state.
+        """
+        num_players = game.get_num_players()
+        num_rounds = state.get_round() + 1
+        round_actions = [
+            [convert_action_to_int(state.get_action_type(round_index, action_index))
+             for action_index in range(state.get_num_actions(round_index))]
+            for round_index in range(num_rounds)]
+        hole_cards = [
+            [state.get_hole_card(p, c) for c in range(game.get_num_hole_cards())]
+            for p in range(num_players)]
+        board_cards = [
+            state.get_board_card(c)
+            for c in range(game.get_total_num_board_cards(num_rounds - 1))]
+        players_folded = [state.get_player_folded(p) for p in range(num_players)]
+        return State(round_actions, hole_cards, board_cards, players_folded)
+
+    def get_round(self):
+        return len(self.round_actions) - 1
+
+    def get_num_actions(self, round_index):
+        return len(self.round_actions[round_index])
+
+    def get_action_type(self, round_index, action_index):
+        return ACTIONS[self.round_actions[round_index][action_index]]
+
+    def get_hole_card(self, player, card_index):
+        return self.hole_cards[player][card_index]
+
+    def get_board_card(self, card_index):
+        return self.board_cards[card_index]
+
+    def get_player_folded(self, player):
+        return self.players_folded[player]
+
+    def get_betting_string(self):
+        """Return betting part of ACPC match state string, e.g. "rc/cr"."""
+        return '/'.join([
+            ''.join([ACTION_CHARS[action] for action in actions])
+            for actions in self.round_actions])
+
+    def get_cards_string(self, game, visible_players=None):
+        """Return cards part of ACPC match state string, e.g. "Ks|/Ah".
+
+        Args:
+            game (Game): ACPC game definition object.
+            visible_players (list(int)): Players whose hole cards are shown. Cards of all players are shown if None.
+
+        Returns:
+            string: Hole cards of players separated by "|" followed by board cards of each round separated by "/".
+        """
+        num_players = len(self.hole_cards)
+        if visible_players is None:
+            visible_players = range(num_players)
+        cards_string = '|'.join([
+            ''.join([card_to_str(card) for card in self.hole_cards[p]]) if p in visible_players else ''
+            for p in range(num_players)])
+        for round_index in range(1, self.get_round() + 1):
+            start = game.get_total_num_board_cards(round_index - 1)
+            end = game.get_total_num_board_cards(round_index)
+            cards_string += '/' + ''.join([card_to_str(card) for card in self.board_cards[start:end]])
+        return cards_string
+
+
+class MatchState:
+    """Pure Python counterpart of ACPC wrapper match state.
+
+    Provides get_state and get_viewing_player getters of the wrapper match state
+    so it can be passed to agents in its place.
+    """
+
+    def __init__(self, viewing_player, hand_number, state, acting_player):
+        self.viewing_player = viewing_player
+        self.hand_number = hand_number
+        self.state = state
+        self.acting_player = acting_player
+
+    @staticmethod
+    def parse(game, match_state_string, cards_by_str):
+        """Parse match state message of ACPC protocol, e.g. "MATCHSTATE:0:12:rc/r:Ks|/Ah".
+
+        Only limit betting games are supported. Hole cards of players which are not shown are None.
+
+        Args:
+            game (Game): ACPC game definition object.
+            match_state_string (str): Match state message.
+            cards_by_str (dict): Cards by their string representation as returned by get_cards_by_str.
+
+        Returns:
+            MatchState: Parsed match state.
+        """
+        _, viewing_player, hand_number, betting_string, cards_string = match_state_string.split(':')[:5]
+
+        betting_state = BettingState(game)
+        for action_char in betting_string:
+            if action_char != '/':
+                betting_state.apply_action(ACTION_CHARS.index(action_char))
+
+        num_hole_cards = game.get_num_hole_cards()
+        players_cards_string, *rounds_cards_strings = cards_string.split('/')
+        hole_cards = []
+        for player_cards_string in players_cards_string.split('|'):
+            if player_cards_string:
+                hole_cards += [[cards_by_str[player_cards_string[i:i + 2]] for i in range(0, 2 * num_hole_cards, 2)]]
+            else:
+                hole_cards += [[None] * num_hole_cards]
+        board_cards = [
+            cards_by_str[round_cards_string[i:i + 2]]
+            for round_cards_string in rounds_cards_strings
+            for i in range(0, len(round_cards_string), 2)]
+
+        state = State(betting_state.round_actions, hole_cards, board_cards, betting_state.players_folded)
+        acting_player = None if betting_state.finished else betting_state.current_player
+        return MatchState(int(viewing_player), int(hand_number), state, acting_player)
+
+    def get_state(self):
+        return self.state
+
+    def get_viewing_player(self):
+        return self.viewing_player
+
+    def is_finished(self):
+        return self.acting_player is None
@@ -1,29 +1,47 @@
-import random
 import sys
 
 import acpc_python_client as acpc
 
-from tools.agent_utils import select_action, get_info_set
-from tools.io_util import read_strategy_from_file
+from tools.strategy_store import load_strategy
+from tools.info_set_tracker import InfoSetTracker
+from tools.action_sampler import ActionSampler
 
 
 class StrategyAgent(acpc.Agent):
     """Agent able to play any game when provided with game definition and correct strategy."""
 
-    def __init__(self, strategy_file_path):
+    def __init__(self, strategy_file_path, seed=None, card_abstraction=None):
+        """Create strategy agent.
+
+        Args:
+            strategy_file_path (str): Path to the strategy file.
+            seed: Seed of the actions sampling. Fresh entropy is used if None.
+            card_abstraction (CardAbstraction): Abstraction of the strategy when it was trained over buckets.
+        """
         super().__init__()
-        self.strategy = read_strategy_from_file(None, strategy_file_path)
+        self.strategy = load_strategy(strategy_file_path)
+        self.card_abstraction = card_abstraction
+        self.info_set_tracker = InfoSetTracker(self.strategy.info_set_ids, card_abstraction)
+        self.action_sampler = ActionSampler(
+            self.strategy.strategies, seed, cumulative_table=self.strategy.cumulative_table)
+
+    def __copy__(self):
+        """Return agent which shares the strategy with this agent and samples actions with fresh entropy."""
+        agent = object.__new__(type(self))
+        agent.__dict__.update(self.__dict__)
+        agent.info_set_tracker = InfoSetTracker(self.strategy.info_set_ids, self.card_abstraction)
+        agent.action_sampler = self.action_sampler.copy()
+        return agent
 
     def on_game_start(self, game):
-        pass
+        self.info_set_tracker.reset()
 
     def on_next_turn(self, game, match_state, is_acting_player):
         if not is_acting_player:
             return
 
-        info_set = get_info_set(game, match_state)
-        node_strategy = self.strategy[info_set]
-        selected_action = select_action(node_strategy)
+        self.info_set_tracker.update(game, match_state)
+        selected_action = self.action_sampler.sample_action(self.info_set_tracker.get_info_set_id())
         self.set_next_action(selected_action)
 
     def on_game_finished(self, game, match_state):
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import numpy as np
+
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.node_provider import StrategyTreeNodeProvider
+from tools.io_util import read_strategy_from_file, walk_action_nodes, get_file_hash
+from tools.action_sampler import get_cumulative_table
+
+
+DEFAULT_STORE_DIRECTORY = os.path.join(tempfile.gettempdir(), 'poker-agent-kit-strategy-store')
+
+
+class StoredStrategy:
+    """Read-only strategy backed by a memory-mapped array.
+
+    Can be used in place of the strategy dictionary returned by tools.io_util.read_strategy_from_file.
+    Probabilities of all info sets are rows of one array mapped from the store file,
+    so all processes using the same strategy share one copy of it in memory.
+    The same holds for cumulative_table used by tools.action_sampler.ActionSampler.
+    """
+
+    def __init__(self, info_set_ids, strategies, cumulative_table=None):
+        self.info_set_ids = info_set_ids
+        self.strategies = strategies
+        self.cumulative_table = cumulative_table
+
+    def __getitem__(self, info_set):
+        return self.strategies[self.info_set_ids[info_set]]
+
+    def __contains__(self, info_set):
+        return info_set in self.info_set_ids
+
+    def __len__(self):
+        return len(self.info_set_ids)
+
+    def __iter__(self):
+        return iter(self.info_set_ids)
+
+    def keys(self):
+        return self.info_set_ids.keys()
+
+    def items(self):
+        return ((info_set, self.strategies[info_set_id]) for info_set, info_set_id in self.info_set_ids.items())
+
+
+def _write_atomically(path, write):
+    file_descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(file_descriptor, 'wb') as file:
+        write(file)
+    os.replace(tmp_path, path)
+
+
+def load_strategy(strategy_file_path, store_directory=None):
+    """Load strategy file through the strategy store.
+
+    Strategy file is parsed only the first time it is loaded. Parsed probabilities and their
+    cumulative table for action sampling are saved into the store under the hash of the file
+    and memory-mapped by all later loads.
+
+    Args:
+        strategy_file_path (str): Path to the strategy file.
+        store_directory (str): Directory of the store. Shared temporary directory is used if None.
+
+    Returns:
+        StoredStrategy: Read-only strategy.
+    """
+    if store_directory is None:
+        store_directory = DEFAULT_STORE_DIRECTORY
+    os.makedirs(store_directory, exist_ok=True)
+
+    file_hash = get_file_hash(strategy_file_path)
+    info_sets_path = '%s/%s.keys' % (store_directory, file_hash)
+    strategies_path = '%s/%s.npy' % (store_directory, file_hash)
+    cumulative_table_path = '%s/%s.cumulative.npy' % (store_directory, file_hash)
+
+    # Array is written last so its existence means that the stored strategy is complete
+    if not os.path.exists(strategies_path):
+        strategy = read_strategy_from_file(None, strategy_file_path)
+        info_sets = sorted(strategy.keys())
+        _write_atomically(
+            info_sets_path,
+            lambda file: file.write(''.join(['%s\n' % info_set for info_set in info_sets]).encode('utf-8')))
+        _write_atomically(
+            strategies_path,
+            lambda file: np.save(file, np.array([strategy[info_set] for info_set in info_sets], dtype=float)))
+
+    strategies = np.load(strategies_path, mmap_mode='r')
+    if not os.path.exists(cumulative_table_path):
+        _write_atomically(cumulative_table_path, lambda file: np.save(file, get_cumulative_table(strategies)))
+
+    with open(info_sets_path, 'r') as info_sets_file:
+        info_set_ids = {line.rstrip('\n'): i for i, line in enumerate(info_sets_file)}
+    return StoredStrategy(info_set_ids, strategies, np.load(cumulative_table_path, mmap_mode='r'))
+
+
+def _clone_strategy_tree(node, parent, node_info_set_ids, stored_strategy):
+    clone = object.__new__(type(node))
+    clone.__dict__.update(node.__dict__)
+    clone.parent = parent
+    if node in node_info_set_ids:
+        clone.strategy = stored_strategy.strategies[node_info_set_ids[node]]
+    clone.children = {
+        key: _clone_strategy_tree(child, clone, node_info_set_ids, stored_strategy)
+        for key, child in node.children.items()}
+    return clone
+
+
+def build_strategy_trees(game, stored_strategies):
+    """Build strategy trees whose node strategies are views into the stored strategies.
+
+    Game tree is built only once and cloned for each strategy which is much faster
+    than building each tree with GameTreeBuilder.
+
+    Args:
+        game (Game): ACPC game definition object.
+        stored_strategies (list(StoredStrategy)): Strategies returned by load_strategy.
+
+    Returns:
+        list(HoleCardsNode): Roots of the strategy trees. Node strategies are read-only.
+    """
+    template_tree = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+    template_info_sets = {}
+
+    def on_node(info_set, node):
+        template_info_sets[node] = info_set
+    walk_action_nodes(template_tree, on_node)
+
+    strategy_trees = []
+    for stored_strategy in stored_strategies:
+        node_info_set_ids = {
+            node: stored_strategy.info_set_ids[info_set]
+            for node, info_set in template_info_sets.items()}
+        strategy_trees += [_clone_strategy_tree(template_tree, None, node_info_set_ids, stored_strategy)]
+    return strategy_trees
+
+
+def build_strategy_tree(game, stored_strategy):
+    """Build strategy tree whose node strategies are views into the stored strategy."""
+    return build_strategy_trees(game, [stored_strategy])[0]
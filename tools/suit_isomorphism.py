@@ -0,0 +1,140 @@
+import itertools
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.node_provider import StrategyTreeNodeProvider
+from tools.io_util import walk_action_nodes
+
+MAX_SUITS = 4
+
+
+class SuitIsomorphism:
+    """Maps dealt cards to canonical representatives under permutations of suits.
+
+    All suits are strategically equivalent, so deals which differ only by renaming of suits
+    can share one node of the game tree. Cards are dealt in groups (hole cards and board cards
+    of each round) and canonical form of a sequence of groups is the lexicographically
+    smallest sequence of sorted groups obtainable by permuting suits. Canonical form
+    of a sequence always starts with canonical form of its prefix, so canonical deals
+    form a tree.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.deck = sorted(acpc.game_utils.generate_deck(game))
+        suits = sorted(set(card % MAX_SUITS for card in self.deck))
+        self.suit_permutations = []
+        for permuted_suits in itertools.permutations(suits):
+            suit_permutation = list(range(MAX_SUITS))
+            for suit, permuted_suit in zip(suits, permuted_suits):
+                suit_permutation[suit] = permuted_suit
+            self.suit_permutations += [suit_permutation]
+        self._canonical_groups = {}
+        self._continuations = {}
+
+    def canonicalize(self, card_groups):
+        """Return canonical form of the sequence of card groups.
+
+        Args:
+            card_groups (tuple(tuple(int))): Dealt card groups, e.g. hole cards followed by board cards of each round.
+
+        Returns:
+            tuple(tuple(int)): Canonical card groups, cards in each group are sorted.
+        """
+        card_groups = tuple(tuple(group) for group in card_groups)
+        canonical_groups = self._canonical_groups.get(card_groups)
+        if canonical_groups is None:
+            canonical_groups = min(
+                tuple(
+                    tuple(sorted(card - card % MAX_SUITS + suit_permutation[card % MAX_SUITS] for card in group))
+                    for group in card_groups)
+                for suit_permutation in self.suit_permutations)
+            self._canonical_groups[card_groups] = canonical_groups
+        return canonical_groups
+
+    def is_canonical(self, card_groups):
+        return self.canonicalize(card_groups) == tuple(tuple(group) for group in card_groups)
+
+    def get_canonical_continuations(self, card_groups, num_cards):
+        """Return canonical groups which can be dealt after the canonical card groups.
+
+        Args:
+            card_groups (tuple(tuple(int))): Canonical sequence of already dealt card groups.
+            num_cards (int): Number of cards in the dealt group.
+
+        Returns:
+            list(tuple(tuple(int), int)): Canonical groups with number of concrete groups
+                                          which are mapped to each of them.
+        """
+        key = (card_groups, num_cards)
+        continuations = self._continuations.get(key)
+        if continuations is None:
+            dealt_cards = set(card for group in card_groups for card in group)
+            remaining_cards = [card for card in self.deck if card not in dealt_cards]
+            weights = {}
+            for group in itertools.combinations(remaining_cards, num_cards):
+                canonical_group = self.canonicalize(card_groups + (group,))[-1]
+                weights[canonical_group] = weights.get(canonical_group, 0) + 1
+            continuations = sorted(weights.items())
+            self._continuations[key] = continuations
+        return continuations
+
+    def get_canonical_info_set(self, info_set):
+        """Return key of the canonical info set equivalent to the info set.
+
+        Args:
+            info_set (str): Info set key as returned by tools.agent_utils.get_info_set.
+
+        Returns:
+            str: Info set key with cards replaced by the canonical ones.
+        """
+        tokens = info_set.split(':')
+        card_token_indexes = [i for i, token in enumerate(tokens) if token.isdigit()]
+        cards = [int(tokens[i]) for i in card_token_indexes]
+
+        group_sizes = [self.game.get_num_hole_cards()] + [
+            self.game.get_num_board_cards(round_index) for round_index in range(1, self.game.get_num_rounds())]
+        card_groups = []
+        num_grouped_cards = 0
+        for group_size in group_sizes:
+            if num_grouped_cards >= len(cards):
+                break
+            if group_size > 0:
+                card_groups += [tuple(cards[num_grouped_cards:num_grouped_cards + group_size])]
+                num_grouped_cards += group_size
+
+        canonical_cards = [card for group in self.canonicalize(card_groups) for card in group]
+        for i, card in zip(card_token_indexes, canonical_cards):
+            tokens[i] = str(card)
+        return ':'.join(tokens)
+
+
+def expand_strategy(game, canonical_strategy, suit_isomorphism=None):
+    """Create strategy of the whole game from strategy over canonical info sets.
+
+    Each info set gets strategy of its canonical info set, the result can be written to strategy file,
+    used by agents and evaluated as any other strategy.
+
+    Args:
+        game (Game): ACPC game definition object.
+        canonical_strategy (HoleCardsNode): Strategy tree built with suit isomorphism.
+        suit_isomorphism (SuitIsomorphism): Isomorphism of the game, created if None.
+
+    Returns:
+        HoleCardsNode: Strategy tree with all deals.
+    """
+    if suit_isomorphism is None:
+        suit_isomorphism = SuitIsomorphism(game)
+
+    canonical_node_strategies = {}
+    def on_canonical_node(info_set, node):
+        canonical_node_strategies[info_set] = node.strategy
+    walk_action_nodes(canonical_strategy, on_canonical_node)
+
+    strategy = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+    def on_node(info_set, node):
+        np.copyto(node.strategy, canonical_node_strategies[suit_isomorphism.get_canonical_info_set(info_set)])
+    walk_action_nodes(strategy, on_node)
+    return strategy
@@ -10,14 +10,20 @@ from datetime import datetime
 from tabulate import tabulate
 import copy
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import acpc_python_client as acpc
 
-from tools.io_util import get_new_path
-from tools.match_evaluation import get_player_utilities_from_log_file, get_logs_data, calculate_confidence_interval
+from tools.io_util import get_new_path, read_strategy_from_file
+from tools.match_evaluation import get_player_utilities_from_log_file, UtilityAccumulator
+from tools.dealer import play_match
+from tools.match_results_cache import MatchResultsCache, get_agent_fingerprint, is_complete_log_file
+from utility_estimation.aivat import AivatUtilityEstimator
 
 
 FILES_PATH = 'verification/tournaments'
+RESULTS_CACHE_PATH = '%s/results_cache' % FILES_PATH
 ACPC_INFRASTRUCTURE_DIR = os.getcwd() + '/../acpc-python-client/acpc_infrastructure'
 MATCH_SCRIPT = './play_match.pl'
 
@@ -62,6 +68,20 @@ class AcpcTournamentTest(unittest.TestCase):
             'max_confidence_interval_half_size': 15 / 1000,
         })
 
+    def test_leduc_simple_portfolio_tournament_full(self):
+        portfolio_path = 'verification/implicit_agent/portfolios/leduc_simple_portfolio'
+        implicit_agents, opponent_agents = self._get_portfolio_agents(portfolio_path)
+        agents = implicit_agents + opponent_agents
+        self.run_tournament({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'name': 'leduc_simple_portfolio-full',
+            'row_agents': agents,
+            'column_agents': agents,
+            'confidence': 0.95,
+            'max_confidence_interval_half_size': 15 / 1000,
+            'use_python_dealer': True,
+        })
+
     def test_leduc_small_portfolio_tournament_medium(self):
         portfolio_path = 'verification/implicit_agent/portfolios/leduc_small_portfolio'
         implicit_agents, opponent_agents = self._get_portfolio_agents(portfolio_path)
@@ -110,6 +130,21 @@ class AcpcTournamentTest(unittest.TestCase):
             'max_confidence_interval_half_size': 15 / 1000,
         })
 
+    def test_leduc_small_portfolio_aivat_stopping_tournament(self):
+        portfolio_path = 'verification/implicit_agent/portfolios/leduc_small_portfolio'
+        implicit_agents, opponent_agents = self._get_portfolio_agents(portfolio_path)
+        self.run_tournament({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'name': 'leduc_small_portfolio-aivat_stopping',
+            'row_agents': implicit_agents,
+            'column_agents': opponent_agents,
+            'confidence': 0.95,
+            'max_confidence_interval_half_size': 15 / 1000,
+            'utility_estimator': (AivatUtilityEstimator, {
+                'equilibirum_strategy_path': 'strategies/leduc.limit.2p-equilibrium.strategy'
+            }),
+        })
+
     def _get_portfolio_agents(self, portfolio_path):
         implicit_agents = []
         opponent_agents = []
@@ -117,8 +152,11 @@ class AcpcTournamentTest(unittest.TestCase):
             if file.endswith('.sh'):
                 agent_name = file[:-len('.sh')]
                 if  any(char.isdigit() for char in agent_name):
-                    # Weak evaluation agent
-                    opponent_agents += [(agent_name, agent_name, '/'.join([portfolio_path, file]))]
+                    # Weak evaluation agent, its strategy is known and can be used by utility estimators
+                    strategy_path = '%s/%s-opponent.strategy' % (portfolio_path, agent_name)
+                    if not os.path.exists(strategy_path):
+                        strategy_path = None
+                    opponent_agents += [(agent_name, agent_name, '/'.join([portfolio_path, file]), strategy_path)]
                 else:
                     # Implicit modelling agent
                     print_agent_name = agent_name.replace('_', ' ').replace('-', '-\n')
@@ -172,11 +210,36 @@ class AcpcTournamentTest(unittest.TestCase):
 
         scores_table = [[None for j in range(column_num_agents)] for i in range(row_num_agents)]
 
-        agent_pairs_evaluated = []
-
         env = os.environ.copy()
         env['PATH'] = os.path.dirname(sys.executable) + ':' + env['PATH']
 
+        use_python_dealer = test_spec.get('use_python_dealer', False)
+        num_workers = test_spec.get('num_workers', os.cpu_count())
+
+        # Matches which were already played with the same agents, game and seed are reused from the cache,
+        # so interrupted tournament continues where it stopped and only new pairs are played after adding agents
+        results_cache = None
+        agent_fingerprints = {}
+        if test_spec.get('use_results_cache', True):
+            results_cache = MatchResultsCache('%s/%s' % (workspace_dir, RESULTS_CACHE_PATH))
+            for agent in row_agents + column_agents:
+                if agent[0] not in agent_fingerprints:
+                    agent_strategy_paths = [workspace_dir + '/' + agent[3]] if len(agent) > 3 and agent[3] is not None else None
+                    agent_fingerprints[agent[0]] = get_agent_fingerprint(workspace_dir + '/' + agent[2], agent_strategy_paths)
+        num_cached_matches = 0
+
+        # Optionally the stopping rule uses variance reduced utilities of agents with known strategy
+        utility_estimator = None
+        agent_strategies = {}
+        if 'utility_estimator' in test_spec:
+            utility_estimator_class, utility_estimator_args = test_spec['utility_estimator']
+            utility_estimator = utility_estimator_class(game, False, **utility_estimator_args)
+            for agent in row_agents + column_agents:
+                if len(agent) > 3 and agent[3] is not None and agent[0] not in agent_strategies:
+                    agent_strategies[agent[0]], _ = read_strategy_from_file(game, workspace_dir + '/' + agent[3])
+
+        agent_pairs = []
+        agent_pairs_evaluated = []
         for i in range(row_num_agents):
             for j in range(column_num_agents):
                 row_agent_name = row_agents[i][0]
@@ -187,77 +250,165 @@ class AcpcTournamentTest(unittest.TestCase):
                 agent_pair_key = tuple(sorted([row_agent_name, column_agent_name]))
                 if agent_pair_key in agent_pairs_evaluated:
                     continue
-
-                row_agent_script_path = row_agent_scripts_paths[i]
-                column_agent_script_path = column_agent_scripts_paths[j]
+                agent_pairs_evaluated += [agent_pair_key]
 
                 match_name = '%s-vs-%s' % (row_agent_name, column_agent_name)
-                match_name_reversed = '%s-vs-%s' % (column_agent_name, row_agent_name)
-                match_logs_dir = ('%s/%s' % (logs_base_dir, match_name)).replace('\n', '')
-
-                print()
-                print('Evaluating %s' % match_name)
-
-                best_confidence_interval_half_size = float('inf')
-                row_player_mean_utility = -1
-                run_counter = 0
-                log_readings = []
-                while best_confidence_interval_half_size > max_confidence_interval_half_size:
-                    run_counter += 1
-                    run_logs_dir = '%s/run_%s' % (match_logs_dir, run_counter)
-                    os.makedirs(run_logs_dir)
-
-                    if len(seeds) < run_counter:
-                        seeds += [int(datetime.now().timestamp())]
-                    seed = seeds[run_counter - 1]
-
-                    normal_order_logs_name = '%s/%s' % (run_logs_dir, match_name)
-                    proc = subprocess.Popen(
-                        [
-                            MATCH_SCRIPT,
-                            normal_order_logs_name,
-                            game_file_path,
-                            str(NUM_TOURNAMENT_HANDS),
-                            str(seed),
-                            row_agent_name,
-                            row_agent_script_path,
-                            column_agent_name,
-                            column_agent_script_path],
-                        cwd=ACPC_INFRASTRUCTURE_DIR,
-                        env=env,
-                        stdout=subprocess.PIPE)
-                    proc.stdout.readline().decode('utf-8').strip()
-                    log_readings += [get_player_utilities_from_log_file(normal_order_logs_name + '.log')]
-
-                    reversed_order_logs_name = '%s/%s' % (run_logs_dir, match_name_reversed)
-                    proc = subprocess.Popen(
-                        [
-                            MATCH_SCRIPT,
-                            reversed_order_logs_name,
-                            game_file_path,
-                            str(NUM_TOURNAMENT_HANDS),
-                            str(seed),
-                            column_agent_name,
-                            column_agent_script_path,
-                            row_agent_name,
-                            row_agent_script_path],
+                agent_pairs += [{
+                    'row_index': i,
+                    'column_index': j,
+                    'match_name': match_name,
+                    'match_name_reversed': '%s-vs-%s' % (column_agent_name, row_agent_name),
+                    'match_logs_dir': ('%s/%s' % (logs_base_dir, match_name)).replace('\n', ''),
+                    'players': [
+                        (row_agent_name, row_agent_scripts_paths[i]),
+                        (column_agent_name, column_agent_scripts_paths[j])],
+                    'run_counter': 0,
+                    'estimated_player_name': next(
+                        filter(lambda name: name in agent_strategies, [row_agent_name, column_agent_name]), None),
+                    'estimates_cache': {},
+                    'raw_utility_accumulator': UtilityAccumulator(),
+                    'utility_accumulator': UtilityAccumulator(),
+                    'matches_time': 0,
+                    'played_hands': 0,
+                    'pending_matches': 0,
+                }]
+
+        def play_match_logs(logs_name, seed, players, agent_pair):
+            match_key = None
+            cached_log_file_path = None
+            if results_cache is not None:
+                match_key = results_cache.get_match_key(
+                    game_file_path,
+                    NUM_TOURNAMENT_HANDS,
+                    seed,
+                    [(player[0], agent_fingerprints[player[0]]) for player in players],
+                    'python' if use_python_dealer else 'acpc')
+                cached_log_file_path = results_cache.get_log_file_path(match_key)
+
+            # Time of cache hits is not match time, it would distort the estimated time savings
+            match_time = None
+            if cached_log_file_path is not None:
+                shutil.copyfile(cached_log_file_path, logs_name + '.log')
+            else:
+                start = time.perf_counter()
+                if use_python_dealer:
+                    play_match(logs_name, game_file_path, NUM_TOURNAMENT_HANDS, seed, players)
+                else:
+                    match_process = subprocess.run(
+                        [MATCH_SCRIPT, logs_name, game_file_path, str(NUM_TOURNAMENT_HANDS), str(seed)]
+                        + [value for player in players for value in player],
                         cwd=ACPC_INFRASTRUCTURE_DIR,
                         env=env,
                         stdout=subprocess.PIPE)
-                    proc.stdout.readline().decode('utf-8').strip()
-                    log_readings += [get_player_utilities_from_log_file(reversed_order_logs_name + '.log')]
-
-                    data, player_names = get_logs_data(*log_readings)
-                    means, interval_half_size, _, _ = calculate_confidence_interval(data, confidence)
-
-                    print('Run %s, current confidence interval half size: %s' % (run_counter, interval_half_size[0]))
-                    best_confidence_interval_half_size = interval_half_size[0]
-                    row_player_index = player_names.index(row_agent_name)
-                    row_player_mean_utility = means[row_player_index]
+                    if match_process.returncode != 0:
+                        raise RuntimeError('Match %s failed with return code %s' % (logs_name, match_process.returncode))
+                match_time = time.perf_counter() - start
+                # Failed dealer or agent leaves truncated log which must not be reused from the cache
+                if not is_complete_log_file(logs_name + '.log', NUM_TOURNAMENT_HANDS):
+                    raise RuntimeError('Match %s did not finish all %s hands' % (logs_name, NUM_TOURNAMENT_HANDS))
+                if match_key is not None:
+                    results_cache.add_log_file(match_key, logs_name + '.log')
+
+            raw_utility_accumulator = UtilityAccumulator()
+            raw_utility_accumulator.add_log_reading(get_player_utilities_from_log_file(logs_name + '.log'))
+            estimated_player_name = agent_pair['estimated_player_name']
+            is_cached = cached_log_file_path is not None
+            if estimated_player_name is None:
+                return raw_utility_accumulator, raw_utility_accumulator, match_time, is_cached
+
+            utilities, player_names = get_player_utilities_from_log_file(
+                logs_name + '.log',
+                game_file_path=game_file_path,
+                utility_estimator=utility_estimator,
+                player_strategies={estimated_player_name: agent_strategies[estimated_player_name]},
+                estimates_cache=agent_pair['estimates_cache'])
+            # Game is zero-sum so opponent's utility is the negated estimate
+            estimated_player_index = player_names.index(estimated_player_name)
+            utilities[:, 1 - estimated_player_index] = -utilities[:, estimated_player_index]
+            utility_accumulator = UtilityAccumulator()
+            utility_accumulator.add_log_reading((utilities, player_names))
+            return raw_utility_accumulator, utility_accumulator, match_time, is_cached
+
+        def submit_run(executor, agent_pair):
+            agent_pair['run_counter'] += 1
+            run_counter = agent_pair['run_counter']
+            run_logs_dir = '%s/run_%s' % (agent_pair['match_logs_dir'], run_counter)
+            os.makedirs(run_logs_dir)
+
+            if len(seeds) < run_counter:
+                seeds.append(int(datetime.now().timestamp()))
+            seed = seeds[run_counter - 1]
+
+            # Both seat orders of the run are played at the same time
+            players = agent_pair['players']
+            futures = [
+                executor.submit(
+                    play_match_logs, '%s/%s' % (run_logs_dir, agent_pair['match_name']), seed, players, agent_pair),
+                executor.submit(
+                    play_match_logs,
+                    '%s/%s' % (run_logs_dir, agent_pair['match_name_reversed']),
+                    seed,
+                    players[::-1],
+                    agent_pair),
+            ]
+            agent_pair['pending_matches'] = len(futures)
+            return {future: agent_pair for future in futures}
+
+        def get_estimator_savings(agent_pair):
+            # Hands needed by the raw utilities to reach the target are extrapolated
+            # from the current raw interval, the interval shrinks with square root of hands
+            num_hands = agent_pair['utility_accumulator'].count
+            _, raw_interval_half_size, _, _ = agent_pair['raw_utility_accumulator'].get_confidence_interval(confidence)
+            raw_num_hands = num_hands * (raw_interval_half_size[0, 0] / max_confidence_interval_half_size) ** 2
+            hands_saved = raw_num_hands - num_hands
+            # Time per hand is known only from matches which were played, not reused from the cache
+            time_saved = None
+            if agent_pair['played_hands'] > 0:
+                time_saved = round(hands_saved * agent_pair['matches_time'] / agent_pair['played_hands'], 1)
+            print('%s: %s hands, raw utilities would need %.0f hands, saved %.0f hands and %ss of match time' % (
+                agent_pair['match_name'], num_hands, raw_num_hands, hands_saved, time_saved))
+            return [agent_pair['match_name'], num_hands, round(raw_num_hands), round(hands_saved), time_saved]
+
+        savings_table = []
 
-                scores_table[i][j] = row_player_mean_utility
-
-                agent_pairs_evaluated += [agent_pair_key]
+        print()
+        print('Evaluating %s agent pairs using %s workers' % (len(agent_pairs), num_workers))
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            pending_futures = {}
+            for agent_pair in agent_pairs:
+                pending_futures.update(submit_run(executor, agent_pair))
+
+            while pending_futures:
+                done_futures, _ = wait(pending_futures, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    agent_pair = pending_futures.pop(future)
+                    raw_utility_accumulator, estimated_utility_accumulator, match_time, is_cached = future.result()
+                    if is_cached:
+                        num_cached_matches += 1
+                    else:
+                        agent_pair['matches_time'] += match_time
+                        agent_pair['played_hands'] += NUM_TOURNAMENT_HANDS
+                    agent_pair['raw_utility_accumulator'].merge(raw_utility_accumulator)
+                    utility_accumulator = agent_pair['utility_accumulator']
+                    utility_accumulator.merge(estimated_utility_accumulator)
+                    agent_pair['pending_matches'] -= 1
+                    if agent_pair['pending_matches'] > 0:
+                        continue
+
+                    means, interval_half_size, _, _ = utility_accumulator.get_confidence_interval(confidence)
+                    print('%s run %s, current confidence interval half size: %s' % (
+                        agent_pair['match_name'], agent_pair['run_counter'], interval_half_size[0]))
+
+                    if interval_half_size[0] > max_confidence_interval_half_size:
+                        pending_futures.update(submit_run(executor, agent_pair))
+                    else:
+                        row_player_index = utility_accumulator.player_names.index(agent_pair['players'][0][0])
+                        scores_table[agent_pair['row_index']][agent_pair['column_index']] = means[row_player_index]
+                        if agent_pair['estimated_player_name'] is not None:
+                            savings_table += [get_estimator_savings(agent_pair)]
+
+        if results_cache is not None:
+            print('%s matches reused from results cache' % num_cached_matches)
 
         print()
         print()
@@ -271,9 +422,22 @@ class AcpcTournamentTest(unittest.TestCase):
         confidence_line = 'Confidence interval: %s%% +- %s' % (int(confidence * 100), int(max_confidence_interval_half_size * 1000))
         print(confidence_line)
 
+        savings_table_string = None
+        if savings_table:
+            savings_table_string = tabulate(
+                savings_table,
+                headers=['Match', 'Hands', 'Raw hands', 'Hands saved', 'Time saved [s]'],
+                tablefmt='grid')
+            print()
+            print(savings_table_string)
+
         with open('%s/results.log' % logs_base_dir, 'w') as file:
             file.write(avg_results_table_string)
             file.write('\n')
             file.write('All utilities in mbb/g\n')
             file.write(confidence_line)
             file.write('\n')
+            if savings_table_string:
+                file.write('\nUtility estimator savings\n')
+                file.write(savings_table_string)
+                file.write('\n')
@@ -0,0 +1,118 @@
+import unittest
+import os
+import sys
+import time
+import asyncio
+import subprocess
+
+from tools.io_util import get_new_path
+from tools.dealer import play_matches_async
+from tools.match_evaluation import get_player_utilities_from_log_file
+
+
+FILES_PATH = 'verification/agent_host'
+
+NUM_MATCH_HANDS = 100
+NUM_TABLES = [1, 10, 100, 300]
+
+
+def get_process_memory(pid):
+    with open('/proc/%s/status' % pid, 'r') as status_file:
+        for line in status_file:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+
+
+async def request_match_async(server_socket_path, agent_name, dealer_port):
+    reader, writer = await asyncio.open_unix_connection(server_socket_path)
+    writer.write(('%s localhost %s\n' % (agent_name, dealer_port)).encode('utf-8'))
+    response = (await reader.readline()).decode('utf-8').strip()
+    writer.close()
+    return response
+
+
+class AgentHostTest(unittest.TestCase):
+    def test_leduc_host_throughput(self):
+        self.measure_throughput({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'agents': [
+                'Equilibrium strategy {game_file_path} strategies/leduc.limit.2p-equilibrium.strategy',
+                'ImplicitModelling implicit_modelling {game_file_path} none '
+                'strategies/leduc.limit.2p-equilibrium.strategy strategies/leduc.limit.2p-equilibrium.strategy',
+            ],
+            'players': ['Equilibrium', 'ImplicitModelling'],
+        })
+
+    def play_tables(self, test_directory, server_socket_path, game_file_path, players, num_tables):
+        async def play():
+            requests = []
+
+            def on_port(player_index, port):
+                requests.append(asyncio.ensure_future(
+                    request_match_async(server_socket_path, players[player_index], port)))
+
+            await play_matches_async(
+                [('%s/tables_%s_match_%s' % (test_directory, num_tables, i),
+                  game_file_path,
+                  NUM_MATCH_HANDS,
+                  i,
+                  [(player, None) for player in players])
+                 for i in range(num_tables)],
+                timeout=600,
+                on_port=on_port)
+            return await asyncio.gather(*requests)
+
+        responses = asyncio.run(play())
+        self.assertEqual(responses, ['DONE'] * (num_tables * len(players)))
+
+        num_decisions = 0
+        for i in range(num_tables):
+            with open('%s/tables_%s_match_%s.log' % (test_directory, num_tables, i), 'r') as log_file:
+                for line in log_file:
+                    if line.startswith('STATE:'):
+                        num_decisions += len(line.split(':')[2].replace('/', ''))
+        self.assertEqual(
+            get_player_utilities_from_log_file('%s/tables_%s_match_0.log' % (test_directory, num_tables))[0].shape[0],
+            NUM_MATCH_HANDS)
+        return num_decisions
+
+    def measure_throughput(self, test_spec):
+        workspace_dir = os.getcwd()
+        game_file_path = workspace_dir + '/' + test_spec['game_file_path']
+        game_name = game_file_path.split('/')[-1][:-len('.game')]
+
+        test_directory = get_new_path('%s/%s/%s' % (workspace_dir, FILES_PATH, game_name))
+        os.makedirs(test_directory)
+
+        agents_file_path = '%s/agents' % test_directory
+        with open(agents_file_path, 'w') as agents_file:
+            for agent_line in test_spec['agents']:
+                agents_file.write('%s\n' % agent_line.format(game_file_path=game_file_path))
+
+        server_socket_path = '%s/agents.sock' % test_directory
+        env = os.environ.copy()
+        env['PYTHONPATH'] = workspace_dir + ':' + env.get('PYTHONPATH', '')
+        host_process = subprocess.Popen(
+            [sys.executable, '%s/tools/agent_host.py' % workspace_dir, server_socket_path, agents_file_path],
+            env=env)
+        try:
+            while not os.path.exists(server_socket_path):
+                time.sleep(0.01)
+            idle_memory = get_process_memory(host_process.pid)
+
+            print()
+            print('Agent host memory after startup: %.1f MB' % idle_memory)
+            for num_tables in NUM_TABLES:
+                start = time.perf_counter()
+                num_decisions = self.play_tables(
+                    test_directory, server_socket_path, game_file_path, test_spec['players'], num_tables)
+                tables_time = time.perf_counter() - start
+                print('%s tables: %s decisions in %.2fs, %.0f decisions/s, host memory %.1f MB' % (
+                    num_tables,
+                    num_decisions,
+                    tables_time,
+                    num_decisions / tables_time,
+                    get_process_memory(host_process.pid)))
+        finally:
+            host_process.terminate()
+            host_process.wait()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+import time
+import subprocess
+import numpy as np
+
+from tools.io_util import get_new_path
+from tools.dealer import play_match
+
+
+FILES_PATH = 'verification/agent_server'
+
+NUM_MATCHES = 20
+NUM_MATCH_HANDS = 10
+
+
+class AgentServerTest(unittest.TestCase):
+    def test_leduc_strategy_agent_startup(self):
+        self.compare_startup({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'agent_script_path': 'strategies/leduc.limit.2p-equilibrium-agent.sh',
+            'strategy_path': 'strategies/leduc.limit.2p-equilibrium.strategy',
+        })
+
+    def play_matches(self, test_directory, name, agent_script_path, game_file_path):
+        match_times = np.zeros(NUM_MATCHES)
+        for i in range(NUM_MATCHES):
+            start = time.perf_counter()
+            play_match(
+                '%s/%s_%s' % (test_directory, name, i),
+                game_file_path,
+                NUM_MATCH_HANDS,
+                i,
+                [('Equilibrium_1', agent_script_path), ('Equilibrium_2', agent_script_path)])
+            match_times[i] = time.perf_counter() - start
+        return match_times
+
+    def compare_startup(self, test_spec):
+        workspace_dir = os.getcwd()
+        game_file_path = workspace_dir + '/' + test_spec['game_file_path']
+        game_name = game_file_path.split('/')[-1][:-len('.game')]
+
+        test_directory = get_new_path('%s/%s/%s' % (workspace_dir, FILES_PATH, game_name))
+        os.makedirs(test_directory)
+
+        agents_file_path = '%s/agents' % test_directory
+        with open(agents_file_path, 'w') as agents_file:
+            agents_file.write('Equilibrium strategy %s %s\n' % (game_file_path, workspace_dir + '/' + test_spec['strategy_path']))
+
+        server_socket_path = '%s/agents.sock' % test_directory
+        client_script_path = '%s/agent_server_client.sh' % test_directory
+        with open(client_script_path, 'w') as client_script_file:
+            client_script_file.write('#!/bin/bash\n')
+            client_script_file.write('"%s" -I -S "%s/tools/agent_server_client.py" "%s" Equilibrium $1 $2\n' % (
+                sys.executable, workspace_dir, server_socket_path))
+        os.chmod(client_script_path, 0o755)
+
+        env = os.environ.copy()
+        env['PYTHONPATH'] = workspace_dir + ':' + env.get('PYTHONPATH', '')
+        env['PATH'] = os.path.dirname(sys.executable) + ':' + env['PATH']
+        server_start = time.perf_counter()
+        server_process = subprocess.Popen(
+            [sys.executable, '%s/tools/agent_server.py' % workspace_dir, server_socket_path, agents_file_path],
+            env=env)
+        try:
+            while not os.path.exists(server_socket_path):
+                time.sleep(0.01)
+            server_startup_time = time.perf_counter() - server_start
+
+            script_match_times = self.play_matches(
+                test_directory, 'script', workspace_dir + '/' + test_spec['agent_script_path'], game_file_path)
+            server_match_times = self.play_matches(test_directory, 'server', client_script_path, game_file_path)
+        finally:
+            server_process.terminate()
+            server_process.wait()
+
+        print()
+        print('Agent server startup: %.3fs' % server_startup_time)
+        print('Agent scripts: %s matches of %s hands, mean match time %.3fs' % (
+            NUM_MATCHES, NUM_MATCH_HANDS, np.mean(script_match_times)))
+        print('Agent server: %s matches of %s hands, mean match time %.3fs' % (
+            NUM_MATCHES, NUM_MATCH_HANDS, np.mean(server_match_times)))
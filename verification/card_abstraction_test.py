@@ -0,0 +1,51 @@
+import unittest
+import time
+
+import acpc_python_client as acpc
+
+from cfr.main import Cfr
+from evaluation.exploitability import Exploitability
+from tools.card_abstraction import create_card_abstraction, expand_abstract_strategy
+
+
+class CardAbstractionTest(unittest.TestCase):
+    def test_leduc_card_abstraction(self):
+        self.evaluate_card_abstraction({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'training_iterations': 100,
+            'weight_delay': 20,
+            'abstractions': [
+                ('equity', [2, 3]),
+                ('equity', [3, 3]),
+                ('histogram', [3, 3]),
+            ],
+        })
+
+    def evaluate_card_abstraction(self, test_spec):
+        game = acpc.read_game_file(test_spec['game_file_path'])
+        exploitability = Exploitability(game)
+
+        print()
+        print(test_spec['game_file_path'])
+        print('abstraction | buckets | action nodes | training time | exploitability')
+
+        cfr = Cfr(game, show_progress=False)
+        start = time.perf_counter()
+        cfr.train(test_spec['training_iterations'], weight_delay=test_spec['weight_delay'])
+        print('%11s | %7s | %12s | %12.1fs | %s' % (
+            'none', '-', len(cfr._action_nodes), time.perf_counter() - start, exploitability.evaluate(cfr.game_tree)))
+
+        for features, num_buckets in test_spec['abstractions']:
+            card_abstraction = create_card_abstraction(game, num_buckets, features=features, seed=0)
+            cfr = Cfr(game, show_progress=False, card_abstraction=card_abstraction)
+            start = time.perf_counter()
+            cfr.train(test_spec['training_iterations'], weight_delay=test_spec['weight_delay'])
+            training_time = time.perf_counter() - start
+            strategy = expand_abstract_strategy(game, cfr.game_tree, card_abstraction)
+            print('%11s | %7s | %12s | %12.1fs | %s' % (
+                features, card_abstraction.num_buckets, len(cfr._action_nodes), training_time,
+                exploitability.evaluate(strategy)))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,69 @@
+import unittest
+import time
+
+import acpc_python_client as acpc
+
+from cfr.main import Cfr
+from evaluation.exploitability import Exploitability
+
+
+class CfrPruningTest(unittest.TestCase):
+    def test_kuhn_bigdeck_pruning_throughput(self):
+        self.evaluate_pruning_throughput({
+            'game_file_path': 'games/kuhn.bigdeck.limit.2p.game',
+            'training_iterations': 600,
+            'weight_delay': 100,
+            'checkpoint_iterations': 50,
+        })
+
+    def test_leduc_pruning_throughput(self):
+        self.evaluate_pruning_throughput({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'training_iterations': 300,
+            'weight_delay': 50,
+            'checkpoint_iterations': 25,
+        })
+
+    def evaluate_pruning_throughput(self, test_spec):
+        game = acpc.read_game_file(test_spec['game_file_path'])
+        exploitability = Exploitability(game)
+
+        def train(pruning):
+            cfr = Cfr(game, show_progress=False)
+            checkpoints = []
+            last_checkpoint = [0, 0, 0, time.perf_counter()]
+
+            def checkpoint_callback(game_tree, checkpoint_index, iterations):
+                # Time spent evaluating exploitability is not counted
+                window_time = time.perf_counter() - last_checkpoint[3]
+                num_visits = cfr.num_action_visits - last_checkpoint[1]
+                num_pruned_visits = cfr.num_zero_reach_pruned_visits + cfr.num_regret_pruned_visits - last_checkpoint[2]
+                checkpoints.append((
+                    iterations,
+                    (iterations - last_checkpoint[0]) / window_time,
+                    num_pruned_visits / (num_visits + num_pruned_visits),
+                    exploitability.evaluate(game_tree)))
+                last_checkpoint[:] = [
+                    iterations,
+                    cfr.num_action_visits,
+                    cfr.num_zero_reach_pruned_visits + cfr.num_regret_pruned_visits,
+                    time.perf_counter()]
+
+            cfr.train(
+                test_spec['training_iterations'],
+                weight_delay=test_spec['weight_delay'],
+                checkpoint_iterations=test_spec['checkpoint_iterations'],
+                checkpoint_callback=checkpoint_callback,
+                zero_reach_pruning=pruning,
+                regret_pruning=pruning)
+            return checkpoints
+
+        baseline_checkpoints = train(False)
+        pruning_checkpoints = train(True)
+
+        print()
+        print(test_spec['game_file_path'])
+        print('iterations | it/s without pruning | it/s with pruning | speedup | pruned visits | exploitability without/with pruning')
+        for baseline, pruning in zip(baseline_checkpoints, pruning_checkpoints):
+            print('%10s | %20.1f | %17.1f | %6.2fx | %12.1f%% | %s / %s' % (
+                baseline[0], baseline[1], pruning[1], pruning[1] / baseline[1], pruning[2] * 100, baseline[3], pruning[3]))
@@ -0,0 +1,103 @@
+import os
+import unittest
+import time
+
+import matplotlib.pyplot as plt
+
+import acpc_python_client as acpc
+
+from cfr.main import Cfr
+from cfr.schedules import LinearCfrSchedule, DiscountedCfrSchedule, PredictiveCfrPlusSchedule
+from evaluation.exploitability import Exploitability
+from tools.io_util import get_new_path
+
+FIGURES_FOLDER = 'verification/cfr_variants_convergence'
+
+GAMES_DIRECTORY = 'games'
+
+TRAINING_ITERATIONS = {
+    'kuhn.limit.2p': 1000,
+    'kuhn.bigdeck.limit.2p': 500,
+    'kuhn.bigdeck.2round.limit.2p': 300,
+    'leduc.limit.2p': 300,
+}
+DEFAULT_TRAINING_ITERATIONS = 300
+
+CHECKPOINTS_COUNT = 30
+
+VARIANTS = [
+    ('CFR+', None),
+    ('Linear CFR', LinearCfrSchedule()),
+    ('DCFR', DiscountedCfrSchedule()),
+    ('Predictive CFR+', PredictiveCfrPlusSchedule()),
+]
+
+
+class CfrVariantsConvergenceTest(unittest.TestCase):
+    def test_cfr_variants_convergence(self):
+        for game_file_name in sorted(os.listdir(GAMES_DIRECTORY)):
+            if game_file_name.endswith('.game'):
+                self.evaluate_convergence('%s/%s' % (GAMES_DIRECTORY, game_file_name))
+
+    def evaluate_convergence(self, game_file_path):
+        game = acpc.read_game_file(game_file_path)
+        game_name = game_file_path.split('/')[-1][:-len('.game')]
+        exploitability = Exploitability(game)
+
+        iterations = TRAINING_ITERATIONS.get(game_name, DEFAULT_TRAINING_ITERATIONS)
+        checkpoint_iterations = max(iterations // CHECKPOINTS_COUNT, 1)
+
+        print()
+        print(game_name)
+
+        figure, (iterations_axis, time_axis) = plt.subplots(1, 2, figsize=(12, 5), dpi=160)
+        for variant_name, schedule in VARIANTS:
+            iteration_counts = []
+            training_times = []
+            exploitability_values = []
+            training_time = 0
+            resume_time = time.perf_counter()
+
+            def checkpoint_callback(game_tree, checkpoint_index, iterations_done):
+                nonlocal training_time
+                nonlocal resume_time
+                # Time spent evaluating exploitability is not counted as training time
+                training_time += time.perf_counter() - resume_time
+                iteration_counts.append(iterations_done)
+                training_times.append(training_time)
+                exploitability_values.append(exploitability.evaluate(game_tree))
+                resume_time = time.perf_counter()
+
+            cfr = Cfr(game, show_progress=False)
+            resume_time = time.perf_counter()
+            cfr.train(
+                iterations,
+                # CFR+ starts averaging after quarter of the iterations, other variants weight all iterations
+                weight_delay=iterations // 4,
+                checkpoint_iterations=checkpoint_iterations,
+                checkpoint_callback=checkpoint_callback,
+                schedule=schedule)
+
+            print('%s: exploitability %s after %s iterations, training took %.1fs' % (
+                variant_name, exploitability_values[-1], iteration_counts[-1], training_times[-1]))
+            iterations_axis.plot(iteration_counts, exploitability_values, label=variant_name, linewidth=0.8)
+            time_axis.plot(training_times, exploitability_values, label=variant_name, linewidth=0.8)
+
+        for axis, x_label in [(iterations_axis, 'Training iterations'), (time_axis, 'Training time [s]')]:
+            axis.set_yscale('log')
+            axis.set_xlabel(x_label)
+            axis.set_ylabel('Strategy exploitability [mbb/g]')
+            axis.grid()
+            axis.legend()
+        figure.suptitle('%s CFR variants convergence' % game_name)
+
+        figure_output_path = get_new_path('%s/%s(it:%s)' % (FIGURES_FOLDER, game_name, iterations), '.png')
+        figures_directory = os.path.dirname(figure_output_path)
+        if not os.path.exists(figures_directory):
+            os.makedirs(figures_directory)
+        figure.savefig(figure_output_path)
+        plt.close(figure)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
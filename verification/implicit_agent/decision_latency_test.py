@@ -0,0 +1,103 @@
+import unittest
+import os
+import time
+import random
+import numpy as np
+import matplotlib.pyplot as plt
+
+from tools.constants import Action, NUM_ACTIONS
+from tools.io_util import read_strategy_from_file, write_strategy_to_file, get_new_path
+from weak_agents.action_tilted_agent import create_agent_strategy_from_trained_strategy, TiltType
+from implicit_modelling.implicit_modelling_agent import ImplicitModellingAgent
+
+
+TEST_DIRECTORY = 'verification/implicit_agent'
+LATENCY_TEST_DIRECTORY = '%s/decision_latency' % TEST_DIRECTORY
+
+NUM_DECISIONS = 20000
+
+
+def _get_info_set_current_strategy_baseline(agent, info_set):
+    """Per decision strategy mixing as it was done before strategies were precomputed."""
+    experts_weights = agent.bandit_algorithm.get_current_expert_probabilities()
+    current_strategy = np.zeros(NUM_ACTIONS)
+    for i in range(agent.portfolio_size):
+        current_strategy += experts_weights[i] * np.array(agent.portfolio_dicts[i][info_set])
+    return current_strategy
+
+
+class DecisionLatencyTest(unittest.TestCase):
+    def test_kuhn_decision_latency(self):
+        self.evaluate_latency({
+            'game_file_path': 'games/kuhn.limit.2p.game',
+            'equilibrium_strategy_path': 'strategies/kuhn.limit.2p-equilibrium.strategy',
+            'portfolio_sizes': [2, 8, 32],
+        })
+
+    def test_leduc_decision_latency(self):
+        self.evaluate_latency({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'equilibrium_strategy_path': 'strategies/leduc.limit.2p-equilibrium.strategy',
+            'portfolio_sizes': [2, 8, 32],
+        })
+
+    def evaluate_latency(self, test_spec):
+        game_file_path = test_spec['game_file_path']
+        game_name = game_file_path.split('/')[-1][:-len('.game')]
+        equilibrium_strategy, _ = read_strategy_from_file(game_file_path, test_spec['equilibrium_strategy_path'])
+
+        test_directory = get_new_path('%s/%s' % (LATENCY_TEST_DIRECTORY, game_name))
+        os.makedirs(test_directory)
+
+        portfolio_sizes = test_spec['portfolio_sizes']
+        strategy_paths = []
+        for i in range(max(portfolio_sizes)):
+            tilt_action = [Action.FOLD, Action.CALL, Action.RAISE][i % 3]
+            tilted_strategy = create_agent_strategy_from_trained_strategy(
+                game_file_path,
+                equilibrium_strategy,
+                tilt_action,
+                TiltType.ADD,
+                0.05 * (i // 3 + 1))
+            strategy_path = '%s/portfolio_strategy_%s.strategy' % (test_directory, i)
+            write_strategy_to_file(tilted_strategy, strategy_path)
+            strategy_paths += [strategy_path]
+
+        print()
+        fig, axes = plt.subplots(len(portfolio_sizes), 1, dpi=160, figsize=(6, 3 * len(portfolio_sizes)))
+        for ax, portfolio_size in zip(axes, portfolio_sizes):
+            agent = ImplicitModellingAgent(game_file_path, strategy_paths[:portfolio_size])
+            info_sets = list(agent.info_set_ids.keys())
+            decisions = [random.choice(info_sets) for _ in range(NUM_DECISIONS)]
+
+            baseline_latencies = np.zeros(NUM_DECISIONS)
+            latencies = np.zeros(NUM_DECISIONS)
+            for i, info_set in enumerate(decisions):
+                start = time.perf_counter()
+                baseline_strategy = _get_info_set_current_strategy_baseline(agent, info_set)
+                baseline_latencies[i] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                strategy = agent._get_info_set_current_strategy(info_set)
+                latencies[i] = time.perf_counter() - start
+
+                self.assertTrue(np.allclose(baseline_strategy, strategy))
+
+            baseline_latencies *= 1e6
+            latencies *= 1e6
+            print('Portfolio size %s: before median %.2fus, p99 %.2fus; after median %.2fus, p99 %.2fus' % (
+                portfolio_size,
+                np.median(baseline_latencies),
+                np.percentile(baseline_latencies, 99),
+                np.median(latencies),
+                np.percentile(latencies, 99)))
+
+            bins = np.linspace(0, np.percentile(baseline_latencies, 99), 50)
+            ax.hist(baseline_latencies, bins=bins, alpha=0.6, label='before')
+            ax.hist(latencies, bins=bins, alpha=0.6, label='after')
+            ax.set_title('Portfolio size %s' % portfolio_size)
+            ax.set_xlabel('Decision latency [us]')
+            ax.legend()
+
+        plt.tight_layout()
+        plt.savefig('%s/decision_latency.png' % test_directory)
@@ -0,0 +1,56 @@
+import unittest
+import os
+import time
+
+from tools.constants import Action
+from tools.io_util import read_strategy_from_file, get_new_path
+from weak_agents.action_tilted_agent import create_agent_strategy_from_trained_strategy, TiltType
+from implicit_modelling.build_portfolio import optimize_portfolio
+
+
+TEST_DIRECTORY = 'verification/implicit_agent'
+OPTIMIZATION_TEST_DIRECTORY = '%s/portfolio_optimization' % TEST_DIRECTORY
+
+NUM_CANDIDATES = 200
+
+
+class PortfolioOptimizationTimeTest(unittest.TestCase):
+    def test_leduc_portfolio_optimization_time(self):
+        self.evaluate_optimization_time({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'equilibrium_strategy_path': 'strategies/leduc.limit.2p-equilibrium.strategy',
+        })
+
+    def evaluate_optimization_time(self, test_spec):
+        game_file_path = test_spec['game_file_path']
+        game_name = game_file_path.split('/')[-1][:-len('.game')]
+        equilibrium_strategy, _ = read_strategy_from_file(game_file_path, test_spec['equilibrium_strategy_path'])
+
+        test_directory = get_new_path('%s/%s' % (OPTIMIZATION_TEST_DIRECTORY, game_name))
+        os.makedirs(test_directory)
+        utilities_cache_path = '%s/utilities.npz' % test_directory
+
+        # Opponents tilted towards one action and responses tilted the opposite way stand in
+        # for trained responses, only the time of the optimization is measured
+        opponents = []
+        responses = []
+        for i in range(NUM_CANDIDATES):
+            tilt_action = [Action.FOLD, Action.CALL, Action.RAISE][i % 3]
+            tilt_probability = 0.005 * (i // 3 + 1)
+            opponents += [create_agent_strategy_from_trained_strategy(
+                game_file_path, equilibrium_strategy, tilt_action, TiltType.ADD, tilt_probability)]
+            responses += [create_agent_strategy_from_trained_strategy(
+                game_file_path, equilibrium_strategy, tilt_action, TiltType.ADD, -tilt_probability)]
+
+        print()
+        for run_name, num_candidates in [('cold cache', NUM_CANDIDATES - 10), ('10 new candidates', NUM_CANDIDATES)]:
+            start = time.perf_counter()
+            portfolio_strategies, response_indices = optimize_portfolio(
+                game_file_path,
+                opponents[:num_candidates],
+                responses[:num_candidates],
+                utilities_cache_path=utilities_cache_path)
+            optimization_time = time.perf_counter() - start
+            print('%s candidates, %s: portfolio of %s responses in %.2fs' % (
+                num_candidates, run_name, len(portfolio_strategies), optimization_time))
+            self.assertEqual(len(portfolio_strategies), len(response_indices))
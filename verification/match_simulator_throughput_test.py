@@ -0,0 +1,92 @@
+import unittest
+import os
+import sys
+import time
+import subprocess
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.io_util import get_new_path, read_strategy_from_file
+from tools.match_evaluation import get_player_utilities_from_log_file, get_logs_data
+from evaluation.match_simulator import MatchSimulator
+
+
+FILES_PATH = 'verification/match_simulator'
+
+ACPC_INFRASTRUCTURE_DIR = os.getcwd() + '/../acpc-python-client/acpc_infrastructure'
+MATCH_SCRIPT = './play_match.pl'
+
+
+class MatchSimulatorThroughputTest(unittest.TestCase):
+    def test_kuhn_throughput(self):
+        self.compare_throughput({
+            'game_file_path': 'games/kuhn.limit.2p.game',
+            'agent_script_path': 'strategies/kuhn.limit.2p-equilibrium-agent.sh',
+            'strategy_path': 'strategies/kuhn.limit.2p-equilibrium.strategy',
+            'num_dealer_hands': 3000,
+            'num_simulator_hands': 1000000,
+        })
+
+    def test_leduc_throughput(self):
+        self.compare_throughput({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'agent_script_path': 'strategies/leduc.limit.2p-equilibrium-agent.sh',
+            'strategy_path': 'strategies/leduc.limit.2p-equilibrium.strategy',
+            'num_dealer_hands': 3000,
+            'num_simulator_hands': 1000000,
+        })
+
+    def compare_throughput(self, test_spec):
+        workspace_dir = os.getcwd()
+        game_file_path = workspace_dir + '/' + test_spec['game_file_path']
+        game = acpc.read_game_file(game_file_path)
+        game_name = game_file_path.split('/')[-1][:-len('.game')]
+
+        logs_dir = get_new_path('%s/%s/%s' % (workspace_dir, FILES_PATH, game_name))
+        os.makedirs(logs_dir)
+
+        agent_script_path = workspace_dir + '/' + test_spec['agent_script_path']
+        num_dealer_hands = test_spec['num_dealer_hands']
+        seed = 1
+
+        env = os.environ.copy()
+        env['PATH'] = os.path.dirname(sys.executable) + ':' + env['PATH']
+
+        start = time.perf_counter()
+        log_readings = []
+        for order_name, players in [('normal', ['Equilibrium_1', 'Equilibrium_2']), ('reversed', ['Equilibrium_2', 'Equilibrium_1'])]:
+            logs_name = '%s/%s' % (logs_dir, order_name)
+            proc = subprocess.Popen(
+                [
+                    MATCH_SCRIPT,
+                    logs_name,
+                    game_file_path,
+                    str(num_dealer_hands),
+                    str(seed),
+                    players[0],
+                    agent_script_path,
+                    players[1],
+                    agent_script_path],
+                cwd=ACPC_INFRASTRUCTURE_DIR,
+                env=env,
+                stdout=subprocess.PIPE)
+            proc.stdout.readline().decode('utf-8').strip()
+            log_readings += [get_player_utilities_from_log_file(logs_name + '.log')]
+        dealer_data, _ = get_logs_data(*log_readings)
+        dealer_time = time.perf_counter() - start
+        dealer_hands_per_second = dealer_data.shape[0] / dealer_time
+
+        _, strategy = read_strategy_from_file(None, test_spec['strategy_path'])
+        start = time.perf_counter()
+        simulator = MatchSimulator(game)
+        simulator_data = simulator.simulate([strategy, strategy], test_spec['num_simulator_hands'], seed=seed)
+        simulator_time = time.perf_counter() - start
+        simulator_hands_per_second = simulator_data.shape[0] / simulator_time
+
+        print()
+        print('Dealer: %s hands in %.2fs, %.0f hands/s, mean utility %s' % (
+            dealer_data.shape[0], dealer_time, dealer_hands_per_second, np.mean(dealer_data[:, 0, 0])))
+        print('Simulator: %s hands in %.2fs, %.0f hands/s, mean utility %s' % (
+            simulator_data.shape[0], simulator_time, simulator_hands_per_second, np.mean(simulator_data[:, 0, 0])))
+        print('Speedup: %.1fx' % (simulator_hands_per_second / dealer_hands_per_second))
@@ -0,0 +1,117 @@
+import unittest
+import random
+import time
+
+import acpc_python_client as acpc
+
+from response.restricted_nash_response import RestrictedNashResponse
+from tools.constants import Action
+from weak_agents.action_tilted_agent import create_agent_strategy_from_trained_strategy, TiltType
+from tools.io_util import read_strategy_from_file
+from evaluation.exploitability import Exploitability
+from tools.game_utils import copy_strategy
+
+
+KUHN_EQUILIBRIUM_STRATEGY_PATH = 'strategies/kuhn.limit.2p-equilibrium.strategy'
+LEDUC_EQUILIBRIUM_STRATEGY_PATH = 'strategies/leduc.limit.2p-equilibrium.strategy'
+
+
+class RnrWarmStartTest(unittest.TestCase):
+    def test_kuhn_rnr_warm_start(self):
+        self.evaluate_warm_start({
+            'game_file_path': 'games/kuhn.limit.2p.game',
+            'base_strategy_path': KUHN_EQUILIBRIUM_STRATEGY_PATH,
+            'opponent_tilt_type': (Action.CALL, TiltType.ADD, 0.5),
+            'p': 0.5,
+            'training_iterations': 1000,
+            'weight_delay': 50,
+            'checkpoint_iterations': 10,
+            'target_exploitability_delta': 0.05,
+            'nearby_p': 0.45,
+            'initial_strategy_weights': [1, 10, 100],
+            'checkpoint_weights': [0.01, 0.1],
+        })
+
+    def test_leduc_rnr_warm_start(self):
+        self.evaluate_warm_start({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'base_strategy_path': LEDUC_EQUILIBRIUM_STRATEGY_PATH,
+            'opponent_tilt_type': (Action.FOLD, TiltType.MULTIPLY, -0.8),
+            'p': 0.5,
+            'training_iterations': 300,
+            'weight_delay': 20,
+            'checkpoint_iterations': 10,
+            'target_exploitability_delta': 0.05,
+            'nearby_p': 0.45,
+            'initial_strategy_weights': [10, 100],
+            'checkpoint_weights': [0.01, 0.1],
+        })
+
+    def evaluate_warm_start(self, test_spec):
+        game_file_path = test_spec['game_file_path']
+        game = acpc.read_game_file(game_file_path)
+        exp = Exploitability(game)
+
+        base_strategy, _ = read_strategy_from_file(game_file_path, test_spec['base_strategy_path'])
+        opponent_strategy = create_agent_strategy_from_trained_strategy(
+            game_file_path, base_strategy, *test_spec['opponent_tilt_type'])
+
+        def train(p, initial_strategy=None, initial_strategy_weight=None):
+            random.seed(0)
+            exploitability_values = []
+
+            def checkpoint_callback(game_tree, checkpoint_index, iterations):
+                exploitability_values.append((iterations, exp.evaluate(game_tree)))
+
+            rnr = RestrictedNashResponse(
+                game,
+                opponent_strategy,
+                p,
+                show_progress=False,
+                initial_strategy=initial_strategy,
+                initial_strategy_weight=initial_strategy_weight)
+            start = time.perf_counter()
+            rnr.train(
+                test_spec['training_iterations'],
+                weight_delay=test_spec['weight_delay'],
+                checkpoint_iterations=test_spec['checkpoint_iterations'],
+                checkpoint_callback=checkpoint_callback)
+            return rnr, exploitability_values, time.perf_counter() - start
+
+        _, cold_exploitability_values, cold_training_time = train(test_spec['p'])
+        # Target is the exploitability to which the cold started training converged
+        target_exploitability = cold_exploitability_values[-1][1]
+        max_delta = target_exploitability * test_spec['target_exploitability_delta']
+
+        def get_iterations_to_target(exploitability_values):
+            for i, (iterations, _) in enumerate(exploitability_values):
+                if all(abs(exploitability - target_exploitability) <= max_delta
+                       for _, exploitability in exploitability_values[i:]):
+                    return iterations
+            return None
+
+        cold_iterations = get_iterations_to_target(cold_exploitability_values)
+        print()
+        print('Target exploitability: %s +- %s' % (target_exploitability, max_delta))
+        print('Cold start: target reached after %s iterations, training took %.1fs' % (
+            cold_iterations, cold_training_time))
+
+        # Response trained for nearby p stands in for the previous probe of RnrParameterOptimizer
+        nearby_rnr, _, _ = train(test_spec['nearby_p'])
+        nearby_checkpoint = nearby_rnr.get_checkpoint()
+        nearby_response, _ = read_strategy_from_file(game_file_path, test_spec['base_strategy_path'])
+        copy_strategy(nearby_response, nearby_rnr.game_tree)
+
+        warm_starts = [('equilibrium', test_spec['base_strategy_path'], weight)
+                       for weight in test_spec['initial_strategy_weights']]
+        warm_starts += [('response for p=%s' % test_spec['nearby_p'], nearby_response, weight)
+                        for weight in test_spec['initial_strategy_weights']]
+        warm_starts += [('checkpoint for p=%s' % test_spec['nearby_p'], nearby_checkpoint, weight)
+                        for weight in test_spec['checkpoint_weights']]
+        for initial_strategy_name, initial_strategy, initial_strategy_weight in warm_starts:
+            _, exploitability_values, training_time = train(test_spec['p'], initial_strategy, initial_strategy_weight)
+            iterations = get_iterations_to_target(exploitability_values)
+            iterations_saved = None if iterations is None or cold_iterations is None else cold_iterations - iterations
+            print('Warm start from %s with weight %s: target reached after %s iterations (%s saved), final exploitability %s, training took %.1fs' % (
+                initial_strategy_name, initial_strategy_weight, iterations, iterations_saved,
+                exploitability_values[-1][1], training_time))
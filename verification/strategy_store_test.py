@@ -0,0 +1,129 @@
+import unittest
+import os
+import time
+import multiprocessing
+import numpy as np
+
+import acpc_python_client as acpc
+
+from tools.constants import Action, NUM_ACTIONS
+from tools.io_util import read_strategy_from_file, write_strategy_to_file, get_new_path
+from tools.strategy_store import load_strategy, build_strategy_trees
+from weak_agents.action_tilted_agent import create_agent_strategy_from_trained_strategy, TiltType
+
+
+FILES_PATH = 'verification/strategy_store'
+
+NUM_AGENT_PROCESSES = 10
+
+
+def _load_portfolio_from_text(game, portfolio_strategy_paths):
+    """Portfolio loading as it was done by each agent before the strategy store."""
+    portfolio_trees = []
+    portfolio_dicts = []
+    for portfolio_strategy_path in portfolio_strategy_paths:
+        strategy_tree, strategy_dict = read_strategy_from_file(game, portfolio_strategy_path)
+        portfolio_trees += [strategy_tree]
+        portfolio_dicts += [strategy_dict]
+    info_sets = sorted(portfolio_dicts[0].keys())
+    portfolio_strategies = np.zeros([len(portfolio_dicts), len(info_sets), NUM_ACTIONS])
+    for i, strategy_dict in enumerate(portfolio_dicts):
+        for j, info_set in enumerate(info_sets):
+            portfolio_strategies[i, j] = strategy_dict[info_set]
+    return portfolio_trees, portfolio_strategies
+
+
+def _load_portfolio_from_store(game, portfolio_strategy_paths, store_directory):
+    stored_strategies = [
+        load_strategy(portfolio_strategy_path, store_directory)
+        for portfolio_strategy_path in portfolio_strategy_paths]
+    portfolio_trees = build_strategy_trees(game, stored_strategies)
+    return portfolio_trees, [stored_strategy.strategies for stored_strategy in stored_strategies]
+
+
+def _get_memory_usage():
+    """Return resident and proportional set size of current process in MB.
+
+    Proportional set size divides shared pages between processes sharing them.
+    """
+    memory_usage = {}
+    with open('/proc/self/smaps_rollup', 'r') as smaps_file:
+        for line in smaps_file:
+            line_segments = line.split()
+            if line_segments[0] in ['Rss:', 'Pss:']:
+                memory_usage[line_segments[0][:-1]] = int(line_segments[1]) / 1024
+    return memory_usage['Rss'], memory_usage['Pss']
+
+
+def _agent_process(game_file_path, portfolio_strategy_paths, store_directory, barrier, results):
+    start = time.perf_counter()
+    game = acpc.read_game_file(game_file_path)
+    if store_directory is None:
+        portfolio = _load_portfolio_from_text(game, portfolio_strategy_paths)
+    else:
+        portfolio = _load_portfolio_from_store(game, portfolio_strategy_paths, store_directory)
+    startup_time = time.perf_counter() - start
+
+    # Memory is measured when all agents are running
+    barrier.wait()
+    rss, pss = _get_memory_usage()
+    barrier.wait()
+    results.put((startup_time, rss, pss))
+
+
+class StrategyStoreTest(unittest.TestCase):
+    def test_leduc_portfolio_agents(self):
+        self.evaluate_agents({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'equilibrium_strategy_path': 'strategies/leduc.limit.2p-equilibrium.strategy',
+            'portfolio_size': 32,
+        })
+
+    def run_agents(self, game_file_path, portfolio_strategy_paths, store_directory):
+        context = multiprocessing.get_context('spawn')
+        barrier = context.Barrier(NUM_AGENT_PROCESSES)
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=_agent_process,
+                args=(game_file_path, portfolio_strategy_paths, store_directory, barrier, results))
+            for _ in range(NUM_AGENT_PROCESSES)]
+        for process in processes:
+            process.start()
+        agent_results = np.array([results.get() for _ in processes])
+        for process in processes:
+            process.join()
+        return agent_results
+
+    def evaluate_agents(self, test_spec):
+        game_file_path = test_spec['game_file_path']
+        game_name = game_file_path.split('/')[-1][:-len('.game')]
+        equilibrium_strategy, _ = read_strategy_from_file(game_file_path, test_spec['equilibrium_strategy_path'])
+
+        test_directory = get_new_path('%s/%s' % (FILES_PATH, game_name))
+        os.makedirs(test_directory)
+
+        portfolio_strategy_paths = []
+        for i in range(test_spec['portfolio_size']):
+            tilt_action = [Action.FOLD, Action.CALL, Action.RAISE][i % 3]
+            tilted_strategy = create_agent_strategy_from_trained_strategy(
+                game_file_path,
+                equilibrium_strategy,
+                tilt_action,
+                TiltType.ADD,
+                0.05 * (i // 3 + 1))
+            strategy_path = '%s/portfolio_strategy_%s.strategy' % (test_directory, i)
+            write_strategy_to_file(tilted_strategy, strategy_path)
+            portfolio_strategy_paths += [strategy_path]
+
+        store_directory = '%s/store' % test_directory
+        print()
+        for name, agents_store_directory in [('Text files', None), ('Strategy store', store_directory)]:
+            agent_results = self.run_agents(game_file_path, portfolio_strategy_paths, agents_store_directory)
+            print('%s: %s agents, startup mean %.3fs max %.3fs, total RSS %.1fMB, total PSS %.1fMB' % (
+                name,
+                NUM_AGENT_PROCESSES,
+                np.mean(agent_results[:, 0]),
+                np.max(agent_results[:, 0]),
+                np.sum(agent_results[:, 1]),
+                np.sum(agent_results[:, 2])))
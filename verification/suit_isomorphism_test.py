@@ -0,0 +1,54 @@
+import unittest
+import time
+
+import acpc_python_client as acpc
+
+from cfr.main import Cfr
+from evaluation.exploitability import Exploitability
+from tools.suit_isomorphism import expand_strategy
+
+
+class SuitIsomorphismTest(unittest.TestCase):
+    def test_kuhn_bigdeck_2round_suit_isomorphism(self):
+        self.evaluate_suit_isomorphism({
+            'game_file_path': 'games/kuhn.bigdeck.2round.limit.2p.game',
+            'training_iterations': 300,
+            'weight_delay': 50,
+        })
+
+    def test_leduc_suit_isomorphism(self):
+        self.evaluate_suit_isomorphism({
+            'game_file_path': 'games/leduc.limit.2p.game',
+            'training_iterations': 100,
+            'weight_delay': 20,
+        })
+
+    def evaluate_suit_isomorphism(self, test_spec):
+        game = acpc.read_game_file(test_spec['game_file_path'])
+        exploitability = Exploitability(game)
+
+        print()
+        print(test_spec['game_file_path'])
+        print('suit isomorphism | action nodes | build time | iteration time | best response time | exploitability')
+        for suit_isomorphism in [False, True]:
+            start = time.perf_counter()
+            cfr = Cfr(game, show_progress=False, suit_isomorphism=suit_isomorphism)
+            build_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cfr.train(test_spec['training_iterations'], weight_delay=test_spec['weight_delay'])
+            iteration_time = (time.perf_counter() - start) / test_spec['training_iterations']
+
+            # Best response is computed for the strategy of the whole game
+            start = time.perf_counter()
+            strategy = expand_strategy(game, cfr.game_tree, cfr.suit_isomorphism) if suit_isomorphism else cfr.game_tree
+            strategy_exploitability = exploitability.evaluate(strategy)
+            best_response_time = time.perf_counter() - start
+
+            print('%16s | %12s | %9.2fs | %13.4fs | %17.2fs | %s' % (
+                suit_isomorphism, len(cfr._action_nodes), build_time, iteration_time,
+                best_response_time, strategy_exploitability))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
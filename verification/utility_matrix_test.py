@@ -0,0 +1,69 @@
+import unittest
+import time
+import random
+import numpy as np
+
+import acpc_python_client as acpc
+
+from evaluation.utility_matrix import UtilityMatrix
+from evaluation.player_utility import PlayerUtility
+from tools.game_tree.builder import GameTreeBuilder
+from tools.game_tree.node_provider import StrategyTreeNodeProvider
+from tools.game_tree.nodes import ActionNode
+from tools.walk_trees import walk_trees
+
+
+NUM_STRATEGIES = 32
+NUM_MEASURED_PAIRS = 10
+
+
+def create_random_strategy(game, seed):
+    rng = random.Random(seed)
+    strategy = GameTreeBuilder(game, StrategyTreeNodeProvider()).build_tree()
+
+    def on_node(node):
+        if isinstance(node, ActionNode):
+            weights = [rng.random() for _ in node.children]
+            for a, weight in zip(node.children, weights):
+                node.strategy[a] = weight / sum(weights)
+    walk_trees(on_node, strategy)
+    return strategy
+
+
+class UtilityMatrixTest(unittest.TestCase):
+    def test_kuhn_utility_matrix_time(self):
+        self.compare_time('games/kuhn.limit.2p.game')
+
+    def test_leduc_utility_matrix_time(self):
+        self.compare_time('games/leduc.limit.2p.game')
+
+    def compare_time(self, game_file_path):
+        game = acpc.read_game_file(game_file_path)
+        strategies = [create_random_strategy(game, seed) for seed in range(NUM_STRATEGIES)]
+
+        start = time.perf_counter()
+        utility_matrix = UtilityMatrix(game)
+        setup_time = time.perf_counter() - start
+        start = time.perf_counter()
+        strategy_tables = utility_matrix.get_strategy_tables(strategies)
+        tables_time = time.perf_counter() - start
+        start = time.perf_counter()
+        utilities = utility_matrix.evaluate(strategy_tables)
+        matrix_time = time.perf_counter() - start
+
+        player_utility = PlayerUtility(game)
+        pairs = [(i, i + 1) for i in range(NUM_MEASURED_PAIRS)]
+        start = time.perf_counter()
+        for i, j in pairs:
+            player_utilities, positions = player_utility.evaluate(strategies[i], strategies[j])
+            expected_utility = np.mean([player_utilities[k, positions[k].tolist().index(0)] for k in range(2)])
+            self.assertAlmostEqual(utilities[i, j], expected_utility)
+        pair_time = (time.perf_counter() - start) / len(pairs)
+        num_pairs = NUM_STRATEGIES * (NUM_STRATEGIES - 1) / 2
+
+        print()
+        print('%s strategies of %s' % (NUM_STRATEGIES, game_file_path))
+        print('Utility matrix: setup %.3fs, strategy tables %.3fs, matrix %.3fs' % (
+            setup_time, tables_time, matrix_time))
+        print('PlayerUtility: %.3fs per pair, %.1fs estimated for all %.0f pairs' % (
+            pair_time, pair_time * num_pairs, num_pairs))
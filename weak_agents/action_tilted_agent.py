@@ -23,10 +23,17 @@ def create_agent_strategy(
         tilt_probability,
         cfr_iterations=2000,
         cfr_weight_delay=700,
-        show_progress=True):
+        show_progress=True,
+        cfr=None):
 
-    game = acpc.read_game_file(game_file_path)
-    cfr = Cfr(game, show_progress=show_progress)
+    # Provided CFR instance is reset and trained again so that its tree can be reused
+    # for more agents, the strategy is then tilted on a copy
+    in_place = cfr is None
+    if cfr is None:
+        game = acpc.read_game_file(game_file_path)
+        cfr = Cfr(game, show_progress=show_progress)
+    else:
+        cfr.reset()
     cfr.train(cfr_iterations, cfr_weight_delay)
     return create_agent_strategy_from_trained_strategy(
         game_file_path,
@@ -34,7 +41,7 @@ def create_agent_strategy(
         tilt_action,
         tilt_type,
         tilt_probability,
-        True)
+        in_place)
 
 
 def create_agent_strategy_from_strategy_file(